@@ -0,0 +1,5 @@
+import sys
+
+from Migration.cli import main
+
+sys.exit(main())
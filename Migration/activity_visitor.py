@@ -0,0 +1,86 @@
+"""
+Single-pass activity tree visitor for ADF to Fabric Migration Tool
+
+Pipelines nest activities under ForEach, Until, If Condition and Switch
+containers. The visitor walks each tree once with an explicit stack, so deep
+nesting cannot hit the recursion limit, and hands every activity to the
+registered extractors in pre-order.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from Migration.constants import NESTED_ACTIVITY_KEYS, NESTED_CASES_KEY
+from Migration.utilities import _to_dict, _norm_key
+
+
+@dataclass
+class ActivityNode:
+    """One activity of a pipeline tree, converted to dict form once."""
+
+    activity: Dict[str, Any]
+    pipeline_name: str
+    depth: int
+    parent: str = ""
+
+
+Extractor = Callable[[ActivityNode], None]
+
+
+def _child_activity_lists(activity: Dict[str, Any]) -> List[List[Any]]:
+    """Nested activity lists of a container, in SDK (snake_case) or REST (typeProperties) shape."""
+    containers = [activity]
+    tprops = activity.get("typeProperties") or activity.get("type_properties")
+    if isinstance(tprops, dict):
+        containers.append(tprops)
+
+    out: List[List[Any]] = []
+    for container in containers:
+        by_norm = {_norm_key(k): v for k, v in container.items()}
+        for key in NESTED_ACTIVITY_KEYS:
+            v = by_norm.get(key)
+            if isinstance(v, list):
+                out.append(v)
+        cases = by_norm.get(NESTED_CASES_KEY)
+        if isinstance(cases, list):
+            for case in cases:
+                if isinstance(case, dict):
+                    case_acts = case.get("activities")
+                    if isinstance(case_acts, list):
+                        out.append(case_acts)
+    return out
+
+
+def iter_activities(activities: Optional[List[Any]], pipeline_name: str = "") -> Iterator[ActivityNode]:
+    """Yield every activity of a tree in pre-order, nested activities included."""
+    stack = [(act, 0, "") for act in reversed(activities or [])]
+    while stack:
+        act, depth, parent = stack.pop()
+        a = _to_dict(act)
+        yield ActivityNode(a, pipeline_name, depth, parent)
+        name = a.get("name") or ""
+        for lst in reversed(_child_activity_lists(a)):
+            for child in reversed(lst):
+                stack.append((child, depth + 1, name))
+
+
+class ActivityVisitor:
+    """Feeds every activity of a pipeline to the registered extractors in one pass."""
+
+    def __init__(self, extractors: Optional[Iterable[Extractor]] = None) -> None:
+        self._extractors: List[Extractor] = list(extractors or [])
+
+    def register(self, extractor: Extractor) -> Extractor:
+        """Add a per-activity extractor; usable as a decorator."""
+        self._extractors.append(extractor)
+        return extractor
+
+    def visit(self, pipeline_name: str, activities: Optional[List[Any]]) -> int:
+        """Walk one pipeline and return its control-flow depth (0 = no nesting, -1 = empty)."""
+        max_depth = -1
+        for node in iter_activities(activities, pipeline_name):
+            if node.depth > max_depth:
+                max_depth = node.depth
+            for extractor in self._extractors:
+                extractor(node)
+        return max_depth
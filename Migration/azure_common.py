@@ -2,41 +2,75 @@
 Common Azure operations for ADF to Fabric Migration Tool
 """
 
-from typing import List, Tuple, Dict, Any
+from typing import TYPE_CHECKING, List, Tuple, Dict, Any
 
-import streamlit as st
-from azure.identity import InteractiveBrowserCredential
-from azure.mgmt.resource import SubscriptionClient, ResourceManagementClient
-from azure.mgmt.datafactory import DataFactoryManagementClient
+from Migration.caching import cached
+from Migration.concurrent_fetch import call_with_backoff
+from Migration.utilities import _to_dict, _friendly_resource_type, resource_group_from_id
 
-from Migration.utilities import _to_dict, _friendly_resource_type
+if TYPE_CHECKING:
+    from azure.identity import InteractiveBrowserCredential
 
 
-@st.cache_data(show_spinner=False)
-def list_subscriptions(_credential: InteractiveBrowserCredential) -> List[Tuple[str, str]]:
+@cached
+def list_subscriptions(_credential: "InteractiveBrowserCredential") -> List[Tuple[str, str]]:
     """List all Azure subscriptions."""
+    from azure.mgmt.resource import SubscriptionClient
+
     client = SubscriptionClient(_credential)
     subs = list(client.subscriptions.list())
     return [(s.display_name or s.subscription_id, s.subscription_id) for s in subs]
 
 
-@st.cache_data(show_spinner=False)
-def list_resource_groups(_credential: InteractiveBrowserCredential, subscription_id: str) -> List[str]:
+@cached
+def list_resource_groups(_credential: "InteractiveBrowserCredential", subscription_id: str) -> List[str]:
     """List resource groups in a subscription."""
+    from azure.mgmt.resource import ResourceManagementClient
+
     rg_client = ResourceManagementClient(_credential, subscription_id)
     return [rg.name for rg in rg_client.resource_groups.list()]
 
 
-@st.cache_data(show_spinner=False)
-def list_data_factories(_credential: InteractiveBrowserCredential, subscription_id: str, resource_group: str) -> List[str]:
+@cached
+def list_data_factories(_credential: "InteractiveBrowserCredential", subscription_id: str, resource_group: str) -> List[str]:
     """List data factories in a resource group."""
+    from azure.mgmt.datafactory import DataFactoryManagementClient
+
     adf_client = DataFactoryManagementClient(_credential, subscription_id)
     return [f.name for f in adf_client.factories.list_by_resource_group(resource_group)]
 
 
-@st.cache_data(show_spinner=False)
-def list_rg_resources(_credential: InteractiveBrowserCredential, subscription_id: str, resource_group: str) -> List[Dict[str, str]]:
+def list_factories_in_subscription(
+    credential: "InteractiveBrowserCredential", subscription_id: str
+) -> List[Tuple[str, str]]:
+    """(resource group, factory name) for every data factory in a subscription."""
+    from azure.mgmt.datafactory import DataFactoryManagementClient
+
+    client = DataFactoryManagementClient(credential, subscription_id)
+    return [
+        (resource_group_from_id(f.id), f.name)
+        for f in call_with_backoff(lambda: list(client.factories.list()))
+    ]
+
+
+def list_synapse_workspaces_in_subscription(
+    credential: "InteractiveBrowserCredential", subscription_id: str
+) -> List[Tuple[str, str]]:
+    """(resource group, workspace name) for every Synapse workspace in a subscription."""
+    from azure.mgmt.synapse import SynapseManagementClient
+
+    client = SynapseManagementClient(credential, subscription_id)
+    return [
+        (resource_group_from_id(ws.id), ws.name)
+        for ws in call_with_backoff(lambda: list(client.workspaces.list()))
+    ]
+
+
+@cached
+def list_rg_resources(_credential: "InteractiveBrowserCredential", subscription_id: str, resource_group: str) -> List[Dict[str, str]]:
     """List all resources in a resource group."""
+    from azure.mgmt.resource import ResourceManagementClient
+
     rg_client = ResourceManagementClient(_credential, subscription_id)
     rows: List[Dict[str, str]] = []
     for res in rg_client.resources.list_by_resource_group(resource_group):
@@ -0,0 +1,150 @@
+"""
+Pluggable result caching for ADF to Fabric Migration Tool
+
+Listing functions are decorated with @cached. Results are kept in process
+memory by default; the Streamlit app switches to st.cache_data with
+use_streamlit_cache(), and batch jobs can share a DiskCache across runs.
+As with st.cache_data, arguments whose name starts with "_" (credentials)
+are not part of the cache key.
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _cache_key(fn: Callable[..., Any], sig: inspect.Signature, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+    """Stable key from a call's arguments, skipping "_"-prefixed parameters."""
+    try:
+        bound = sig.bind(*args, **kwargs)
+        bound.apply_defaults()
+        items = [(k, v) for k, v in bound.arguments.items() if not k.startswith("_")]
+    except TypeError:
+        items = [("args", args), ("kwargs", sorted(kwargs.items()))]
+    return f"{fn.__module__}.{fn.__qualname__}:{items!r}"
+
+
+class InProcessCache:
+    """Thread-safe in-memory cache with an optional TTL."""
+
+    def __init__(self, ttl_seconds: Optional[float] = None) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def call(self, fn: Callable[..., Any], sig: inspect.Signature, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        key = _cache_key(fn, sig, args, kwargs)
+        with self._lock:
+            hit = self._entries.get(key)
+        if hit is not None and (self.ttl_seconds is None or time.time() - hit[0] < self.ttl_seconds):
+            return hit[1]
+        value = fn(*args, **kwargs)
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache:
+    """Pickle-per-entry cache in a directory, shared between processes and runs."""
+
+    def __init__(self, cache_dir: Optional[os.PathLike] = None, ttl_seconds: Optional[float] = 3600) -> None:
+        if cache_dir is None:
+            from Migration.snapshot_store import default_cache_dir
+            cache_dir = default_cache_dir() / "listings"
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / (hashlib.sha256(key.encode("utf-8")).hexdigest() + ".pkl")
+
+    def call(self, fn: Callable[..., Any], sig: inspect.Signature, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        path = self._path(_cache_key(fn, sig, args, kwargs))
+        try:
+            fresh = self.ttl_seconds is None or time.time() - path.stat().st_mtime < self.ttl_seconds
+            if fresh:
+                with open(path, "rb") as f:
+                    return pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            pass
+        value = fn(*args, **kwargs)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump(value, f)
+            os.replace(tmp, path)
+        except (OSError, pickle.PickleError, TypeError, AttributeError) as exc:
+            print(f"Could not cache {fn.__qualname__} on disk: {exc}")
+        return value
+
+    def clear(self) -> None:
+        for p in self.cache_dir.glob("*.pkl"):
+            try:
+                p.unlink()
+            except OSError:
+                pass
+
+
+class StreamlitCache:
+    """Adapter that routes cached functions through st.cache_data."""
+
+    def __init__(self, **cache_data_kwargs: Any) -> None:
+        import streamlit as st
+
+        self._st = st
+        self._kwargs = {"show_spinner": False, **cache_data_kwargs}
+        self._wrapped: Dict[Callable[..., Any], Callable[..., Any]] = {}
+        self._lock = threading.Lock()
+
+    def call(self, fn: Callable[..., Any], sig: inspect.Signature, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        wrapped = self._wrapped.get(fn)
+        if wrapped is None:
+            with self._lock:
+                wrapped = self._wrapped.get(fn)
+                if wrapped is None:
+                    wrapped = self._wrapped[fn] = self._st.cache_data(**self._kwargs)(fn)
+        return wrapped(*args, **kwargs)
+
+    def clear(self) -> None:
+        self._st.cache_data.clear()
+
+
+_BACKEND: Any = InProcessCache()
+
+
+def set_cache_backend(backend: Any) -> None:
+    """Use backend (InProcessCache, DiskCache, StreamlitCache or similar) for all @cached functions."""
+    global _BACKEND
+    _BACKEND = backend
+
+
+def get_cache_backend() -> Any:
+    return _BACKEND
+
+
+def use_streamlit_cache(**cache_data_kwargs: Any) -> None:
+    """Route @cached functions through st.cache_data (call from the Streamlit app)."""
+    set_cache_backend(StreamlitCache(**cache_data_kwargs))
+
+
+def cached(fn: F) -> F:
+    """Cache a function's results in the active backend, resolved at call time."""
+    sig = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return _BACKEND.call(fn, sig, args, kwargs)
+
+    return wrapper  # type: ignore[return-value]
@@ -0,0 +1,377 @@
+"""
+Headless command-line interface for ADF to Fabric Migration Tool
+
+    python -m Migration assess --path ./factory-repo --output out/
+    python -m Migration assess --subscription <id> --resource-group <rg> --factory <name> --output out/
+    python -m Migration assess --synapse-workspace <ws> --subscription <id> --resource-group <rg> --output out/
+    python -m Migration assess --tenant --output out/
+    python -m Migration migrate --subscription <id> --resource-group <rg> --factory <name> --workspace-id <uuid>
+    python -m Migration copy-tables --workspace-id <uuid> --server <host> --database <db> --tables dbo.a,dbo.b
+
+Results are written as JSON Lines (default) or Parquet (requires pyarrow).
+Streamlit is never imported.
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from Migration.constants import (
+    COPYJOB_DEFAULT_SHARDS,
+    COPYJOB_RUN_MAX_CONCURRENT,
+    FETCH_MAX_WORKERS,
+    MIGRATION_PUBLISH_MAX_WORKERS,
+)
+
+UTILS_DIR = Path(__file__).resolve().parent.parent / "utils"
+
+
+def _log(message: str) -> None:
+    print(message, file=sys.stderr, flush=True)
+
+
+def _split_list(value: Optional[str]) -> List[str]:
+    return [v.strip() for v in (value or "").split(",") if v.strip()]
+
+
+def _build_credential(auth: str) -> Any:
+    """Azure credential for the chosen auth mode."""
+    if auth == "service-principal":
+        from Synapse_Data.fabric_copyjob_warehouse import build_service_principal_credential
+        return build_service_principal_credential()
+    if auth == "browser":
+        from azure.identity import InteractiveBrowserCredential
+        return InteractiveBrowserCredential()
+    from azure.identity import DefaultAzureCredential
+    return DefaultAzureCredential()
+
+
+def write_rows(output_dir: Path, name: str, rows: Iterable[Dict[str, Any]], fmt: str = "jsonl") -> Path:
+    """Write rows to <output_dir>/<name>.jsonl or .parquet and return the file path."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if fmt == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)") from exc
+        path = output_dir / f"{name}.parquet"
+        pq.write_table(pa.Table.from_pylist(list(rows)), str(path))
+        return path
+
+    path = output_dir / f"{name}.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False, default=str))
+            f.write("\n")
+    return path
+
+
+def _write_tables(args: argparse.Namespace, tables: Dict[str, List[Dict[str, Any]]]) -> None:
+    out = Path(args.output)
+    for name, rows in tables.items():
+        path = write_rows(out, name, rows, args.format)
+        _log(f"Wrote {len(rows)} rows to {path}")
+
+
+def _assess_factory(args: argparse.Namespace) -> Dict[str, List[Dict[str, Any]]]:
+    from Migration.adf_components import walk_snapshot
+    from Migration.dependency_graph import build_dependency_graph
+    from Migration.factory_snapshot import get_factory_snapshot
+    from Migration.migration_score import score_pipelines
+
+    credential = _build_credential(args.auth)
+    snapshot = get_factory_snapshot(
+        credential, args.subscription, args.resource_group, args.factory, refresh=args.refresh
+    )
+    walk = walk_snapshot(snapshot)
+    graph = build_dependency_graph(snapshot)
+    ls_types = snapshot.linked_service_types()
+    return {
+        "activities": walk.activity_rows,
+        "dataset_io": walk.dataset_io_rows,
+        "linked_services": [
+            {"Factory": snapshot.factory_name, "LinkedService": n, "LinkedServiceType": t}
+            for n, t in ls_types.items()
+        ],
+        "scores": score_pipelines(walk.activity_rows, ls_types),
+        "dependencies": [{"Factory": snapshot.factory_name, **row} for row in graph.edge_rows()],
+        "waves": [{"Factory": snapshot.factory_name, **row} for row in graph.wave_rows()],
+    }
+
+
+def _assess_synapse(args: argparse.Namespace) -> Dict[str, List[Dict[str, Any]]]:
+    from Migration.adf_components import walk_snapshot
+    from Migration.migration_score import score_pipelines
+    from Migration.synapse_components import get_synapse_snapshot
+
+    credential = _build_credential(args.auth)
+    snapshot = get_synapse_snapshot(
+        credential, args.subscription or "", args.resource_group or "", args.synapse_workspace, refresh=args.refresh
+    )
+    walk = walk_snapshot(snapshot)
+    ls_types = snapshot.linked_service_types()
+    return {
+        "activities": walk.activity_rows,
+        "dataset_io": walk.dataset_io_rows,
+        "linked_services": [
+            {"LinkedServiceName": n, "Type": t} for n, t in ls_types.items()
+        ],
+        "scores": score_pipelines(walk.activity_rows, ls_types),
+    }
+
+
+def _assess_tenant(args: argparse.Namespace) -> Dict[str, List[Dict[str, Any]]]:
+    from Migration.crawler import CrawlResultStore, crawl_tenant
+
+    credential = _build_credential(args.auth)
+    store = CrawlResultStore(Path(args.results_db) if args.results_db else None)
+    subscriptions = [(s, s) for s in _split_list(args.subscriptions)] or None
+
+    def _progress(result: Any, done: int, total: int) -> None:
+        t = result.target
+        suffix = f" ({result.error})" if result.error else ""
+        _log(f"[{done}/{total}] {t.kind} {t.subscription_name or t.subscription_id}/{t.resource_group}/{t.name}: {result.status}{suffix}")
+
+    run_id = crawl_tenant(
+        credential,
+        store,
+        subscriptions=subscriptions,
+        include_synapse=not args.no_synapse,
+        max_workers=args.max_workers,
+        run_id=args.run_id,
+        progress=_progress,
+    )
+    _log(f"Crawl run {run_id} stored in {store.path}")
+    return {"readiness": store.readiness_report(run_id)}
+
+
+def cmd_assess(args: argparse.Namespace) -> int:
+    if args.path:
+        from Migration.offline_assessment import assess_offline
+        tables = assess_offline(args.path, factory_name=args.factory, max_workers=args.max_workers)
+    elif args.tenant:
+        tables = _assess_tenant(args)
+    elif args.synapse_workspace:
+        tables = _assess_synapse(args)
+    elif args.subscription and args.resource_group and args.factory:
+        tables = _assess_factory(args)
+    else:
+        _log("assess needs --path, --tenant, --synapse-workspace, or --subscription/--resource-group/--factory")
+        return 2
+    _write_tables(args, tables)
+    return 0
+
+
+def cmd_migrate(args: argparse.Namespace) -> int:
+    from Migration.factory_snapshot import get_factory_snapshot
+    from Migration.pipeline_migration import migrate_pipelines
+
+    resolutions_file = args.resolutions or str(UTILS_DIR / "resolutions.json")
+    credential = _build_credential(args.auth)
+    snapshot = get_factory_snapshot(
+        credential, args.subscription, args.resource_group, args.factory, refresh=args.refresh
+    )
+    pipelines = _split_list(args.pipelines) or list(snapshot.pipelines)
+    if not pipelines:
+        _log("No pipelines to migrate.")
+        return 0
+
+    rows = migrate_pipelines(
+        credential,
+        snapshot,
+        args.workspace_id,
+        pipelines,
+        resolutions_file,
+        progress=lambda row: _log(f"{row['Status']}: {row['Pipeline']} {row['Message']}".rstrip()),
+        max_workers=args.max_workers,
+        manifest_path=Path(args.output) / "migration_manifest.json",
+    )
+    for row in rows:
+        row["Factory"] = args.factory
+        row["WorkspaceId"] = args.workspace_id
+    _write_tables(args, {"migration": rows})
+    return 0 if all(r["Status"] in ("Created", "Updated") for r in rows) else 1
+
+
+def cmd_copy_tables(args: argparse.Namespace) -> int:
+    from Synapse_Data.fabric_copyjob_warehouse import (
+        build_service_principal_credential,
+        create_copy_job_synapse_tables_to_warehouse,
+        create_or_get_synapse_connection_service_principal,
+        create_or_get_warehouse,
+        create_sharded_copy_jobs_synapse_to_warehouse,
+        estimate_synapse_table_rows_service_principal,
+        list_synapse_tables_service_principal,
+    )
+
+    tenant_id = os.getenv("AZURE_TENANT_ID") or ""
+    client_id = os.getenv("AZURE_CLIENT_ID") or ""
+    client_secret = os.getenv("AZURE_CLIENT_SECRET") or ""
+    credential = build_service_principal_credential()
+
+    tables = _split_list(args.tables)
+    if not tables:
+        tables = list_synapse_tables_service_principal(
+            args.server, args.database, tenant_id, client_id, client_secret, schema=args.schema
+        )
+    if not tables:
+        _log("No tables to copy.")
+        return 0
+
+    wh = create_or_get_warehouse(
+        workspace_id=args.workspace_id,
+        display_name=args.warehouse_name,
+        description=os.getenv("FABRIC_WAREHOUSE_DESCRIPTION", ""),
+        credential=credential,
+    )
+    warehouse_id = wh.get("id") or wh.get("warehouseId")
+    warehouse_endpoint = (wh.get("properties") or {}).get("endpoint") or wh.get("endpoint")
+    if not warehouse_id:
+        raise RuntimeError(f"Warehouse create response missing id: {wh}")
+
+    conn = create_or_get_synapse_connection_service_principal(
+        display_name=f"SynapseConn-{args.server}-{args.database}",
+        server=args.server,
+        database=args.database,
+        tenant_id=tenant_id,
+        client_id=client_id,
+        client_secret=client_secret,
+        credential=credential,
+        existing_connection_id=args.connection_id,
+    )
+    conn_id = conn.get("id")
+    if not conn_id:
+        raise RuntimeError(f"Connection create response missing id: {conn}")
+
+    if args.shards > 1 or args.run:
+        try:
+            sizes = estimate_synapse_table_rows_service_principal(
+                args.server, args.database, tenant_id, client_id, client_secret, tables=tables
+            )
+        except Exception as exc:
+            _log(f"Could not read table sizes ({exc}); splitting by table count.")
+            sizes = {}
+        sharded = create_sharded_copy_jobs_synapse_to_warehouse(
+            workspace_id=args.workspace_id,
+            display_name=args.copyjob_name,
+            source_connection_id=conn_id,
+            source_tables=tables,
+            destination_warehouse_id=warehouse_id,
+            destination_endpoint=warehouse_endpoint,
+            table_sizes=sizes,
+            shard_count=args.shards,
+            run=args.run,
+            run_max_concurrent=args.run_concurrency,
+            source_database=args.database,
+            credential=credential,
+            progress_callback=_log,
+        )
+        rows = [{
+            "WorkspaceId": args.workspace_id,
+            "WarehouseId": warehouse_id,
+            "ConnectionId": conn_id,
+            "CopyJobName": shard["displayName"],
+            "CopyJobId": (shard.get("copyJob") or {}).get("id"),
+            "Tables": ",".join(shard["tables"]),
+            "EstimatedRows": shard["estimatedRows"],
+            "SkippedTables": ",".join(t["source"] for t in (shard.get("copyJob") or {}).get("skippedTables") or []),
+            "Error": shard.get("error", ""),
+        } for shard in sharded["shards"]]
+        _write_tables(args, {"copy_tables": rows, "copy_job_runs": sharded.get("runs") or []})
+        failed = any(r["Error"] for r in rows) or any(r["status"] != "Completed" for r in sharded.get("runs") or [])
+        return 1 if failed else 0
+
+    cj = create_copy_job_synapse_tables_to_warehouse(
+        workspace_id=args.workspace_id,
+        display_name=args.copyjob_name,
+        source_connection_id=conn_id,
+        source_tables=tables,
+        destination_warehouse_id=warehouse_id,
+        destination_endpoint=warehouse_endpoint,
+        source_database=args.database,
+        credential=credential,
+        progress_callback=_log,
+    )
+    _write_tables(args, {"copy_tables": [{
+        "WorkspaceId": args.workspace_id,
+        "WarehouseId": warehouse_id,
+        "ConnectionId": conn_id,
+        "CopyJobId": cj.get("id"),
+        "Tables": ",".join(tables),
+        "SkippedTables": ",".join(t["source"] for t in cj.get("skippedTables") or []),
+        "CopyJob": cj,
+    }]})
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    # Shared by every subcommand so they can follow it on the command line
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--output", default="migration_output", help="Directory for result files")
+    output.add_argument("--format", choices=("jsonl", "parquet"), default="jsonl", help="Result file format")
+    common = argparse.ArgumentParser(add_help=False, parents=[output])
+    common.add_argument("--auth", choices=("default", "browser", "service-principal"), default="default",
+                        help="Azure credential to use (default: DefaultAzureCredential)")
+
+    parser = argparse.ArgumentParser(prog="python -m Migration", description="ADF / Synapse to Fabric migration tool")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("assess", parents=[common], help="Assess factories, Synapse workspaces or exported factory JSON")
+    p.add_argument("--path", help="Git-integrated factory folder, ARM template or resource JSON (offline)")
+    p.add_argument("--subscription")
+    p.add_argument("--resource-group")
+    p.add_argument("--factory")
+    p.add_argument("--synapse-workspace")
+    p.add_argument("--tenant", action="store_true", help="Crawl every subscription the credential can see")
+    p.add_argument("--subscriptions", help="Comma-separated subscription ids to limit --tenant to")
+    p.add_argument("--no-synapse", action="store_true", help="Skip Synapse workspaces in --tenant")
+    p.add_argument("--results-db", help="SQLite file for --tenant results")
+    p.add_argument("--run-id", help="Resume a previous --tenant run")
+    p.add_argument("--max-workers", type=int, default=FETCH_MAX_WORKERS)
+    p.add_argument("--refresh", action="store_true", help="Ignore cached factory snapshots")
+    p.set_defaults(func=cmd_assess)
+
+    p = sub.add_parser("migrate", parents=[common], help="Migrate ADF pipelines to a Fabric workspace")
+    p.add_argument("--subscription", required=True)
+    p.add_argument("--resource-group", required=True)
+    p.add_argument("--factory", required=True)
+    p.add_argument("--workspace-id", required=True)
+    p.add_argument("--pipelines", help="Comma-separated pipeline names (default: all)")
+    p.add_argument("--resolutions", help="resolutions.json mapping linked services to Fabric connections")
+    p.add_argument("--max-workers", type=int, default=MIGRATION_PUBLISH_MAX_WORKERS, help="Pipelines published concurrently")
+    p.add_argument("--refresh", action="store_true", help="Ignore cached factory snapshots")
+    p.set_defaults(func=cmd_migrate)
+
+    p = sub.add_parser("copy-tables", parents=[output], help="Copy Synapse dedicated pool tables to a Fabric Warehouse")
+    # The Synapse SQL connection and T-SQL table listing need the client secret itself
+    p.add_argument("--auth", choices=("service-principal",), default="service-principal",
+                   help="Only a service principal from AZURE_TENANT_ID, AZURE_CLIENT_ID and AZURE_CLIENT_SECRET")
+    p.add_argument("--workspace-id", required=True)
+    p.add_argument("--server", required=True)
+    p.add_argument("--database", required=True)
+    p.add_argument("--tables", help="Comma-separated schema.table names (default: all base tables)")
+    p.add_argument("--schema", help="Limit the default table list to one schema")
+    p.add_argument("--warehouse-name", default=os.getenv("FABRIC_WAREHOUSE_NAME", "SynapseWarehouse"))
+    p.add_argument("--copyjob-name", default=os.getenv("FABRIC_COPYJOB_NAME", "SynapseToWarehouseCopyJob"))
+    p.add_argument("--connection-id", help="Reuse an existing Fabric connection")
+    p.add_argument("--shards", type=int, nargs="?", default=1, const=COPYJOB_DEFAULT_SHARDS,
+                   help="Split the tables into this many copy jobs balanced by sys.partitions row counts "
+                        f"(default: one copy job; --shards alone: {COPYJOB_DEFAULT_SHARDS})")
+    p.add_argument("--run", action="store_true", help="Run the copy jobs once they are defined")
+    p.add_argument("--run-concurrency", type=int, default=COPYJOB_RUN_MAX_CONCURRENT,
+                   help="Copy jobs running at once with --run")
+    p.set_defaults(func=cmd_copy_tables)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except Exception as exc:
+        _log(f"{args.command} failed: {exc}")
+        return 1
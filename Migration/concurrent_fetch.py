@@ -0,0 +1,107 @@
+"""
+Bounded concurrent fetch helpers for ADF to Fabric Migration Tool
+"""
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, Tuple, TypeVar
+
+from Migration.constants import (
+    FETCH_MAX_WORKERS,
+    THROTTLE_STATUS_CODES,
+    THROTTLE_MAX_RETRIES,
+    THROTTLE_BASE_DELAY_SECONDS,
+    THROTTLE_MAX_DELAY_SECONDS,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    """Get the HTTP status code from an Azure SDK or requests exception."""
+    code = getattr(exc, "status_code", None)
+    if code is None:
+        response = getattr(exc, "response", None)
+        code = getattr(response, "status_code", None)
+    try:
+        return int(code) if code is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Read Retry-After (or x-ms-retry-after-ms) from the failed response, if any."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    ms = headers.get("x-ms-retry-after-ms")
+    if ms:
+        try:
+            return float(ms) / 1000.0
+        except ValueError:
+            pass
+    ra = headers.get("Retry-After") or headers.get("retry-after")
+    if ra:
+        try:
+            return float(ra)
+        except ValueError:
+            return None
+    return None
+
+
+def is_throttled(exc: BaseException) -> bool:
+    """Check if an exception is a throttling (429/503) response."""
+    return _status_code(exc) in THROTTLE_STATUS_CODES
+
+
+def call_with_backoff(
+    fn: Callable[..., R],
+    *args: Any,
+    max_retries: int = THROTTLE_MAX_RETRIES,
+    **kwargs: Any,
+) -> R:
+    """Call fn, retrying throttled responses with Retry-After or jittered exponential backoff."""
+    delay = THROTTLE_BASE_DELAY_SECONDS
+    attempt = 0
+    while True:
+        try:
+            return fn(*args, **kwargs)
+        except Exception as exc:
+            if attempt >= max_retries or not is_throttled(exc):
+                raise
+            wait = _retry_after_seconds(exc)
+            if wait is None:
+                wait = delay + random.uniform(0, delay)
+                delay = min(delay * 2, THROTTLE_MAX_DELAY_SECONDS)
+            time.sleep(min(wait, THROTTLE_MAX_DELAY_SECONDS))
+            attempt += 1
+
+
+def fetch_concurrently(
+    items: Iterable[T],
+    fetch: Callable[[T], R],
+    max_workers: int = FETCH_MAX_WORKERS,
+) -> List[Tuple[T, Optional[R], Optional[Exception]]]:
+    """Run fetch over items on a bounded thread pool.
+
+    Each call is wrapped in call_with_backoff. Results come back in input order
+    as (item, result, error) tuples so callers can decide how to handle failures.
+    """
+    work = list(items)
+    if not work:
+        return []
+
+    def _one(item: T) -> Tuple[T, Optional[R], Optional[Exception]]:
+        try:
+            return item, call_with_backoff(fetch, item), None
+        except Exception as exc:
+            return item, None, exc
+
+    workers = max(1, min(int(max_workers or 1), len(work)))
+    if workers == 1:
+        return [_one(item) for item in work]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_one, work))
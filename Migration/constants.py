@@ -11,6 +11,18 @@ CONTROL_ACTIVITY_TYPES = {
     "executepipeline",
 }
 
+# Normalized keys (lowercase, letters only) that hold nested activity lists,
+# in visit order; "cases" holds Switch blocks that each carry "activities"
+NESTED_ACTIVITY_KEYS = (
+    "activities",
+    "iftrueactivities",
+    "iffalseactivities",
+    "defaultactivities",
+    "inneractivities",
+    "caseactivities",
+)
+NESTED_CASES_KEY = "cases"
+
 # Connectivity complexity keywords
 CONNECTIVITY_COMPLEX_KEYWORDS = {
     "onprem",
@@ -40,3 +52,155 @@ SUPPORTED_MIGRATABLE = {
     "switch",
     "sqlserverstoredprocedure",
 }
+
+# Normalized activity type -> category shown in the activity tables
+ACTIVITY_CATEGORIES = {
+    "copy": "Move & Transform",
+    "executepipeline": "Orchestration",
+    "ifcondition": "Orchestration",
+    "wait": "Orchestration",
+    "web": "External Service",
+    "setvariable": "Orchestration",
+    "azurefunction": "Compute",
+    "foreach": "Orchestration",
+    "lookup": "Data Lookup",
+    "switch": "Orchestration",
+    "sqlserverstoredprocedure": "Database",
+    "notebook": "Synapse Notebook",
+    "executedataflow": "General",
+}
+
+# JSON file that extends or overrides the activity classification tables
+ACTIVITY_CLASSIFICATION_ENV = "MIGRATION_ACTIVITY_CLASSIFICATION"
+
+# Concurrent management-plane fetches
+FETCH_MAX_WORKERS = 8
+THROTTLE_STATUS_CODES = {429, 503}
+THROTTLE_MAX_RETRIES = 6
+THROTTLE_BASE_DELAY_SECONDS = 2.0
+THROTTLE_MAX_DELAY_SECONDS = 60.0
+
+# In-process factory snapshot reuse (seconds)
+SNAPSHOT_TTL_SECONDS = 600
+
+# On-disk snapshot cache (override location with this environment variable)
+SNAPSHOT_CACHE_DIR_ENV = "MIGRATION_CACHE_DIR"
+SNAPSHOT_CACHE_DEFAULT_DIR = "~/.cache/adf-fabric-migration"
+
+# Offline assessment: parse files in worker processes above this many files
+OFFLINE_PROCESS_POOL_MIN_FILES = 64
+
+# Git-integrated factory folder -> snapshot attribute
+FACTORY_FOLDER_KINDS = {
+    "pipeline": "pipelines",
+    "dataset": "datasets",
+    "linkedservice": "linked_services",
+    "trigger": "triggers",
+    "dataflow": "dataflows",
+}
+
+# ARM resource type suffix (Microsoft.DataFactory/factories/<suffix>) -> snapshot attribute
+ARM_RESOURCE_KINDS = {
+    "pipelines": "pipelines",
+    "datasets": "datasets",
+    "linkedservices": "linked_services",
+    "triggers": "triggers",
+    "dataflows": "dataflows",
+}
+
+# Normalized keys that hold a source query, in preference order
+SOURCE_QUERY_KEYS = ("sqlreaderquery", "query", "commandtext")
+DATASET_QUERY_KEYS = ("query", "sqlreaderquery", "commandtext")
+
+# Other normalized keys that carry SQL text or stored procedure names
+SQL_SCRIPT_KEYS = (
+    "precopyscript",
+    "sqlreaderstoredprocedurename",
+    "sqlwriterstoredprocedurename",
+    "storedprocedurename",
+)
+
+# Tenant-wide crawler: total concurrent assessments, and per-subscription
+# concurrency / minimum spacing between assessment starts
+CRAWL_MAX_WORKERS = 8
+CRAWL_PER_SUBSCRIPTION_CONCURRENCY = 2
+CRAWL_MIN_START_INTERVAL_SECONDS = 0.5
+
+# Shared REST session (Fabric and Synapse Dev API): hosts kept in the
+# connection pool, keep-alive connections per host, token refresh margin
+HTTP_POOL_HOSTS = 64
+HTTP_POOL_SIZE = 32
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+# Transient statuses retried for idempotent calls; THROTTLE_STATUS_CODES
+# are retried for every call because the request was not processed
+HTTP_RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+HTTP_IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Fabric REST API
+FABRIC_API_BASE_URL = "https://api.fabric.microsoft.com/v1"
+FABRIC_API_SCOPE = "https://api.fabric.microsoft.com/.default"
+FABRIC_PIPELINE_ITEM_TYPE = "DataPipeline"
+FABRIC_PIPELINE_CONTENT_PATH = "pipeline-content.json"
+FABRIC_LRO_TIMEOUT_SECONDS = 600
+# Long-running operation polling: interval when a response carries no
+# Retry-After, threads issuing status GETs (waits between polls hold no
+# thread), and operation states plus the Completed/Deduped states of job
+# instances
+OPERATION_DEFAULT_DELAY_SECONDS = 5.0
+OPERATION_HTTP_WORKERS = 8
+OPERATION_TERMINAL_STATES = ("succeeded", "completed", "deduped", "failed", "cancelled")
+OPERATION_SUCCESS_STATES = ("succeeded", "completed", "deduped")
+
+# Sharded copy jobs: default shard count, concurrent create/define calls,
+# and copy jobs running at once when triggered
+COPYJOB_DEFAULT_SHARDS = 4
+COPYJOB_SHARD_MAX_WORKERS = 4
+COPYJOB_RUN_MAX_CONCURRENT = 2
+COPYJOB_JOB_TYPE = "CopyJob"
+
+# Synapse Dev API (https://<workspace>.dev.azuresynapse.net)
+SYNAPSE_DEV_API_VERSION = "2020-12-01"
+SYNAPSE_DEV_SCOPE = "https://dev.azuresynapse.net/.default"
+# Concurrent collection listings / page prefetches per client
+SYNAPSE_DEV_MAX_WORKERS = 4
+# Workspaces assessed concurrently by assess_synapse_workspaces
+SYNAPSE_ASSESS_MAX_WORKERS = 8
+
+# Concurrent pipeline publishes during migration
+MIGRATION_PUBLISH_MAX_WORKERS = 8
+
+# resolutions.json entry types understood by the pipeline converter
+RESOLUTION_TYPES = (
+    "LinkedServiceToConnectionId",
+    "CredentialConnectionId",
+    "UrlHostToConnectionId",
+    "AdfResourceNameToFabricResourceId",
+)
+
+# Normalized activity types whose typeProperties.dataset is inlined as datasetSettings
+DATASET_SETTINGS_ACTIVITY_TYPES = {"lookup", "getmetadata", "delete", "validation"}
+
+# Pipeline properties carried over to the Fabric definition
+FABRIC_PIPELINE_PROPERTIES = ("description", "activities", "parameters", "variables", "annotations", "concurrency")
+
+# ADF reference "type" -> dependency graph node kind
+REFERENCE_KINDS = {
+    "PipelineReference": "pipeline",
+    "DatasetReference": "dataset",
+    "LinkedServiceReference": "linked_service",
+    "DataFlowReference": "dataflow",
+    "IntegrationRuntimeReference": "integration_runtime",
+    "CredentialReference": "credential",
+}
+
+# Normalized key -> node kind for references that omit their "type"
+REFERENCE_KEY_KINDS = {
+    "inputs": "dataset",
+    "outputs": "dataset",
+    "dataset": "dataset",
+    "linkedservicename": "linked_service",
+    "pipeline": "pipeline",
+    "pipelinereference": "pipeline",
+    "dataflow": "dataflow",
+    "connectvia": "integration_runtime",
+}
@@ -0,0 +1,331 @@
+"""
+Tenant-wide assessment crawler for ADF to Fabric Migration Tool
+
+Enumerates every subscription, Data Factory and Synapse workspace the
+credential can see, assesses them concurrently with per-subscription limits,
+and streams the results into a local SQLite store as each target finishes.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from Migration.constants import (
+    CRAWL_MAX_WORKERS,
+    CRAWL_PER_SUBSCRIPTION_CONCURRENCY,
+    CRAWL_MIN_START_INTERVAL_SECONDS,
+)
+from Migration.azure_common import list_factories_in_subscription, list_synapse_workspaces_in_subscription
+from Migration.concurrent_fetch import fetch_concurrently
+from Migration.migration_score import score_pipelines
+
+if TYPE_CHECKING:
+    from azure.identity import InteractiveBrowserCredential
+
+
+@dataclass
+class CrawlTarget:
+    """One factory or Synapse workspace to assess."""
+
+    kind: str  # "adf" or "synapse"
+    subscription_id: str
+    resource_group: str
+    name: str
+    subscription_name: str = ""
+
+    @property
+    def key(self) -> Tuple[str, str, str, str]:
+        return (self.kind, self.subscription_id, self.resource_group, self.name)
+
+
+@dataclass
+class CrawlResult:
+    """Outcome of assessing one target."""
+
+    target: CrawlTarget
+    status: str  # "ok" or "error"
+    scores: List[Dict[str, Any]] = field(default_factory=list)
+    activities: int = 0
+    error: str = ""
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+
+def discover_targets(
+    credential: "InteractiveBrowserCredential",
+    subscriptions: Optional[Sequence[Tuple[str, str]]] = None,
+    include_synapse: bool = True,
+    max_workers: int = CRAWL_MAX_WORKERS,
+) -> List[CrawlTarget]:
+    """List every factory (and Synapse workspace) across subscriptions.
+
+    subscriptions is a list of (display name, subscription id); by default
+    every subscription the credential can see is used.
+    """
+    if subscriptions is None:
+        from Migration.azure_common import list_subscriptions
+        subscriptions = list_subscriptions(credential)
+
+    def _discover(sub: Tuple[str, str]) -> List[CrawlTarget]:
+        sub_name, sub_id = sub
+        found = [CrawlTarget("adf", sub_id, rg, name, sub_name) for rg, name in list_factories_in_subscription(credential, sub_id)]
+        if include_synapse:
+            try:
+                found += [
+                    CrawlTarget("synapse", sub_id, rg, name, sub_name)
+                    for rg, name in list_synapse_workspaces_in_subscription(credential, sub_id)
+                ]
+            except Exception as exc:
+                # Synapse listing is best effort; keep the subscription's factories
+                print(f"Skipping Synapse workspaces in subscription {sub_name}: {exc}")
+        return found
+
+    targets: List[CrawlTarget] = []
+    for sub, found, err in fetch_concurrently(list(subscriptions), _discover, max_workers=max_workers):
+        if err is not None:
+            print(f"Skipping subscription {sub[0]}: {err}")
+            continue
+        targets.extend(found or [])
+    return targets
+
+
+def _interleave_by_subscription(targets: Sequence[CrawlTarget]) -> List[CrawlTarget]:
+    """Round-robin targets across subscriptions so workers are not parked on one limiter."""
+    buckets: Dict[str, List[CrawlTarget]] = {}
+    for t in targets:
+        buckets.setdefault(t.subscription_id, []).append(t)
+    out: List[CrawlTarget] = []
+    queues = list(buckets.values())
+    i = 0
+    while queues:
+        q = queues[i % len(queues)]
+        out.append(q.pop(0))
+        if not q:
+            queues.remove(q)
+        else:
+            i += 1
+    return out
+
+
+class _SubscriptionLimiter:
+    """Caps concurrent assessments and spaces out assessment starts in one subscription."""
+
+    def __init__(self, concurrency: int, min_interval: float) -> None:
+        self._slots = threading.BoundedSemaphore(max(1, concurrency))
+        self._min_interval = max(0.0, min_interval)
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        with self._slots:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._next_start - now
+                self._next_start = max(now, self._next_start) + self._min_interval
+            if wait > 0:
+                time.sleep(wait)
+            yield
+
+
+def assess_target(credential: "InteractiveBrowserCredential", target: CrawlTarget) -> CrawlResult:
+    """Assess one factory or workspace and score its pipelines."""
+    started = time.time()
+    try:
+        if target.kind == "adf":
+            from Migration.adf_components import walk_snapshot
+            from Migration.factory_snapshot import get_factory_snapshot
+
+            snapshot = get_factory_snapshot(credential, target.subscription_id, target.resource_group, target.name)
+            act_rows = walk_snapshot(snapshot).activity_rows
+            ls_types = snapshot.linked_service_types()
+        else:
+            from Migration.adf_components import walk_snapshot
+            from Migration.synapse_components import get_synapse_snapshot
+
+            snapshot = get_synapse_snapshot(credential, target.subscription_id, target.resource_group, target.name)
+            act_rows = walk_snapshot(snapshot).activity_rows
+            ls_types = snapshot.linked_service_types()
+        scores = score_pipelines(act_rows, ls_types)
+        return CrawlResult(target, "ok", scores, len(act_rows), started_at=started, finished_at=time.time())
+    except Exception as exc:
+        return CrawlResult(target, "error", error=str(exc), started_at=started, finished_at=time.time())
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS targets (
+    run_id          TEXT NOT NULL,
+    kind            TEXT NOT NULL,
+    subscription_id TEXT NOT NULL,
+    resource_group  TEXT NOT NULL,
+    name            TEXT NOT NULL,
+    subscription_name TEXT,
+    status          TEXT NOT NULL,
+    error           TEXT,
+    activities      INTEGER NOT NULL DEFAULT 0,
+    pipelines       INTEGER NOT NULL DEFAULT 0,
+    started_at      REAL,
+    finished_at     REAL,
+    PRIMARY KEY (run_id, kind, subscription_id, resource_group, name)
+);
+CREATE TABLE IF NOT EXISTS pipeline_scores (
+    run_id          TEXT NOT NULL,
+    kind            TEXT NOT NULL,
+    subscription_id TEXT NOT NULL,
+    resource_group  TEXT NOT NULL,
+    name            TEXT NOT NULL,
+    pipeline        TEXT NOT NULL,
+    total_score     INTEGER NOT NULL,
+    difficulty      TEXT NOT NULL,
+    body            TEXT NOT NULL,
+    PRIMARY KEY (run_id, kind, subscription_id, resource_group, name, pipeline)
+);
+"""
+
+
+class CrawlResultStore:
+    """SQLite-backed store of crawl results, written as targets finish."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        if path is None:
+            from Migration.snapshot_store import default_cache_dir
+            path = default_cache_dir() / "crawl_results.sqlite"
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def completed(self, run_id: str) -> Set[Tuple[str, str, str, str]]:
+        """Keys of targets already assessed successfully in a run."""
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT kind, subscription_id, resource_group, name FROM targets WHERE run_id=? AND status='ok'",
+                (run_id,),
+            ).fetchall()
+        return {tuple(r) for r in rows}
+
+    def save(self, run_id: str, result: CrawlResult) -> None:
+        """Record one target's outcome, replacing any earlier attempt in the run."""
+        t = result.target
+        key = (run_id, *t.key)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "DELETE FROM pipeline_scores WHERE run_id=? AND kind=? AND subscription_id=? AND resource_group=? AND name=?",
+                key,
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO targets (run_id, kind, subscription_id, resource_group, name, subscription_name, "
+                "status, error, activities, pipelines, started_at, finished_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (*key, t.subscription_name, result.status, result.error, result.activities,
+                 len(result.scores), result.started_at, result.finished_at),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO pipeline_scores (run_id, kind, subscription_id, resource_group, name, pipeline, "
+                "total_score, difficulty, body) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (*key, s.get("Pipeline", ""), int(s.get("Total Score", 0)), s.get("Difficulty", ""),
+                     json.dumps(s, default=str))
+                    for s in result.scores
+                ],
+            )
+
+    def readiness_report(self, run_id: str) -> List[Dict[str, Any]]:
+        """One row per assessed target with pipeline counts per difficulty band."""
+        with self._lock, self._connect() as conn:
+            targets = conn.execute(
+                "SELECT kind, subscription_id, subscription_name, resource_group, name, status, error, activities, pipelines "
+                "FROM targets WHERE run_id=? ORDER BY subscription_name, resource_group, name",
+                (run_id,),
+            ).fetchall()
+            bands = conn.execute(
+                "SELECT kind, subscription_id, resource_group, name, difficulty, COUNT(*), AVG(total_score) "
+                "FROM pipeline_scores WHERE run_id=? GROUP BY kind, subscription_id, resource_group, name, difficulty",
+                (run_id,),
+            ).fetchall()
+        by_target: Dict[Tuple[str, str, str, str], Dict[str, Any]] = {}
+        for kind, sub, rg, name, difficulty, count, avg in bands:
+            agg = by_target.setdefault((kind, sub, rg, name), {"bands": {}, "weighted": 0.0})
+            agg["bands"][difficulty] = count
+            agg["weighted"] += (avg or 0.0) * count
+
+        report: List[Dict[str, Any]] = []
+        for kind, sub, sub_name, rg, name, status, error, activities, pipelines in targets:
+            agg = by_target.get((kind, sub, rg, name), {"bands": {}, "weighted": 0.0})
+            report.append({
+                "Type": "Data Factory" if kind == "adf" else "Synapse",
+                "Subscription": sub_name or sub,
+                "ResourceGroup": rg,
+                "Name": name,
+                "Status": status,
+                "Pipelines": pipelines,
+                "Activities": activities,
+                "Easy": agg["bands"].get("🟢 Easy", 0),
+                "Medium": agg["bands"].get("🟡 Medium", 0),
+                "Hard": agg["bands"].get("🔴 Hard", 0),
+                "Average Score": round(agg["weighted"] / pipelines, 2) if pipelines else 0,
+                "Error": error or "",
+            })
+        return report
+
+
+def crawl_tenant(
+    credential: "InteractiveBrowserCredential",
+    store: Optional[CrawlResultStore] = None,
+    targets: Optional[Sequence[CrawlTarget]] = None,
+    subscriptions: Optional[Sequence[Tuple[str, str]]] = None,
+    include_synapse: bool = True,
+    max_workers: int = CRAWL_MAX_WORKERS,
+    per_subscription_concurrency: int = CRAWL_PER_SUBSCRIPTION_CONCURRENCY,
+    min_start_interval: float = CRAWL_MIN_START_INTERVAL_SECONDS,
+    run_id: Optional[str] = None,
+    progress: Optional[Callable[[CrawlResult, int, int], None]] = None,
+) -> str:
+    """Assess every discovered target and stream results into the store.
+
+    Passing the run_id of an interrupted crawl resumes it: targets already
+    assessed successfully in that run are skipped. Returns the run id.
+    """
+    store = store or CrawlResultStore()
+    run_id = run_id or time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+    if targets is None:
+        targets = discover_targets(credential, subscriptions, include_synapse, max_workers)
+
+    done = store.completed(run_id)
+    pending = _interleave_by_subscription([t for t in targets if t.key not in done])
+    limiters: Dict[str, _SubscriptionLimiter] = {
+        t.subscription_id: _SubscriptionLimiter(per_subscription_concurrency, min_start_interval)
+        for t in pending
+    }
+
+    def _run(target: CrawlTarget) -> CrawlResult:
+        with limiters[target.subscription_id].slot():
+            return assess_target(credential, target)
+
+    total = len(pending)
+    if not total:
+        return run_id
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total))) as pool:
+        futures = [pool.submit(_run, t) for t in pending]
+        for finished, fut in enumerate(as_completed(futures), start=1):
+            result = fut.result()
+            store.save(run_id, result)
+            if progress:
+                progress(result, finished, total)
+    return run_id
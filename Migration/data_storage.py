@@ -2,31 +2,32 @@
 Data storage operations (Blob Storage, ADLS) for ADF to Fabric Migration Tool
 """
 
-from typing import List, Dict, Any
-
-import streamlit as st
-from azure.identity import InteractiveBrowserCredential
-from azure.mgmt.storage import StorageManagementClient
-from azure.storage.blob import BlobServiceClient
-from azure.storage.filedatalake import DataLakeServiceClient
+from typing import TYPE_CHECKING, List, Dict, Any
 
+from Migration.caching import cached
 from Migration.utilities import _to_dict, _path_info
 
+if TYPE_CHECKING:
+    from azure.identity import InteractiveBrowserCredential
+    from azure.mgmt.storage import StorageManagementClient
+    from azure.storage.blob import BlobServiceClient
+    from azure.storage.filedatalake import DataLakeServiceClient
+
 
-@st.cache_data(show_spinner=False)
+@cached
 def list_storage_accounts(
-    _credential: InteractiveBrowserCredential,
+    _credential: "InteractiveBrowserCredential",
     subscription_id: str,
     resource_group: str,
 ) -> List[str]:
     """List storage accounts in a resource group."""
-    smc = StorageManagementClient(_credential, subscription_id)
+    smc = _storage_mgmt(_credential, subscription_id)
     return [sa.name for sa in smc.storage_accounts.list_by_resource_group(resource_group)]
 
 
-@st.cache_data(show_spinner=False)
+@cached
 def list_blob_containers(
-    _credential: InteractiveBrowserCredential,
+    _credential: "InteractiveBrowserCredential",
     subscription_id: str,
     resource_group: str,
     account_name: str,
@@ -34,21 +35,21 @@ def list_blob_containers(
     """List blob containers in a storage account."""
     # Prefer data plane (RBAC) if possible
     try:
-        svc = BlobServiceClient(account_url=f"https://{account_name}.blob.core.windows.net", credential=_credential)
+        svc = _blob_service(_credential, account_name)
         return [c.name for c in svc.list_containers()]
     except Exception:
         pass
     # Fallback to management plane
     try:
-        smc = StorageManagementClient(_credential, subscription_id)
+        smc = _storage_mgmt(_credential, subscription_id)
         return [c.name for c in smc.blob_containers.list(resource_group, account_name)]
     except Exception as exc:
         raise exc
 
 
-@st.cache_data(show_spinner=False)
+@cached
 def list_adls_filesystems(
-    _credential: InteractiveBrowserCredential,
+    _credential: "InteractiveBrowserCredential",
     account_name: str,
 ) -> List[str]:
     """List filesystems (containers) in an ADLS Gen2 storage account."""
@@ -59,23 +60,35 @@ def list_adls_filesystems(
         raise exc
 
 
+def _storage_mgmt(
+    _credential: "InteractiveBrowserCredential",
+    subscription_id: str,
+) -> "StorageManagementClient":
+    """Create a Storage management client."""
+    from azure.mgmt.storage import StorageManagementClient
+
+    return StorageManagementClient(_credential, subscription_id)
+
+
 def _blob_service(
-    _credential: InteractiveBrowserCredential,
+    _credential: "InteractiveBrowserCredential",
     account_name: str,
-) -> BlobServiceClient:
+) -> "BlobServiceClient":
     """Create a Blob Service client."""
+    from azure.storage.blob import BlobServiceClient
+
     return BlobServiceClient(account_url=f"https://{account_name}.blob.core.windows.net", credential=_credential)
 
 
 def is_hns_enabled(
-    _credential: InteractiveBrowserCredential,
+    _credential: "InteractiveBrowserCredential",
     subscription_id: str,
     resource_group: str,
     account_name: str,
 ) -> bool:
     """Check if Hierarchical Namespace (HNS) is enabled on storage account."""
     try:
-        smc = StorageManagementClient(_credential, subscription_id)
+        smc = _storage_mgmt(_credential, subscription_id)
         props = smc.storage_accounts.get_properties(resource_group, account_name)
         d = _to_dict(props)
         # Common property names across SDKs
@@ -90,15 +103,17 @@ def is_hns_enabled(
 
 
 def _dfs_service(
-    _credential: InteractiveBrowserCredential,
+    _credential: "InteractiveBrowserCredential",
     account_name: str,
-) -> DataLakeServiceClient:
+) -> "DataLakeServiceClient":
     """Create a Data Lake Service client."""
+    from azure.storage.filedatalake import DataLakeServiceClient
+
     return DataLakeServiceClient(account_url=f"https://{account_name}.dfs.core.windows.net", credential=_credential)
 
 
 def list_adls_top_level_directories(
-    _credential: InteractiveBrowserCredential,
+    _credential: "InteractiveBrowserCredential",
     account_name: str,
     filesystem: str,
 ) -> List[Dict[str, str]]:
@@ -133,7 +148,7 @@ def list_adls_top_level_directories(
 
 
 def list_adls_files_in_directory(
-    _credential: InteractiveBrowserCredential,
+    _credential: "InteractiveBrowserCredential",
     account_name: str,
     filesystem: str,
     directory: str,
@@ -168,7 +183,7 @@ def list_adls_files_in_directory(
 
 
 def list_top_level_folders(
-    _credential: InteractiveBrowserCredential,
+    _credential: "InteractiveBrowserCredential",
     account_name: str,
     container_name: str,
 ) -> List[str]:
@@ -188,7 +203,7 @@ def list_top_level_folders(
 
 
 def list_files_in_folder(
-    _credential: InteractiveBrowserCredential,
+    _credential: "InteractiveBrowserCredential",
     account_name: str,
     container_name: str,
     folder: str,
@@ -221,7 +236,7 @@ def list_files_in_folder(
 
 
 def sample_adls_paths(
-    _credential: InteractiveBrowserCredential,
+    _credential: "InteractiveBrowserCredential",
     account_name: str,
     filesystem: str,
     limit: int = 20,
@@ -242,7 +257,7 @@ def sample_adls_paths(
 
 
 def list_top_level_folders(
-    _credential: InteractiveBrowserCredential,
+    _credential: "InteractiveBrowserCredential",
     account_name: str,
     container_name: str,
 ) -> List[str]:
@@ -261,7 +276,7 @@ def list_top_level_folders(
 
 
 def list_files_in_folder(
-    _credential: InteractiveBrowserCredential,
+    _credential: "InteractiveBrowserCredential",
     account_name: str,
     container_name: str,
     folder: str,
@@ -294,7 +309,7 @@ def list_files_in_folder(
 
 
 def sample_blob_paths(
-    _credential: InteractiveBrowserCredential,
+    _credential: "InteractiveBrowserCredential",
     account_name: str,
     container_name: str,
     limit: int = 20,
@@ -0,0 +1,204 @@
+"""
+Factory dependency graph for ADF to Fabric Migration Tool
+
+Indexes every reference in a factory snapshot (pipelines executing
+pipelines, activities touching datasets, datasets and activities backed by
+linked services, triggers starting pipelines, data flows reading datasets)
+as a directed graph with forward and reverse adjacency sets, so "who uses
+X" is a dict lookup and "what breaks if Y is not migrated" is one reverse
+traversal. Pipeline waves and connected components support wave planning.
+"""
+
+from collections import deque
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from Migration.constants import REFERENCE_KEY_KINDS, REFERENCE_KINDS
+from Migration.utilities import _norm_key
+
+if TYPE_CHECKING:
+    from Migration.factory_snapshot import FactorySnapshot
+
+# (kind, name), e.g. ("pipeline", "LoadSales") or ("linked_service", "SqlOnPrem")
+Node = Tuple[str, str]
+
+_NO_NODES: Set[Node] = frozenset()  # type: ignore[assignment]
+
+
+def _references(definition: Any) -> Iterator[Node]:
+    """Every {type: <Kind>Reference, referenceName} inside a definition (REST or SDK shape).
+
+    References without a type are recognised by the key holding them
+    (inputs, linkedServiceName, pipeline, ...).
+    """
+    stack: List[Tuple[Any, Optional[str]]] = [(definition, None)]
+    while stack:
+        obj, hint = stack.pop()
+        if isinstance(obj, dict):
+            ref_type = obj.get("type")
+            kind = REFERENCE_KINDS.get(ref_type) if isinstance(ref_type, str) else None
+            name = obj.get("referenceName") or obj.get("reference_name")
+            if isinstance(name, str) and name and (kind or hint):
+                yield (kind or hint, name)  # type: ignore[misc]
+            stack.extend((v, REFERENCE_KEY_KINDS.get(_norm_key(k))) for k, v in obj.items())
+        elif isinstance(obj, list):
+            stack.extend((v, hint) for v in obj)
+
+
+class DependencyGraph:
+    """Directed "uses" graph between factory resources with O(1) forward and reverse lookups."""
+
+    def __init__(self) -> None:
+        self._out: Dict[Node, Set[Node]] = {}
+        self._in: Dict[Node, Set[Node]] = {}
+
+    def add_node(self, node: Node) -> None:
+        if node not in self._out:
+            self._out[node] = set()
+            self._in[node] = set()
+
+    def add_edge(self, src: Node, dst: Node) -> None:
+        """Record that src uses dst; a self-reference is kept so it shows up as a cycle."""
+        self.add_node(src)
+        self.add_node(dst)
+        self._out[src].add(dst)
+        self._in[dst].add(src)
+
+    def __contains__(self, node: object) -> bool:
+        return node in self._out
+
+    def nodes(self, kind: Optional[str] = None) -> List[Node]:
+        """Nodes in insertion order, optionally of one kind."""
+        return [n for n in self._out if kind is None or n[0] == kind]
+
+    def uses(self, node: Node) -> Set[Node]:
+        """Direct dependencies of a node (read-only view)."""
+        return self._out.get(node, _NO_NODES)
+
+    def used_by(self, node: Node) -> Set[Node]:
+        """Direct users of a node (read-only view)."""
+        return self._in.get(node, _NO_NODES)
+
+    def dependents(self, node: Node, kind: Optional[str] = None) -> Set[Node]:
+        """Everything that directly or transitively uses a node, optionally of one kind."""
+        seen: Set[Node] = set()
+        queue = deque(self.used_by(node))
+        while queue:
+            n = queue.popleft()
+            if n in seen:
+                continue
+            seen.add(n)
+            queue.extend(self._in[n] - seen)
+        return {n for n in seen if kind is None or n[0] == kind}
+
+    def pipelines_using_dataset(self, dataset: str) -> Set[str]:
+        """Pipelines whose activities reference a dataset directly."""
+        return {name for kind, name in self.used_by(("dataset", dataset)) if kind == "pipeline"}
+
+    def impacted_pipelines(self, kind: str, name: str) -> Set[str]:
+        """Pipelines that break if a resource is not migrated, including their ExecutePipeline callers."""
+        return {n for _, n in self.dependents((kind, name), kind="pipeline")}
+
+    def pipeline_waves(self) -> Tuple[List[List[str]], List[str]]:
+        """Pipelines grouped so each wave only executes pipelines of earlier waves.
+
+        Returns (waves, cyclic) where cyclic lists pipelines in or behind an
+        ExecutePipeline cycle.
+        """
+        pipelines = self.nodes("pipeline")
+        order = {p: i for i, p in enumerate(pipelines)}
+        pending = {p: sum(1 for d in self._out[p] if d[0] == "pipeline") for p in pipelines}
+        wave = [p for p in pipelines if pending[p] == 0]
+        waves: List[List[str]] = []
+        while wave:
+            waves.append([name for _, name in wave])
+            nxt: List[Node] = []
+            for p in wave:
+                for caller in self._in[p]:
+                    if caller[0] == "pipeline":
+                        pending[caller] -= 1
+                        if pending[caller] == 0:
+                            nxt.append(caller)
+            wave = sorted(nxt, key=order.__getitem__)
+        cyclic = [p[1] for p in pipelines if pending[p] > 0]
+        return waves, cyclic
+
+    def topological_order(self) -> List[str]:
+        """Pipelines with executed pipelines first; cyclic ones last."""
+        waves, cyclic = self.pipeline_waves()
+        return [p for wave in waves for p in wave] + cyclic
+
+    def components(self, kind: Optional[str] = "pipeline") -> List[List[str]]:
+        """Names of one kind per weakly connected component, largest first.
+
+        Pipelines sharing a dataset, linked service or ExecutePipeline link
+        land in the same component and are best migrated in the same wave.
+        """
+        seen: Set[Node] = set()
+        out: List[List[str]] = []
+        for start in self._out:
+            if start in seen:
+                continue
+            seen.add(start)
+            members: List[str] = []
+            queue = deque([start])
+            while queue:
+                n = queue.popleft()
+                if kind is None or n[0] == kind:
+                    members.append(n[1])
+                for m in self._out[n] | self._in[n]:
+                    if m not in seen:
+                        seen.add(m)
+                        queue.append(m)
+            if members:
+                out.append(members)
+        out.sort(key=len, reverse=True)
+        return out
+
+    def wave_rows(self) -> List[Dict[str, Any]]:
+        """Pipeline, publish wave (-1 when cyclic) and component number, for wave planning."""
+        waves, cyclic = self.pipeline_waves()
+        wave_of = {p: i for i, wave in enumerate(waves) for p in wave}
+        wave_of.update((p, -1) for p in cyclic)
+        component_of = {p: i for i, comp in enumerate(self.components("pipeline")) for p in comp}
+        return [
+            {"Pipeline": p, "Wave": wave_of[p], "Component": component_of[p]}
+            for _, p in self.nodes("pipeline")
+        ]
+
+    def edge_rows(self) -> List[Dict[str, str]]:
+        """One row per edge, for tables and exports."""
+        return [
+            {"From Kind": src[0], "From": src[1], "To Kind": dst[0], "To": dst[1]}
+            for src, dsts in self._out.items()
+            for dst in sorted(dsts)
+        ]
+
+
+def graph_from_pipeline_refs(pipeline_refs: Dict[str, Iterable[str]]) -> DependencyGraph:
+    """Pipeline-only graph from name -> executed pipeline names; unknown targets are ignored."""
+    graph = DependencyGraph()
+    for name in pipeline_refs:
+        graph.add_node(("pipeline", name))
+    for name, refs in pipeline_refs.items():
+        for ref in refs:
+            if ref in pipeline_refs:
+                graph.add_edge(("pipeline", name), ("pipeline", ref))
+    return graph
+
+
+def build_dependency_graph(snapshot: "FactorySnapshot") -> DependencyGraph:
+    """Index every reference between the pipelines, datasets, linked services, triggers and data flows of a snapshot."""
+    graph = DependencyGraph()
+    for kind, resources in (
+        ("pipeline", snapshot.pipelines),
+        ("dataset", snapshot.datasets),
+        ("linked_service", snapshot.linked_services),
+        ("dataflow", snapshot.dataflows),
+        ("trigger", snapshot.triggers),
+    ):
+        for name, definition in resources.items():
+            node = (kind, name)
+            graph.add_node(node)
+            for ref in _references(definition):
+                graph.add_edge(node, ref)
+    return graph
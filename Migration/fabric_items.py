@@ -0,0 +1,80 @@
+"""
+Fabric Items API helpers for ADF to Fabric Migration Tool
+
+Creates and updates Data Pipeline items in a Fabric workspace through the
+shared FabricClient (pooled session, cached token, Retry-After handling and
+long-running operation polling).
+"""
+
+import base64
+import json
+from typing import TYPE_CHECKING, Any, Dict
+
+from Migration.constants import (
+    FABRIC_PIPELINE_CONTENT_PATH,
+    FABRIC_PIPELINE_ITEM_TYPE,
+    FABRIC_LRO_TIMEOUT_SECONDS,
+)
+
+if TYPE_CHECKING:
+    from azure.identity import InteractiveBrowserCredential
+    from Synapse_Data.fabric_client import FabricClient
+
+
+def fabric_client(credential: "InteractiveBrowserCredential") -> "FabricClient":
+    """Shared Fabric REST client for a credential."""
+    from Synapse_Data.fabric_client import get_fabric_client
+
+    return get_fabric_client(credential)
+
+
+def list_workspace_items(
+    client: "FabricClient", workspace_id: str, item_type: str = FABRIC_PIPELINE_ITEM_TYPE
+) -> Dict[str, str]:
+    """Display name -> item id for every item of one type in a workspace."""
+    items = client.list_all(f"workspaces/{workspace_id}/items?type={item_type}")
+    return {it["displayName"]: it["id"] for it in items if it.get("displayName") and it.get("id")}
+
+
+def pipeline_definition(content: Dict[str, Any]) -> Dict[str, Any]:
+    """Wrap pipeline-content.json into an Items API definition."""
+    payload = base64.b64encode(json.dumps(content).encode("utf-8")).decode("ascii")
+    return {
+        "parts": [
+            {"path": FABRIC_PIPELINE_CONTENT_PATH, "payload": payload, "payloadType": "InlineBase64"}
+        ]
+    }
+
+
+def create_pipeline(
+    client: "FabricClient",
+    workspace_id: str,
+    display_name: str,
+    content: Dict[str, Any],
+    description: str = "",
+) -> str:
+    """Create a Data Pipeline item with its definition and return the new item id."""
+    payload: Dict[str, Any] = {
+        "displayName": display_name,
+        "type": FABRIC_PIPELINE_ITEM_TYPE,
+        "definition": pipeline_definition(content),
+    }
+    if description:
+        payload["description"] = description
+    created = client.post(f"workspaces/{workspace_id}/items", payload, lro_timeout_seconds=FABRIC_LRO_TIMEOUT_SECONDS)
+    item_id = created.get("id") if isinstance(created, dict) else None
+    if not item_id:
+        # Some operations finish without echoing the item; look it up by name
+        item_id = list_workspace_items(client, workspace_id).get(display_name)
+    if not item_id:
+        raise RuntimeError(f"Fabric did not return an id for pipeline '{display_name}'")
+    return item_id
+
+
+def update_pipeline_definition(client: "FabricClient", workspace_id: str, item_id: str, content: Dict[str, Any]) -> None:
+    """Replace the definition of an existing Data Pipeline item."""
+    client.post(
+        f"workspaces/{workspace_id}/items/{item_id}/updateDefinition",
+        {"definition": pipeline_definition(content)},
+        lro_timeout_seconds=FABRIC_LRO_TIMEOUT_SECONDS,
+    )
@@ -0,0 +1,235 @@
+"""
+In-memory factory snapshot for ADF to Fabric Migration Tool
+
+A FactorySnapshot holds every pipeline, dataset, linked service, trigger and
+data flow of one Data Factory so discovery functions can project over it
+instead of downloading the same definitions again.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from Migration.utilities import _to_dict
+from Migration.constants import FETCH_MAX_WORKERS, SNAPSHOT_TTL_SECONDS
+from Migration.concurrent_fetch import call_with_backoff, fetch_concurrently
+
+if TYPE_CHECKING:
+    from azure.identity import InteractiveBrowserCredential
+
+
+@dataclass
+class FactorySnapshot:
+    """All definitions of one Data Factory, keyed by resource name in list order."""
+
+    subscription_id: str
+    resource_group: str
+    factory_name: str
+    pipelines: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    datasets: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    linked_services: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    triggers: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    dataflows: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    fetched_at: float = field(default_factory=time.time)
+    stats: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return (self.subscription_id, self.resource_group, self.factory_name)
+
+    def pipeline_activities(self) -> List[Tuple[str, List[Any]]]:
+        """(pipeline name, top-level activities) for every pipeline with activities."""
+        out: List[Tuple[str, List[Any]]] = []
+        for name, pdef in self.pipelines.items():
+            acts = _pipeline_activities(pdef)
+            if acts:
+                out.append((name, acts))
+        return out
+
+    def linked_service_types(self) -> Dict[str, str]:
+        """Linked service name -> linked service type."""
+        return {name: _linked_service_type(d) for name, d in self.linked_services.items()}
+
+
+def _resource_name(res: Any) -> Optional[str]:
+    """Get the name of an SDK resource or its dict form."""
+    return getattr(res, "name", None) or _to_dict(res).get("name")
+
+
+def _pipeline_activities(pipeline_def: Dict[str, Any]) -> Optional[List[Any]]:
+    """Get top-level activities from a pipeline definition (SDK or REST shape)."""
+    acts = pipeline_def.get("activities") or (pipeline_def.get("properties") or {}).get("activities")
+    return acts if isinstance(acts, list) else None
+
+
+def _linked_service_type(ls_def: Dict[str, Any]) -> str:
+    """Get the connector type of a linked service definition."""
+    return (ls_def.get("properties") or {}).get("type") or ls_def.get("type") or ""
+
+
+def list_resources(list_call: Any) -> Dict[str, Dict[str, Any]]:
+    """Materialize a list_by_factory pager into a name -> dict map."""
+    out: Dict[str, Dict[str, Any]] = {}
+    for res in call_with_backoff(lambda: list(list_call())):
+        name = _resource_name(res)
+        if name:
+            out[name] = _to_dict(res)
+    return out
+
+
+def _fetch_revalidated(
+    list_call: Any,
+    get_call: Any,
+    previous: Optional[Dict[str, Dict[str, Any]]] = None,
+    max_workers: int = FETCH_MAX_WORKERS,
+    strict: bool = False,
+) -> Tuple[Dict[str, Dict[str, Any]], int]:
+    """List resources, then re-fetch only those whose etag differs from the previous copy.
+
+    Returns (name -> definition in list order, number of resources fetched).
+    With strict=True a failed get raises; otherwise the listed shape is kept.
+    """
+    listed = list_resources(list_call)
+    previous = previous or {}
+    stale: List[str] = []
+    for name, d in listed.items():
+        etag = d.get("etag")
+        cached = previous.get(name)
+        if etag and isinstance(cached, dict) and cached.get("etag") == etag:
+            listed[name] = cached
+        else:
+            stale.append(name)
+    for name, full, err in fetch_concurrently(stale, get_call, max_workers=max_workers):
+        if err is not None:
+            if strict:
+                raise err
+            continue
+        if full is not None:
+            listed[name] = _to_dict(full)
+    return listed, len(stale)
+
+
+def load_factory_snapshot(
+    credential: "InteractiveBrowserCredential",
+    subscription_id: str,
+    resource_group: str,
+    factory_name: str,
+    max_workers: int = FETCH_MAX_WORKERS,
+    previous: Optional[FactorySnapshot] = None,
+) -> FactorySnapshot:
+    """Download pipelines, datasets, linked services, triggers and data flows once.
+
+    When a previous snapshot is given, pipelines and datasets whose etag is
+    unchanged are reused from it instead of being fetched again.
+    """
+    from azure.mgmt.datafactory import DataFactoryManagementClient
+
+    adf_client = DataFactoryManagementClient(credential, subscription_id)
+    snapshot = FactorySnapshot(subscription_id, resource_group, factory_name)
+    snapshot.pipelines, fetched_pipelines = _fetch_revalidated(
+        lambda: adf_client.pipelines.list_by_factory(resource_group, factory_name),
+        lambda n: adf_client.pipelines.get(resource_group, factory_name, n),
+        previous.pipelines if previous else None,
+        max_workers=max_workers,
+        strict=True,
+    )
+    try:
+        snapshot.datasets, fetched_datasets = _fetch_revalidated(
+            lambda: adf_client.datasets.list_by_factory(resource_group, factory_name),
+            lambda n: adf_client.datasets.get(resource_group, factory_name, n),
+            previous.datasets if previous else None,
+            max_workers=max_workers,
+        )
+    except Exception:
+        snapshot.datasets, fetched_datasets = {}, 0
+    snapshot.linked_services = list_resources(
+        lambda: adf_client.linked_services.list_by_factory(resource_group, factory_name)
+    )
+    # Triggers and data flows are informational; missing permissions should not fail the snapshot
+    try:
+        snapshot.triggers = list_resources(lambda: adf_client.triggers.list_by_factory(resource_group, factory_name))
+    except Exception:
+        snapshot.triggers = {}
+    try:
+        snapshot.dataflows = list_resources(lambda: adf_client.data_flows.list_by_factory(resource_group, factory_name))
+    except Exception:
+        snapshot.dataflows = {}
+    snapshot.fetched_at = time.time()
+    snapshot.stats = {
+        "pipelines_fetched": fetched_pipelines,
+        "pipelines_reused": len(snapshot.pipelines) - fetched_pipelines,
+        "datasets_fetched": fetched_datasets,
+        "datasets_reused": len(snapshot.datasets) - fetched_datasets,
+    }
+    return snapshot
+
+
+_SNAPSHOTS: Dict[Tuple[str, str, str], FactorySnapshot] = {}
+_SNAPSHOTS_LOCK = threading.Lock()
+
+
+def get_factory_snapshot(
+    credential: "InteractiveBrowserCredential",
+    subscription_id: str,
+    resource_group: str,
+    factory_name: str,
+    max_workers: int = FETCH_MAX_WORKERS,
+    refresh: bool = False,
+    ttl_seconds: float = SNAPSHOT_TTL_SECONDS,
+    persist: bool = True,
+) -> FactorySnapshot:
+    """Return the process-wide snapshot for a factory, loading it if missing or stale.
+
+    A stale, refreshed or not-yet-loaded snapshot is revalidated against the
+    previous copy (in memory, else the on-disk cache when persist=True), so
+    only pipelines and datasets whose etag changed are downloaded again.
+    """
+    key = (subscription_id, resource_group, factory_name)
+    with _SNAPSHOTS_LOCK:
+        cached = _SNAPSHOTS.get(key)
+    if cached is not None and not refresh and time.time() - cached.fetched_at < ttl_seconds:
+        return cached
+
+    store = None
+    if persist:
+        from Migration.snapshot_store import default_snapshot_store
+        store = default_snapshot_store()
+    previous = cached
+    if previous is None and store is not None:
+        try:
+            previous = store.load(key)
+        except Exception as exc:
+            print(f"Could not read cached snapshot for {factory_name}: {exc}")
+
+    snapshot = load_factory_snapshot(
+        credential, subscription_id, resource_group, factory_name, max_workers, previous=previous
+    )
+    if store is not None:
+        try:
+            store.save(snapshot)
+        except Exception as exc:
+            print(f"Could not write cached snapshot for {factory_name}: {exc}")
+    with _SNAPSHOTS_LOCK:
+        _SNAPSHOTS[key] = snapshot
+    return snapshot
+
+
+def clear_snapshot_cache(
+    subscription_id: Optional[str] = None,
+    resource_group: Optional[str] = None,
+    factory_name: Optional[str] = None,
+) -> None:
+    """Drop cached snapshots matching the given key prefix; with no arguments, drop all of them.
+
+    clear_snapshot_cache(sub) drops every factory in the subscription,
+    clear_snapshot_cache(sub, rg) every factory in the resource group.
+    """
+    parts = (subscription_id, resource_group, factory_name)
+    n = parts.index(None) if None in parts else len(parts)
+    if any(p is not None for p in parts[n:]):
+        raise ValueError("resource_group needs subscription_id and factory_name needs resource_group")
+    prefix = parts[:n]
+    with _SNAPSHOTS_LOCK:
+        for key in [k for k in _SNAPSHOTS if k[: len(prefix)] == prefix]:
+            del _SNAPSHOTS[key]
@@ -0,0 +1,138 @@
+"""
+Shared REST session and tokens for ADF to Fabric Migration Tool
+
+The Fabric REST client and the Synapse Dev API client both send through
+this module: one process-wide keep-alive session, one expiry-aware token
+cache per credential, and one retry policy. Throttled responses (429/503)
+are retried for every call; other transient 5xx responses and connection
+errors only for idempotent methods. Retry-After is honoured, otherwise the
+delay backs off exponentially with jitter.
+"""
+
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+from Migration.constants import (
+    HTTP_IDEMPOTENT_METHODS,
+    HTTP_POOL_HOSTS,
+    HTTP_POOL_SIZE,
+    HTTP_RETRY_STATUS_CODES,
+    THROTTLE_BASE_DELAY_SECONDS,
+    THROTTLE_MAX_DELAY_SECONDS,
+    THROTTLE_MAX_RETRIES,
+    THROTTLE_STATUS_CODES,
+    TOKEN_REFRESH_MARGIN_SECONDS,
+)
+
+if TYPE_CHECKING:
+    import requests
+
+
+class TokenCache:
+    """Caches credential.get_token per scope until shortly before the token expires."""
+
+    def __init__(self, credential: Any, refresh_margin_seconds: float = TOKEN_REFRESH_MARGIN_SECONDS) -> None:
+        self.credential = credential
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self._tokens: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, scope: str) -> str:
+        with self._lock:
+            cached = self._tokens.get(scope)
+            if cached and cached[1] - self.refresh_margin_seconds > time.time():
+                return cached[0]
+            access = self.credential.get_token(scope)
+            expires_on = float(getattr(access, "expires_on", 0) or time.time() + 3600)
+            self._tokens[scope] = (access.token, expires_on)
+            return access.token
+
+
+_SESSION: Optional["requests.Session"] = None
+_TOKEN_CACHES: Dict[int, Tuple[Any, TokenCache]] = {}
+_LOCK = threading.Lock()
+
+
+def shared_session() -> "requests.Session":
+    """Process-wide keep-alive session with a connection pool per host."""
+    global _SESSION
+    with _LOCK:
+        if _SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
+def token_cache(credential: Any) -> TokenCache:
+    """Token cache shared by every client of a credential object."""
+    with _LOCK:
+        entry = _TOKEN_CACHES.get(id(credential))
+        if entry is None or entry[0] is not credential:
+            entry = (credential, TokenCache(credential))
+            _TOKEN_CACHES[id(credential)] = entry
+        return entry[1]
+
+
+def retry_after(resp: "requests.Response", default: Optional[float]) -> Optional[float]:
+    """Seconds the service asked to wait (Retry-After or x-ms-retry-after-ms), else default."""
+    ms = resp.headers.get("x-ms-retry-after-ms")
+    if ms:
+        try:
+            return float(ms) / 1000.0
+        except ValueError:
+            pass
+    ra = resp.headers.get("Retry-After") or resp.headers.get("retry-after")
+    try:
+        return float(ra) if ra else default
+    except ValueError:
+        return default
+
+
+def is_retryable(method: str, status_code: int) -> bool:
+    """Whether a response status is retried under the shared policy."""
+    if status_code in THROTTLE_STATUS_CODES:
+        return True
+    return method.upper() in HTTP_IDEMPOTENT_METHODS and status_code in HTTP_RETRY_STATUS_CODES
+
+
+def send(
+    session: "requests.Session",
+    method: str,
+    url: str,
+    headers: Callable[[], Dict[str, str]],
+    payload: Any = None,
+    timeout: float = 60,
+) -> "requests.Response":
+    """One call under the shared retry policy; returns the last response.
+
+    headers is called per attempt so a refreshed token is picked up.
+    """
+    import requests
+
+    idempotent = method.upper() in HTTP_IDEMPOTENT_METHODS
+    delay = THROTTLE_BASE_DELAY_SECONDS
+    for attempt in range(THROTTLE_MAX_RETRIES + 1):
+        last = attempt == THROTTLE_MAX_RETRIES
+        wait: Optional[float] = None
+        try:
+            resp = session.request(method, url, headers=headers(), json=payload, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            if last or not idempotent:
+                raise
+        else:
+            if last or not is_retryable(method, resp.status_code):
+                return resp
+            wait = retry_after(resp, None)
+        if wait is None:
+            wait = delay + random.uniform(0, delay)
+            delay = min(delay * 2, THROTTLE_MAX_DELAY_SECONDS)
+        time.sleep(min(wait, THROTTLE_MAX_DELAY_SECONDS))
+    return resp
@@ -0,0 +1,74 @@
+"""
+Multi-keyword matcher for ADF to Fabric Migration Tool
+
+An Aho-Corasick automaton finds every keyword occurring in a string in a
+single pass over its characters, regardless of how many keywords there are.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class KeywordMatcher:
+    """Case-insensitive substring matcher over a fixed set of keywords."""
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.keywords: Tuple[str, ...] = tuple(sorted({k.lower() for k in keywords if k}))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[str, ...]] = [()]
+        for kw in self.keywords:
+            self._add(kw)
+        self._link()
+
+    def _add(self, keyword: str) -> None:
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._goto[state][ch] = nxt
+            state = nxt
+        self._out[state] = self._out[state] + (keyword,)
+
+    def _link(self) -> None:
+        """Compute failure links breadth-first and fold outputs along them."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterable[Tuple[int, str]]:
+        """Yield (end index, keyword) for every occurrence in text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text.lower()):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for kw in out[state]:
+                yield i, kw
+
+    def matches(self, text: str) -> Set[str]:
+        """Distinct keywords that occur in text."""
+        if not text:
+            return set()
+        return {kw for _, kw in self.iter_matches(text)}
+
+    def search(self, text: str) -> bool:
+        """Check if any keyword occurs in text."""
+        if not text:
+            return False
+        for _ in self.iter_matches(text):
+            return True
+        return False
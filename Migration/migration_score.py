@@ -2,15 +2,25 @@
 Migration scoring and classification functions for ADF to Fabric Migration Tool
 """
 
-from typing import Iterable
+import json
+import os
+import sys
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple, Union
 
 from Migration.constants import (
+    ACTIVITY_CATEGORIES,
+    ACTIVITY_CLASSIFICATION_ENV,
     CONTROL_ACTIVITY_TYPES,
     CONNECTIVITY_COMPLEX_KEYWORDS,
     SUPPORTED_MIGRATABLE,
 )
+from Migration.keyword_matcher import KeywordMatcher
 from Migration.utilities import _normalize_type
 
+# Built once; classifies a linked service type in a single pass
+CONNECTIVITY_MATCHER = KeywordMatcher(CONNECTIVITY_COMPLEX_KEYWORDS)
+
 
 def score_component_parity(total_acts: int, non_migratable: int) -> int:
     """Score component parity based on migratable activities."""
@@ -35,13 +45,29 @@ def score_non_migratable(non_migratable: int) -> int:
     return 3
 
 
-def score_connectivity(ls_types: Iterable[str]) -> int:
-    """Score connectivity complexity based on linked service types."""
-    types = [t.lower() for t in ls_types if t]
-    if not types:
-        return 0
-    flagged = sum(1 for t in types if any(k in t for k in CONNECTIVITY_COMPLEX_KEYWORDS))
-    if flagged == 0:
+def connectivity_keywords(ls_type: str) -> Set[str]:
+    """Complex-connectivity keywords (gateway, private network, legacy driver) in a linked service type."""
+    return CONNECTIVITY_MATCHER.matches(ls_type)
+
+
+def _driver_text(name: str, hits: Iterable[str]) -> str:
+    """Format one connectivity driver as "name: keyword, keyword"."""
+    return f"{name}: {', '.join(sorted(hits))}"
+
+
+def explain_connectivity(ls_types: Mapping[str, str]) -> str:
+    """Describe which linked services drive the connectivity score, e.g. "ls_onprem: sqlserver"."""
+    parts: List[str] = []
+    for name in sorted(ls_types):
+        hits = connectivity_keywords(ls_types[name] or "")
+        if hits:
+            parts.append(_driver_text(name, hits))
+    return "; ".join(parts)
+
+
+def _connectivity_band(flagged: int) -> int:
+    """Connectivity score for a number of complex connections."""
+    if flagged <= 0:
         return 0
     if flagged <= 1:
         return 1
@@ -50,6 +76,11 @@ def score_connectivity(ls_types: Iterable[str]) -> int:
     return 3
 
 
+def score_connectivity(ls_types: Iterable[str]) -> int:
+    """Score connectivity complexity based on linked service types."""
+    return _connectivity_band(sum(1 for t in ls_types if t and CONNECTIVITY_MATCHER.search(t)))
+
+
 def score_orchestration(total_acts: int, control_acts: int) -> int:
     """Score orchestration complexity based on control activities."""
     if total_acts <= 5 and control_acts == 0:
@@ -61,36 +92,143 @@ def score_orchestration(total_acts: int, control_acts: int) -> int:
     return 3
 
 
-def is_migratable(activity_type: str) -> bool:
-    """Check if an activity type is migratable to Fabric."""
-    return _normalize_type(activity_type) in SUPPORTED_MIGRATABLE
+def difficulty_band(parity: int, non_migratable: int, connectivity: int, orchestration: int) -> str:
+    """Map the four sub-scores to an Easy/Medium/Hard band."""
+    total = parity + non_migratable + connectivity + orchestration
+    if 3 in (parity, non_migratable, connectivity, orchestration):
+        return "🔴 Hard"
+    if total <= 4:
+        return "🟢 Easy"
+    if total <= 8:
+        return "🟡 Medium"
+    return "🔴 Hard"
 
 
-def get_activity_category(activity_type: str) -> str:
-    """Categorize an activity by type."""
-    norm = _normalize_type(activity_type)
-    if not norm:
-        return "Other"
+# Activity row columns read by score_pipelines
+SCORE_COLUMNS = (
+    "Factory",
+    "PipelineName",
+    "ActivityType",
+    "Migratable",
+    "SourceLinkedService",
+    "SinkLinkedService",
+)
+
+
+def activity_columns(act_rows: Iterable[Mapping[str, Any]]) -> Dict[str, List[Any]]:
+    """Transpose activity rows into the columns used for scoring."""
+    cols: Dict[str, List[Any]] = {c: [] for c in SCORE_COLUMNS}
+    appenders = [(c, cols[c].append) for c in SCORE_COLUMNS]
+    for r in act_rows:
+        for c, append in appenders:
+            append(r.get(c) or "")
+    return cols
+
+
+def score_pipelines(
+    act_rows: Union[Iterable[Mapping[str, Any]], Mapping[str, Sequence[Any]]],
+    ls_type_by_name: Mapping[str, str],
+) -> List[Dict[str, Any]]:
+    """Score every (Factory, PipelineName) group of activity rows.
+
+    act_rows may be activity rows or columns keyed by SCORE_COLUMNS (see
+    activity_columns). Per-pipeline counts are accumulated in one pass over
+    the columns; activity types and linked service types are classified
+    once per distinct value. Connectivity is scored per pipeline from the
+    linked services its activities reference, resolved to types through
+    ls_type_by_name; "Connectivity Drivers" lists the keywords behind it.
+    """
+    cols = act_rows if isinstance(act_rows, Mapping) else activity_columns(act_rows)
+
+    group_of: Dict[Tuple[str, str], int] = {}
+    totals: List[int] = []
+    non_migratable: List[int] = []
+    control: List[int] = []
+    used_ls: List[Set[str]] = []
+    control_by_type: Dict[str, bool] = {}
+    for fac, pipe, a_type, migratable, src_ls, sink_ls in zip(*(cols[c] for c in SCORE_COLUMNS)):
+        key = (fac or "", pipe or "")
+        g = group_of.get(key)
+        if g is None:
+            g = group_of[key] = len(totals)
+            totals.append(0)
+            non_migratable.append(0)
+            control.append(0)
+            used_ls.append(set())
+        totals[g] += 1
+        if migratable and migratable.lower() == "no":
+            non_migratable[g] += 1
+        is_control = control_by_type.get(a_type)
+        if is_control is None:
+            is_control = control_by_type[a_type] = classify_activity(a_type).is_control
+        if is_control:
+            control[g] += 1
+        if src_ls:
+            used_ls[g].add(src_ls.strip())
+        if sink_ls:
+            used_ls[g].add(sink_ls.strip())
+
+    # Linked service name -> driver text ("" when not a complex connection)
+    driver_by_name: Dict[str, str] = {}
+
+    def _driver(name: str) -> str:
+        text = driver_by_name.get(name)
+        if text is None:
+            hits = connectivity_keywords(ls_type_by_name.get(name, "") or "")
+            text = driver_by_name[name] = _driver_text(name, hits) if hits else ""
+        return text
+
+    score_rows: List[Dict[str, Any]] = []
+    for (fac, pipe), g in group_of.items():
+        total_acts = totals[g]
+        non_mig = non_migratable[g]
+        parity_score = score_component_parity(total_acts, non_mig)
+        non_mig_score = score_non_migratable(non_mig)
+        drivers = sorted(n for n in used_ls[g] if n and _driver(n))
+        connectivity_score = _connectivity_band(len(drivers))
+        orchestration_score = score_orchestration(total_acts, control[g])
+        score_rows.append({
+            "Factory": fac,
+            "Pipeline": pipe,
+            "Component Parity": parity_score,
+            "Non-Migratable": non_mig_score,
+            "Connectivity": connectivity_score,
+            "Orchestration": orchestration_score,
+            "Total Score": parity_score + non_mig_score + connectivity_score + orchestration_score,
+            "Difficulty": difficulty_band(parity_score, non_mig_score, connectivity_score, orchestration_score),
+            "Activities": total_acts,
+            "Non-Migratable Count": non_mig,
+            "Connectivity Drivers": "; ".join(driver_by_name[n] for n in drivers),
+        })
+    return score_rows
 
-    direct_map = {
-        "copy": "Move & Transform",
-        "executepipeline": "Orchestration",
-        "ifcondition": "Orchestration",
-        "wait": "Orchestration",
-        "web": "External Service",
-        "setvariable": "Orchestration",
-        "azurefunction": "Compute",
-        "foreach": "Orchestration",
-        "lookup": "Data Lookup",
-        "switch": "Orchestration",
-        "sqlserverstoredprocedure": "Database",
-        "notebook": "Synapse Notebook",
-        "executedataflow": "General"
-    }
-
-    if norm in direct_map:
-        return direct_map[norm]
 
+class ActivityClass(NamedTuple):
+    """Precomputed classification of one activity type."""
+
+    normalized: str
+    migratable: bool
+    category: str
+    is_control: bool
+
+
+# Classification tables; replaced wholesale by load_activity_classification
+_MIGRATABLE: Set[str] = set(SUPPORTED_MIGRATABLE)
+_CONTROL: Set[str] = set(CONTROL_ACTIVITY_TYPES)
+_CATEGORIES: Dict[str, str] = dict(ACTIVITY_CATEGORIES)
+
+# Normalized type -> class, and raw type string -> class (filled on first sight)
+_BY_NORM: Dict[str, ActivityClass] = {}
+_BY_RAW: Dict[str, ActivityClass] = {}
+_TABLE_LOCK = threading.Lock()
+
+
+def _category_for(norm: str) -> str:
+    """Category of a normalized activity type from the category table and name patterns."""
+    if not norm:
+        return "Other"
+    if norm in _CATEGORIES:
+        return _CATEGORIES[norm]
     if "databricks" in norm and "notebook" in norm:
         return "Databricks Notebook"
     if "synapse" in norm and "notebook" in norm:
@@ -99,5 +237,81 @@ def get_activity_category(activity_type: str) -> str:
         return "Notebook"
     if "copy" in norm:
         return "Move & Transform"
-
     return "Other"
+
+
+def _build_class(norm: str) -> ActivityClass:
+    """Classify a normalized activity type against the current tables."""
+    return ActivityClass(sys.intern(norm), norm in _MIGRATABLE, _category_for(norm), norm in _CONTROL)
+
+
+def _rebuild_tables() -> None:
+    """Precompute classes for every type named in the tables."""
+    with _TABLE_LOCK:
+        _BY_RAW.clear()
+        _BY_NORM.clear()
+        for norm in _MIGRATABLE | _CONTROL | set(_CATEGORIES):
+            _BY_NORM[norm] = _build_class(norm)
+        _BY_NORM[""] = _build_class("")
+
+
+def load_activity_classification(path: Optional[str] = None) -> bool:
+    """Extend the classification tables from a JSON file.
+
+    The file may contain "migratable" and "not_migratable" (lists of activity
+    types), "control" (list) and "categories" (type -> category). Types are
+    normalized the same way as activity types. Without a path, the file named
+    by MIGRATION_ACTIVITY_CLASSIFICATION is used, if set. Returns True if a
+    file was applied.
+    """
+    path = path or os.getenv(ACTIVITY_CLASSIFICATION_ENV)
+    if not path:
+        return False
+    try:
+        with open(os.path.expanduser(path), "r", encoding="utf-8") as f:
+            cfg = json.load(f)
+    except Exception as exc:
+        print(f"Could not load activity classification from {path}: {exc}")
+        return False
+    if not isinstance(cfg, dict):
+        print(f"Ignoring activity classification in {path}: expected a JSON object")
+        return False
+
+    for t in cfg.get("migratable") or []:
+        _MIGRATABLE.add(_normalize_type(t))
+    for t in cfg.get("not_migratable") or []:
+        _MIGRATABLE.discard(_normalize_type(t))
+    for t in cfg.get("control") or []:
+        _CONTROL.add(_normalize_type(t))
+    for t, category in (cfg.get("categories") or {}).items():
+        _CATEGORIES[_normalize_type(t)] = str(category)
+    _rebuild_tables()
+    return True
+
+
+def classify_activity(activity_type: Optional[str]) -> ActivityClass:
+    """Classify an activity type; a dict lookup once the type has been seen."""
+    raw = activity_type or ""
+    cls = _BY_RAW.get(raw)
+    if cls is None:
+        norm = _normalize_type(raw)
+        cls = _BY_NORM.get(norm)
+        if cls is None:
+            cls = _build_class(norm)
+            _BY_NORM[cls.normalized] = cls
+        _BY_RAW[sys.intern(raw)] = cls
+    return cls
+
+
+def is_migratable(activity_type: str) -> bool:
+    """Check if an activity type is migratable to Fabric."""
+    return classify_activity(activity_type).migratable
+
+
+def get_activity_category(activity_type: str) -> str:
+    """Categorize an activity by type."""
+    return classify_activity(activity_type).category
+
+
+_rebuild_tables()
+load_activity_classification()
@@ -0,0 +1,178 @@
+"""
+Offline assessment over exported factory JSON for ADF to Fabric Migration Tool
+
+Builds a FactorySnapshot from a git-integrated factory folder, an exported
+ARM template or loose resource JSON files, then produces the same activity,
+dataset I/O and scoring rows as the online path without calling Azure.
+"""
+
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from Migration.constants import (
+    ARM_RESOURCE_KINDS,
+    FACTORY_FOLDER_KINDS,
+    OFFLINE_PROCESS_POOL_MIN_FILES,
+)
+from Migration.factory_snapshot import FactorySnapshot
+from Migration.adf_components import walk_snapshot
+from Migration.dependency_graph import build_dependency_graph
+from Migration.migration_score import score_pipelines
+from Migration.utilities import _norm_key
+
+# (kind, name, definition); kind is a FactorySnapshot attribute, "factory" or "error"
+ParsedResource = Tuple[str, str, Dict[str, Any]]
+
+_DATAFLOW_TYPES = {"mappingdataflow", "flowlet", "wranglingdataflow"}
+
+
+def _arm_resource_name(raw: Any) -> str:
+    """Resource name from an ARM name such as "[concat(parameters('factoryName'), '/pl_copy')]"."""
+    text = str(raw or "")
+    m = re.search(r"'/([^']+)'", text)
+    if m:
+        return m.group(1)
+    return text.rstrip("/").split("/")[-1]
+
+
+def _classify_resource(definition: Dict[str, Any]) -> Optional[str]:
+    """Guess the snapshot attribute for a loose resource JSON document."""
+    props = definition.get("properties")
+    if not isinstance(props, dict):
+        return None
+    if isinstance(props.get("activities"), list):
+        return "pipelines"
+    rtype = _norm_key(props.get("type"))
+    if rtype.endswith("trigger") or "pipelines" in props:
+        return "triggers"
+    if rtype in _DATAFLOW_TYPES:
+        return "dataflows"
+    if "linkedServiceName" in props:
+        return "datasets"
+    if rtype and "typeProperties" in props:
+        return "linked_services"
+    return None
+
+
+def _parse_arm_template(doc: Dict[str, Any]) -> List[ParsedResource]:
+    """Factory resources from an exported ARM template."""
+    out: List[ParsedResource] = []
+    params = doc.get("parameters") or {}
+    factory_param = (params.get("factoryName") or {}).get("defaultValue") if isinstance(params, dict) else None
+    if isinstance(factory_param, str) and factory_param:
+        out.append(("factory", factory_param, {}))
+    for res in doc.get("resources") or []:
+        if not isinstance(res, dict):
+            continue
+        rtype = str(res.get("type") or "").lower()
+        if not rtype.startswith("microsoft.datafactory/factories/"):
+            continue
+        kind = ARM_RESOURCE_KINDS.get(rtype.rsplit("/", 1)[-1])
+        if not kind:
+            continue
+        name = _arm_resource_name(res.get("name"))
+        out.append((kind, name, {"name": name, "properties": res.get("properties") or {}}))
+    return out
+
+
+def _parse_file(path: str) -> List[ParsedResource]:
+    """Parse one JSON file into factory resources (runs in worker processes)."""
+    try:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            doc = json.load(f)
+    except Exception as exc:
+        return [("error", path, {"error": str(exc)})]
+    if not isinstance(doc, dict):
+        return []
+    if isinstance(doc.get("resources"), list):
+        return _parse_arm_template(doc)
+
+    folder = _norm_key(Path(path).parent.name)
+    name = doc.get("name") or Path(path).stem
+    if folder == "factory":
+        return [("factory", name, {})]
+    kind = FACTORY_FOLDER_KINDS.get(folder) or _classify_resource(doc)
+    if not kind:
+        return []
+    return [(kind, name, doc)]
+
+
+def _json_files(path: Path) -> List[str]:
+    """JSON files under a folder (or the file itself), in a stable order."""
+    if path.is_file():
+        return [str(path)]
+    return sorted(str(p) for p in path.rglob("*.json") if p.is_file())
+
+
+def _parse_files(files: List[str], max_workers: Optional[int] = None) -> List[List[ParsedResource]]:
+    """Parse files in worker processes when there are enough of them, else inline."""
+    if len(files) < OFFLINE_PROCESS_POOL_MIN_FILES:
+        return [_parse_file(f) for f in files]
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(files) // (workers * 4))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_parse_file, files, chunksize=chunksize))
+    except (OSError, BrokenProcessPool) as exc:
+        print(f"Process pool unavailable ({exc}); parsing files inline.")
+        return [_parse_file(f) for f in files]
+
+
+def load_factory_snapshot_from_path(
+    path: os.PathLike,
+    factory_name: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> FactorySnapshot:
+    """Build a FactorySnapshot from a factory folder, ARM template or resource JSON file."""
+    root = Path(path)
+    if not root.exists():
+        raise FileNotFoundError(f"Offline factory path not found: {root}")
+    files = _json_files(root)
+
+    snapshot = FactorySnapshot("", "", factory_name or "")
+    discovered_factory = ""
+    failed = 0
+    for parsed in _parse_files(files, max_workers):
+        for kind, name, definition in parsed:
+            if kind == "error":
+                failed += 1
+                print(f"Skipping unreadable file {name}: {definition.get('error')}")
+            elif kind == "factory":
+                discovered_factory = discovered_factory or name
+            else:
+                getattr(snapshot, kind)[name] = definition
+
+    if not snapshot.factory_name:
+        snapshot.factory_name = discovered_factory or (root.stem if root.is_file() else root.name)
+    snapshot.fetched_at = time.time()
+    snapshot.stats = {"files_parsed": len(files) - failed, "files_failed": failed}
+    return snapshot
+
+
+def assess_offline(
+    path: os.PathLike,
+    factory_name: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Activity, dataset I/O, linked service, score and dependency rows for an exported factory."""
+    snapshot = load_factory_snapshot_from_path(path, factory_name, max_workers)
+    walk = walk_snapshot(snapshot)
+    graph = build_dependency_graph(snapshot)
+    ls_types = snapshot.linked_service_types()
+    return {
+        "activities": walk.activity_rows,
+        "dataset_io": walk.dataset_io_rows,
+        "linked_services": [
+            {"Factory": snapshot.factory_name, "LinkedService": n, "LinkedServiceType": t}
+            for n, t in ls_types.items()
+        ],
+        "scores": score_pipelines(walk.activity_rows, ls_types),
+        "dependencies": [{"Factory": snapshot.factory_name, **row} for row in graph.edge_rows()],
+        "waves": [{"Factory": snapshot.factory_name, **row} for row in graph.wave_rows()],
+    }
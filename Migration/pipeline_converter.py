@@ -0,0 +1,284 @@
+"""
+ADF pipeline to Fabric Data Pipeline conversion for ADF to Fabric Migration Tool
+
+Converts pipeline definitions already held in a FactorySnapshot into Fabric
+pipeline-content.json bodies: datasets are inlined as datasetSettings, linked
+services become connection references from resolutions.json, and
+ExecutePipeline targets are bound to Fabric item ids at publish time.
+"""
+
+import copy
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Union
+from urllib.parse import urlparse
+
+from Migration.activity_visitor import iter_activities
+from Migration.constants import (
+    DATASET_SETTINGS_ACTIVITY_TYPES,
+    FABRIC_PIPELINE_PROPERTIES,
+    RESOLUTION_TYPES,
+)
+from Migration.migration_score import classify_activity
+from Migration.utilities import _normalize_type
+
+if TYPE_CHECKING:
+    from Migration.factory_snapshot import FactorySnapshot
+
+_DATASET_PARAM_RE = re.compile(r"dataset\(\)\.([A-Za-z_][A-Za-z0-9_]*)")
+
+
+@dataclass
+class Resolutions:
+    """Mappings from resolutions.json, one dict per entry type."""
+
+    linked_services: Dict[str, str] = field(default_factory=dict)
+    credentials: Dict[str, str] = field(default_factory=dict)
+    url_hosts: Dict[str, str] = field(default_factory=dict)
+    resource_ids: Dict[str, str] = field(default_factory=dict)
+
+    def resource_id(self, kind: str, name: str) -> Optional[str]:
+        """Fabric id mapped by an AdfResourceNameToFabricResourceId entry ("<Kind>:<name>")."""
+        return self.resource_ids.get(f"{kind}:{name}")
+
+
+def load_resolutions(path: Optional[Union[str, Path]] = None) -> Resolutions:
+    """Read resolutions.json (a list of {type, key, value}); a missing path gives no mappings."""
+    res = Resolutions()
+    if not path:
+        return res
+    with open(path, "r", encoding="utf-8-sig") as f:
+        entries = json.load(f)
+    targets = dict(zip(RESOLUTION_TYPES, (res.linked_services, res.credentials, res.url_hosts, res.resource_ids)))
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        target = targets.get(entry.get("type") or "")
+        key, value = entry.get("key"), entry.get("value")
+        if target is None:
+            print(f"Ignoring unsupported resolution type: {entry.get('type')}")
+        elif key and value:
+            target[str(key)] = str(value)
+    return res
+
+
+@dataclass
+class ConvertedPipeline:
+    """A Fabric pipeline-content.json body plus what is needed to publish it."""
+
+    name: str
+    content: Dict[str, Any]
+    pipeline_refs: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def bind(self, pipeline_ids: Dict[str, str]) -> Dict[str, Any]:
+        """Copy of the content with ExecutePipeline targets replaced by Fabric item ids.
+
+        Raises KeyError naming the first target that has no id yet.
+        """
+        content = copy.deepcopy(self.content)
+        for node in iter_activities(content["properties"].get("activities"), self.name):
+            a = node.activity
+            if _normalize_type(a.get("type")) != "executepipeline":
+                continue
+            ref = (a.get("typeProperties") or {}).get("pipeline")
+            if isinstance(ref, dict) and ref.get("referenceName") in self.pipeline_refs:
+                target = ref["referenceName"]
+                if target not in pipeline_ids:
+                    raise KeyError(target)
+                ref["referenceName"] = pipeline_ids[target]
+        return content
+
+
+def _rest_shape(model: str, definition: Dict[str, Any]) -> Dict[str, Any]:
+    """REST (camelCase, typeProperties) form of a definition that may come from SDK as_dict()."""
+    sdk_shaped = (
+        "activities" in definition and "properties" not in definition
+    ) or "linked_service_name" in (definition.get("properties") or {})
+    if not sdk_shaped:
+        return definition
+    from azure.mgmt.datafactory import models
+
+    return getattr(models, model).from_dict(definition).serialize()
+
+
+def _properties(definition: Dict[str, Any]) -> Dict[str, Any]:
+    props = definition.get("properties")
+    return props if isinstance(props, dict) else definition
+
+
+def _expr_token(value: Any) -> Optional[str]:
+    """Expression-language fragment for a dataset parameter value, or None if it cannot be inlined."""
+    if isinstance(value, dict):
+        expr = value.get("value")
+        if isinstance(expr, str) and expr.startswith("@") and not expr.startswith("@{"):
+            return expr[1:]
+        value = expr
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    return None
+
+
+def _bind_dataset_parameters(obj: Any, values: Dict[str, Any]) -> Any:
+    """Replace dataset().<param> references, which Fabric datasetSettings cannot carry."""
+    if isinstance(obj, list):
+        return [_bind_dataset_parameters(v, values) for v in obj]
+    if not isinstance(obj, dict):
+        return obj
+    expr = obj.get("value")
+    if obj.get("type") == "Expression" and isinstance(expr, str) and "dataset()" in expr:
+        whole = _DATASET_PARAM_RE.fullmatch(expr[1:]) if expr.startswith("@") else None
+        if whole and whole.group(1) in values:
+            return copy.deepcopy(values[whole.group(1)])
+
+        def _sub(m: "re.Match[str]") -> str:
+            token = _expr_token(values.get(m.group(1)))
+            return token if token is not None else m.group(0)
+
+        return {**obj, "value": _DATASET_PARAM_RE.sub(_sub, expr)}
+    return {k: _bind_dataset_parameters(v, values) for k, v in obj.items()}
+
+
+class PipelineConverter:
+    """Converts REST-shaped ADF pipelines using a factory's datasets and a resolutions map."""
+
+    def __init__(self, datasets: Dict[str, Dict[str, Any]], resolutions: Resolutions) -> None:
+        self.datasets = datasets
+        self.resolutions = resolutions
+        self._rest_datasets: Dict[str, Dict[str, Any]] = {}
+
+    def _dataset(self, name: str) -> Optional[Dict[str, Any]]:
+        ds = self._rest_datasets.get(name)
+        if ds is None and name in self.datasets:
+            ds = self._rest_datasets[name] = _properties(_rest_shape("DatasetResource", self.datasets[name]))
+        return ds
+
+    def _connection(self, linked_service: str, result: ConvertedPipeline, where: str) -> Optional[Dict[str, str]]:
+        conn = self.resolutions.linked_services.get(linked_service)
+        if conn:
+            return {"connection": conn}
+        result.errors.append(
+            f"{where}: linked service '{linked_service}' has no LinkedServiceToConnectionId resolution"
+        )
+        return None
+
+    def _dataset_settings(self, ref: Any, result: ConvertedPipeline, where: str) -> Optional[Dict[str, Any]]:
+        """Inline a DatasetReference as Fabric datasetSettings."""
+        name = ref.get("referenceName") if isinstance(ref, dict) else None
+        ds = self._dataset(name) if name else None
+        if ds is None:
+            result.errors.append(f"{where}: dataset '{name}' not found in the factory")
+            return None
+        settings: Dict[str, Any] = {
+            "annotations": ds.get("annotations") or [],
+            "type": ds.get("type"),
+            "typeProperties": ds.get("typeProperties") or {},
+            "schema": ds.get("schema") or [],
+        }
+        ls_name = (ds.get("linkedServiceName") or {}).get("referenceName")
+        if ls_name:
+            refs = self._connection(ls_name, result, where)
+            if refs:
+                settings["externalReferences"] = refs
+        values = {
+            p: spec.get("defaultValue")
+            for p, spec in (ds.get("parameters") or {}).items()
+            if isinstance(spec, dict)
+        }
+        values.update(ref.get("parameters") or {})
+        return _bind_dataset_parameters(settings, values)
+
+    def _convert_activity(self, a: Dict[str, Any], result: ConvertedPipeline) -> None:
+        """Rewrite one activity in place."""
+        a_type = a.get("type") or ""
+        norm = _normalize_type(a_type)
+        where = f"Activity '{a.get('name')}'"
+        tprops = a.setdefault("typeProperties", {})
+        if not classify_activity(a_type).migratable:
+            result.warnings.append(f"{where}: {a_type} is not on the supported list; converted as-is")
+
+        ls = a.pop("linkedServiceName", None)
+        if isinstance(ls, dict) and ls.get("referenceName"):
+            refs = self._connection(ls["referenceName"], result, where)
+            if refs:
+                a["externalReferences"] = refs
+
+        if norm == "copy":
+            for io_key, side in (("inputs", "source"), ("outputs", "sink")):
+                refs = a.pop(io_key, None) or []
+                if refs:
+                    settings = self._dataset_settings(refs[0], result, where)
+                    if settings is not None:
+                        tprops.setdefault(side, {})["datasetSettings"] = settings
+        elif norm in DATASET_SETTINGS_ACTIVITY_TYPES and "dataset" in tprops:
+            settings = self._dataset_settings(tprops.pop("dataset"), result, where)
+            if settings is not None:
+                tprops["datasetSettings"] = settings
+        elif norm == "executepipeline":
+            ref = tprops.get("pipeline") or {}
+            target = ref.get("referenceName")
+            mapped = self.resolutions.resource_id("Pipeline", target) if target else None
+            if mapped:
+                ref["referenceName"] = mapped
+            elif target and target not in result.pipeline_refs:
+                result.pipeline_refs.append(target)
+        elif norm in ("web", "webhook"):
+            url = tprops.get("url")
+            host = urlparse(url).netloc if isinstance(url, str) else ""
+            credential = ((tprops.get("authentication") or {}).get("credential") or {}).get("referenceName")
+            conn = self.resolutions.url_hosts.get(host) or self.resolutions.credentials.get(credential or "")
+            if conn:
+                a["externalReferences"] = {"connection": conn}
+
+    def convert(self, name: str, definition: Dict[str, Any]) -> ConvertedPipeline:
+        """Convert one pipeline definition (REST, ARM or SDK as_dict shape)."""
+        props = _properties(_rest_shape("PipelineResource", definition))
+        content = {k: copy.deepcopy(props[k]) for k in FABRIC_PIPELINE_PROPERTIES if props.get(k) is not None}
+        content.setdefault("activities", [])
+        result = ConvertedPipeline(name, {"properties": content})
+        for node in iter_activities(content["activities"], name):
+            self._convert_activity(node.activity, result)
+        return result
+
+
+def convert_pipelines(
+    pipelines: Dict[str, Dict[str, Any]],
+    datasets: Dict[str, Dict[str, Any]],
+    resolutions: Resolutions,
+    names: Optional[Iterable[str]] = None,
+) -> Dict[str, ConvertedPipeline]:
+    """Convert the named pipelines (default all) and every pipeline they execute, transitively."""
+    converter = PipelineConverter(datasets, resolutions)
+    pending = list(names) if names is not None else list(pipelines)
+    out: Dict[str, ConvertedPipeline] = {}
+    while pending:
+        name = pending.pop()
+        if name in out:
+            continue
+        definition = pipelines.get(name)
+        if definition is None:
+            out[name] = ConvertedPipeline(name, {"properties": {}}, errors=[f"Pipeline '{name}' not found in the factory"])
+            continue
+        converted = out[name] = converter.convert(name, definition)
+        pending.extend(ref for ref in converted.pipeline_refs if ref in pipelines and ref not in out)
+    return out
+
+
+def convert_snapshot(
+    snapshot: "FactorySnapshot",
+    names: Optional[Iterable[str]] = None,
+    resolutions: Optional[Resolutions] = None,
+) -> Dict[str, ConvertedPipeline]:
+    """Convert pipelines straight from the definitions fetched for assessment."""
+    return convert_pipelines(snapshot.pipelines, snapshot.datasets, resolutions or Resolutions(), names)
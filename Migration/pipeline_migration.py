@@ -0,0 +1,188 @@
+"""
+In-process ADF to Fabric pipeline migration for ADF to Fabric Migration Tool
+
+Replaces the PowerShell Import-AdfFactory | ConvertTo-FabricResources |
+Import-FabricResolutions | Export-FabricResources chain: pipelines are
+converted from the assessment snapshot and published with the Fabric Items
+API. Independent pipelines publish concurrently; a pipeline is only
+started once every pipeline it executes has finished.
+"""
+
+import json
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Union
+
+from Migration.constants import MIGRATION_PUBLISH_MAX_WORKERS
+from Migration.dependency_graph import DependencyGraph, graph_from_pipeline_refs
+from Migration.fabric_items import (
+    create_pipeline,
+    fabric_client,
+    list_workspace_items,
+    update_pipeline_definition,
+)
+from Migration.pipeline_converter import ConvertedPipeline, convert_snapshot, load_resolutions
+
+if TYPE_CHECKING:
+    from azure.identity import InteractiveBrowserCredential
+    from Migration.factory_snapshot import FactorySnapshot
+    from Synapse_Data.fabric_client import FabricClient
+
+
+def _call_graph(converted: Dict[str, ConvertedPipeline]) -> DependencyGraph:
+    return graph_from_pipeline_refs({name: c.pipeline_refs for name, c in converted.items()})
+
+
+def publish_order(converted: Dict[str, ConvertedPipeline]) -> List[str]:
+    """Pipeline names with every ExecutePipeline target before the pipelines that call it."""
+    return _call_graph(converted).topological_order()
+
+
+def _result_row(
+    converted: ConvertedPipeline,
+    status: str,
+    item_id: str = "",
+    message: str = "",
+    started: float = 0.0,
+) -> Dict[str, Any]:
+    return {
+        "Pipeline": converted.name,
+        "Status": status,
+        "Fabric Item Id": item_id,
+        "Message": message or "; ".join(converted.errors),
+        "Warnings": "; ".join(converted.warnings),
+        "Seconds": round(time.time() - started, 2) if started else 0.0,
+    }
+
+
+def publish_pipeline(
+    client: "FabricClient",
+    workspace_id: str,
+    converted: ConvertedPipeline,
+    pipeline_ids: Dict[str, str],
+) -> Dict[str, Any]:
+    """Create or update one converted pipeline; pipeline_ids gains its item id on success."""
+    started = time.time()
+    if not converted.ok:
+        return _result_row(converted, "Skipped", started=started)
+    try:
+        content = converted.bind(pipeline_ids)
+    except KeyError as exc:
+        return _result_row(
+            converted, "Skipped", message=f"Executed pipeline {exc} was not published", started=started
+        )
+    try:
+        item_id = pipeline_ids.get(converted.name)
+        if item_id:
+            update_pipeline_definition(client, workspace_id, item_id, content)
+            status = "Updated"
+        else:
+            item_id = create_pipeline(client, workspace_id, converted.name, content)
+            status = "Created"
+    except Exception as exc:
+        return _result_row(converted, "Failed", message=str(exc), started=started)
+    pipeline_ids[converted.name] = item_id
+    return _result_row(converted, status, item_id, message="", started=started)
+
+
+def publish_pipelines(
+    client: "FabricClient",
+    workspace_id: str,
+    converted: Dict[str, ConvertedPipeline],
+    pipeline_ids: Dict[str, str],
+    max_workers: int = MIGRATION_PUBLISH_MAX_WORKERS,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """Publish converted pipelines on a worker pool, each once the pipelines it executes are done.
+
+    Rows come back in publish order. Pipelines caught in an ExecutePipeline
+    cycle are skipped.
+    """
+    graph = _call_graph(converted)
+    order = graph.topological_order()
+    waiting: Dict[str, Set[str]] = {name: {n for _, n in graph.uses(("pipeline", name))} for name in converted}
+    ready: Deque[str] = deque(name for name in order if not waiting[name])
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def _task(name: str) -> Dict[str, Any]:
+        # Targets are written to pipeline_ids before their callers are submitted
+        return publish_pipeline(client, workspace_id, converted[name], pipeline_ids)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        running: Dict[Future, str] = {}
+        while ready or running:
+            while ready:
+                name = ready.popleft()
+                running[pool.submit(_task, name)] = name
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = running.pop(fut)
+                try:
+                    row = fut.result()
+                except Exception as exc:
+                    row = _result_row(converted[name], "Failed", message=str(exc))
+                results[name] = row
+                if progress is not None:
+                    progress(row)
+                for _, caller in graph.used_by(("pipeline", name)):
+                    waiting[caller].discard(name)
+                    if not waiting[caller]:
+                        ready.append(caller)
+
+    for name in converted:
+        if name not in results:
+            results[name] = _result_row(converted[name], "Skipped", message="Part of an ExecutePipeline cycle")
+            if progress is not None:
+                progress(results[name])
+    return [results[name] for name in order]
+
+
+def write_manifest(path: Union[str, Path], rows: List[Dict[str, Any]], **details: Any) -> Path:
+    """Write the per-pipeline results and a status summary to a JSON manifest."""
+    summary: Dict[str, int] = {}
+    for row in rows:
+        summary[row["Status"]] = summary.get(row["Status"], 0) + 1
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({**details, "summary": summary, "pipelines": rows}, f, indent=2)
+    return path
+
+
+def migrate_pipelines(
+    credential: "InteractiveBrowserCredential",
+    snapshot: "FactorySnapshot",
+    workspace_id: str,
+    pipeline_names: Optional[Iterable[str]] = None,
+    resolutions_file: Optional[Union[str, Path]] = None,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    max_workers: int = MIGRATION_PUBLISH_MAX_WORKERS,
+    manifest_path: Optional[Union[str, Path]] = None,
+) -> List[Dict[str, Any]]:
+    """Convert and publish pipelines (default all) into a Fabric workspace, one result row each.
+
+    Pipelines run by ExecutePipeline are migrated too. Pipelines whose name
+    already exists in the workspace have their definition replaced. With
+    manifest_path, the rows are also written there as a JSON manifest.
+    """
+    started = datetime.now(timezone.utc)
+    converted = convert_snapshot(snapshot, pipeline_names, load_resolutions(resolutions_file))
+    client = fabric_client(credential)
+    pipeline_ids = list_workspace_items(client, workspace_id)
+
+    rows = publish_pipelines(client, workspace_id, converted, pipeline_ids, max_workers, progress)
+    if manifest_path:
+        write_manifest(
+            manifest_path,
+            rows,
+            factory=snapshot.factory_name,
+            subscriptionId=snapshot.subscription_id,
+            resourceGroup=snapshot.resource_group,
+            workspaceId=workspace_id,
+            startedAt=started.isoformat(),
+            finishedAt=datetime.now(timezone.utc).isoformat(),
+        )
+    return rows
@@ -0,0 +1,141 @@
+"""
+Persistent factory snapshot cache for ADF to Fabric Migration Tool
+
+Snapshots are stored in a local SQLite database keyed by
+subscription / resource group / factory, one row per resource, so the next
+visit only needs to re-fetch resources whose etag changed.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+from Migration.constants import SNAPSHOT_CACHE_DIR_ENV, SNAPSHOT_CACHE_DEFAULT_DIR
+from Migration.factory_snapshot import FactorySnapshot
+
+# Snapshot attribute <-> stored resource kind
+_KINDS = ("pipelines", "datasets", "linked_services", "triggers", "dataflows")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    subscription_id TEXT NOT NULL,
+    resource_group  TEXT NOT NULL,
+    factory_name    TEXT NOT NULL,
+    fetched_at      REAL NOT NULL,
+    PRIMARY KEY (subscription_id, resource_group, factory_name)
+);
+CREATE TABLE IF NOT EXISTS resources (
+    subscription_id TEXT NOT NULL,
+    resource_group  TEXT NOT NULL,
+    factory_name    TEXT NOT NULL,
+    kind            TEXT NOT NULL,
+    name            TEXT NOT NULL,
+    position        INTEGER NOT NULL,
+    etag            TEXT,
+    body            TEXT NOT NULL,
+    PRIMARY KEY (subscription_id, resource_group, factory_name, kind, name)
+);
+"""
+
+
+def default_cache_dir() -> Path:
+    """Cache directory from MIGRATION_CACHE_DIR, or a per-user default."""
+    raw = os.getenv(SNAPSHOT_CACHE_DIR_ENV) or SNAPSHOT_CACHE_DEFAULT_DIR
+    return Path(os.path.expanduser(raw))
+
+
+class SnapshotStore:
+    """SQLite-backed store of factory snapshots."""
+
+    def __init__(self, cache_dir: Optional[os.PathLike] = None) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.cache_dir / "factory_snapshots.sqlite"
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def load(self, key: Tuple[str, str, str]) -> Optional[FactorySnapshot]:
+        """Load a stored snapshot, or None if this factory was never cached."""
+        with self._lock, self._connect() as conn:
+            head = conn.execute(
+                "SELECT fetched_at FROM snapshots WHERE subscription_id=? AND resource_group=? AND factory_name=?",
+                key,
+            ).fetchone()
+            if head is None:
+                return None
+            rows = conn.execute(
+                "SELECT kind, name, body FROM resources "
+                "WHERE subscription_id=? AND resource_group=? AND factory_name=? "
+                "ORDER BY kind, position",
+                key,
+            ).fetchall()
+        snapshot = FactorySnapshot(*key, fetched_at=head[0])
+        for kind, name, body in rows:
+            if kind in _KINDS:
+                getattr(snapshot, kind)[name] = json.loads(body)
+        return snapshot
+
+    def save(self, snapshot: FactorySnapshot) -> None:
+        """Replace the stored copy of a factory with this snapshot."""
+        key = snapshot.key
+        rows = []
+        for kind in _KINDS:
+            for pos, (name, body) in enumerate(getattr(snapshot, kind).items()):
+                etag = body.get("etag") if isinstance(body, dict) else None
+                rows.append((*key, kind, name, pos, etag, json.dumps(body, default=str)))
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "DELETE FROM resources WHERE subscription_id=? AND resource_group=? AND factory_name=?",
+                key,
+            )
+            conn.executemany(
+                "INSERT INTO resources (subscription_id, resource_group, factory_name, kind, name, position, etag, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshots (subscription_id, resource_group, factory_name, fetched_at) "
+                "VALUES (?, ?, ?, ?)",
+                (*key, snapshot.fetched_at),
+            )
+
+    def delete(self, key: Tuple[str, str, str]) -> None:
+        """Forget a cached factory."""
+        with self._lock, self._connect() as conn:
+            for table in ("resources", "snapshots"):
+                conn.execute(
+                    f"DELETE FROM {table} WHERE subscription_id=? AND resource_group=? AND factory_name=?",
+                    key,
+                )
+
+
+_DEFAULT_STORE: Optional[SnapshotStore] = None
+_DEFAULT_STORE_FAILED = False
+_DEFAULT_STORE_LOCK = threading.Lock()
+
+
+def default_snapshot_store() -> Optional[SnapshotStore]:
+    """Process-wide store in the default cache directory, or None if it cannot be created."""
+    global _DEFAULT_STORE, _DEFAULT_STORE_FAILED
+    with _DEFAULT_STORE_LOCK:
+        if _DEFAULT_STORE is None and not _DEFAULT_STORE_FAILED:
+            try:
+                _DEFAULT_STORE = SnapshotStore()
+            except (OSError, sqlite3.Error) as exc:
+                print(f"Snapshot cache disabled: {exc}")
+                _DEFAULT_STORE_FAILED = True
+        return _DEFAULT_STORE
@@ -2,35 +2,39 @@
 SQL Server operations for ADF to Fabric Migration Tool
 """
 
-from typing import Dict, List, Any, Set, Tuple
-
-import streamlit as st
-from azure.identity import InteractiveBrowserCredential
-from azure.mgmt.sql import SqlManagementClient
-from azure.mgmt.datafactory import DataFactoryManagementClient
+from typing import TYPE_CHECKING, Dict, List, Any, Set, Tuple
 
+from Migration.caching import cached
 from Migration.utilities import _to_dict, _parse_table_identifier
+from Migration.keyword_matcher import KeywordMatcher
+
+if TYPE_CHECKING:
+    from azure.identity import InteractiveBrowserCredential
 
 
-@st.cache_data(show_spinner=False)
+@cached
 def list_sql_servers(
-    _credential: InteractiveBrowserCredential,
+    _credential: "InteractiveBrowserCredential",
     subscription_id: str,
     resource_group: str,
 ) -> List[str]:
     """List Azure SQL logical servers in a resource group."""
+    from azure.mgmt.sql import SqlManagementClient
+
     client = SqlManagementClient(_credential, subscription_id)
     return [srv.name for srv in client.servers.list_by_resource_group(resource_group)]
 
 
-@st.cache_data(show_spinner=False)
+@cached
 def list_sql_databases_for_server(
-    _credential: InteractiveBrowserCredential,
+    _credential: "InteractiveBrowserCredential",
     subscription_id: str,
     resource_group: str,
     server_name: str,
 ) -> List[Dict[str, Any]]:
     """Return basic metadata for databases on a given Azure SQL server."""
+    from azure.mgmt.sql import SqlManagementClient
+
     client = SqlManagementClient(_credential, subscription_id)
     rows: List[Dict[str, Any]] = []
     for db in client.databases.list_by_server(resource_group_name=resource_group, server_name=server_name):
@@ -51,7 +55,7 @@ def list_sql_databases_for_server(
 
 
 def list_sql_usage_for_database_from_adf(
-    credential: InteractiveBrowserCredential,
+    credential: "InteractiveBrowserCredential",
     subscription_id: str,
     resource_group: str,
     factory_name: str,
@@ -62,6 +66,8 @@ def list_sql_usage_for_database_from_adf(
 
     This inspects linked services only (no direct SQL connection).
     """
+    from azure.mgmt.datafactory import DataFactoryManagementClient
+
     adf_client = DataFactoryManagementClient(credential, subscription_id)
 
     server_lower = (sql_server_name or "").lower()
@@ -69,6 +75,10 @@ def list_sql_usage_for_database_from_adf(
     if not server_lower or not db_lower:
         return []
 
+    # One pass per linked service finds the bare server name, its FQDN and the database
+    fqdn = f"{server_lower}.database.windows.net"
+    matcher = KeywordMatcher((server_lower, fqdn, db_lower))
+
     # 1) Find linked services that point at this server+database
     target_ls: Set[str] = set()
     ls_rows: Dict[str, Dict[str, str]] = {}
@@ -90,8 +100,9 @@ def list_sql_usage_for_database_from_adf(
         if not text:
             continue
         # Match either bare server name or fully qualified host
-        server_match = server_lower in text or f"{server_lower}.database.windows.net" in text
-        db_match = db_lower in text
+        hits = matcher.matches(text)
+        server_match = server_lower in hits or fqdn in hits
+        db_match = db_lower in hits
         if server_match and db_match:
             target_ls.add(name)
             ls_rows[name] = {
@@ -104,7 +115,7 @@ def list_sql_usage_for_database_from_adf(
 
 
 def list_sql_tables_for_database_from_adf(
-    credential: InteractiveBrowserCredential,
+    credential: "InteractiveBrowserCredential",
     subscription_id: str,
     resource_group: str,
     factory_name: str,
@@ -1,16 +1,27 @@
-from typing import List, Dict, Any, Optional
-import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, List, Dict, Any, Optional, Sequence, Tuple
 
-from azure.identity import InteractiveBrowserCredential
+if TYPE_CHECKING:
+    from azure.identity import InteractiveBrowserCredential
 
-from Migration.adf_components import _activity_rows_helper
+from Migration.azure_common import list_synapse_workspaces_in_subscription
+from Migration.adf_components import _collect_activity_rows, activity_rows_from_snapshot
+from Migration.concurrent_fetch import call_with_backoff, fetch_concurrently
+from Migration.constants import FETCH_MAX_WORKERS, SNAPSHOT_TTL_SECONDS, SYNAPSE_ASSESS_MAX_WORKERS
+from Migration.factory_snapshot import FactorySnapshot
+from Migration.migration_score import score_pipelines
+from Migration.synapse_dev_client import get_synapse_dev_client
+from Migration.utilities import _extract_linked_service_reference
 
 
 # ---------------------------------------------------------
 # List Synapse Workspaces (ARM – still correct)
 # ---------------------------------------------------------
 def list_synapse_workspaces(
-    credential: InteractiveBrowserCredential,
+    credential: "InteractiveBrowserCredential",
     subscription_id: str,
     resource_group: str,
 ) -> List[str]:
@@ -20,112 +31,291 @@ def list_synapse_workspaces(
     return [ws.name for ws in client.workspaces.list_by_resource_group(resource_group)]
 
 
-# ---------------------------------------------------------
-# Fetch Synapse Pipelines & Activities (DEV API – REQUIRED)
-# ---------------------------------------------------------
-def fetch_activity_rows_for_synapse(
-    credential: InteractiveBrowserCredential,
-    subscription_id: str,
-    resource_group: str,
-    workspace_name: str,
-    ds_map: Optional[Dict[str, Dict[str, Any]]] = None,
-) -> List[Dict[str, str]]:
-    """
-    Synapse pipelines are NOT ARM resources.
-    They must be fetched via the Synapse Dev REST API.
-    """
+def list_synapse_workspaces_in_subscriptions(
+    credential: "InteractiveBrowserCredential",
+    subscription_ids: Sequence[str],
+    max_workers: int = FETCH_MAX_WORKERS,
+) -> List[Tuple[str, str, str]]:
+    """(subscription id, resource group, workspace name) for every workspace, subscriptions listed concurrently."""
 
-    # Acquire token for Synapse Dev API
-    token = credential.get_token(
-        "https://dev.azuresynapse.net/.default"
-    ).token
+    def _list(subscription_id: str) -> List[Tuple[str, str, str]]:
+        return [
+            (subscription_id, rg, name)
+            for rg, name in list_synapse_workspaces_in_subscription(credential, subscription_id)
+        ]
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json",
-    }
+    found: List[Tuple[str, str, str]] = []
+    for sub, items, err in fetch_concurrently(list(subscription_ids), _list, max_workers=max_workers):
+        if err is not None:
+            print(f"Could not list Synapse workspaces in subscription {sub}: {err}")
+            continue
+        found.extend(items or [])
+    return found
 
-    base_url = f"https://{workspace_name}.dev.azuresynapse.net"
 
-    # List pipelines
-    pipelines_url = f"{base_url}/pipelines?api-version=2020-12-01"
+def list_synapse_sql_pools(
+    credential: "InteractiveBrowserCredential",
+    subscription_id: str,
+    resource_group: str,
+    workspace_name: str,
+) -> List[Dict[str, Any]]:
+    """Dedicated SQL pools of a workspace with their SKU and state."""
+    from azure.mgmt.synapse import SynapseManagementClient
 
-    resp = requests.get(pipelines_url, headers=headers)
-    resp.raise_for_status()
+    client = SynapseManagementClient(credential, subscription_id)
+    pools = call_with_backoff(lambda: list(client.sql_pools.list_by_workspace(resource_group, workspace_name)))
+    return [{
+        "SqlPool": p.name,
+        "Sku": getattr(p.sku, "name", "") if p.sku else "",
+        "Status": p.status or "",
+        "MaxSizeGB": round((p.max_size_bytes or 0) / 1024 ** 3, 1),
+    } for p in pools]
 
-    pipelines = resp.json().get("value", [])
 
-    rows: List[Dict[str, str]] = []
+# ---------------------------------------------------------
+# Synapse workspace snapshot (DEV API – one bulk fetch)
+# ---------------------------------------------------------
+def load_synapse_snapshot(
+    credential: "InteractiveBrowserCredential",
+    subscription_id: str,
+    resource_group: str,
+    workspace_name: str,
+) -> FactorySnapshot:
+    """Download pipelines, datasets, linked services, triggers and data flows of a workspace once.
 
-    for pipe in pipelines:
-        pipeline_name = pipe.get("name", "")
-        activities = pipe.get("properties", {}).get("activities", [])
+    The result is a FactorySnapshot (factory_name is the workspace), so the
+    ADF walkers, scoring and dependency graph apply to Synapse unchanged.
+    """
+    dev = get_synapse_dev_client(credential, workspace_name)
+    listed = dev.list_collections(
+        "pipelines", "datasets", "linkedservices", "triggers", "dataflows",
+        optional=("datasets", "triggers", "dataflows"),
+    )
+
+    def _by_name(items: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        return {i["name"]: i for i in items if isinstance(i, dict) and i.get("name")}
+
+    snapshot = FactorySnapshot(subscription_id, resource_group, workspace_name)
+    snapshot.pipelines = _by_name(listed["pipelines"])
+    snapshot.datasets = _by_name(listed["datasets"])
+    snapshot.linked_services = _by_name(listed["linkedservices"])
+    snapshot.triggers = _by_name(listed["triggers"])
+    snapshot.dataflows = _by_name(listed["dataflows"])
+    snapshot.fetched_at = time.time()
+    snapshot.stats = {
+        "pipelines_fetched": len(snapshot.pipelines),
+        "pipelines_reused": 0,
+        "datasets_fetched": len(snapshot.datasets),
+        "datasets_reused": 0,
+    }
+    return snapshot
 
-        if not isinstance(activities, list):
-            continue
 
-        for activity in activities:
-            row = _activity_rows_helper(
-                activity=activity,
-                factory_name=workspace_name,   # Synapse workspace
-                pipeline_name=pipeline_name,
-                ds_map=ds_map,
-            )
-            rows.append(row)
+# Dev API hosts are global, so a workspace name identifies its snapshot
+_SYNAPSE_SNAPSHOTS: Dict[str, FactorySnapshot] = {}
+_SYNAPSE_SNAPSHOTS_LOCK = threading.Lock()
 
-    return rows
 
+def get_synapse_snapshot(
+    credential: "InteractiveBrowserCredential",
+    subscription_id: str,
+    resource_group: str,
+    workspace_name: str,
+    refresh: bool = False,
+    ttl_seconds: float = SNAPSHOT_TTL_SECONDS,
+) -> FactorySnapshot:
+    """Return the process-wide snapshot for a workspace, loading it if missing or stale."""
+    key = workspace_name.lower()
+    with _SYNAPSE_SNAPSHOTS_LOCK:
+        cached = _SYNAPSE_SNAPSHOTS.get(key)
+    if cached is not None and not refresh and time.time() - cached.fetched_at < ttl_seconds:
+        return cached
+    snapshot = load_synapse_snapshot(credential, subscription_id, resource_group, workspace_name)
+    with _SYNAPSE_SNAPSHOTS_LOCK:
+        _SYNAPSE_SNAPSHOTS[key] = snapshot
+    return snapshot
 
-import requests
-from azure.identity import InteractiveBrowserCredential
 
+# ---------------------------------------------------------
+# Fetch Synapse Pipelines & Activities (DEV API – REQUIRED)
+# ---------------------------------------------------------
+def fetch_activity_rows_for_synapse(
+    credential: "InteractiveBrowserCredential",
+    subscription_id: str,
+    resource_group: str,
+    workspace_name: str,
+    ds_map: Optional[Dict[str, Dict[str, Any]]] = None,
+    snapshot: Optional[FactorySnapshot] = None,
+) -> List[Dict[str, str]]:
+    """
+    Synapse pipelines are NOT ARM resources.
+    They come from the workspace snapshot (Dev REST API); activities nested in
+    ForEach/If/Switch/Until are included and Copy sources/sinks are resolved
+    to linked services through the snapshot's datasets (or ds_map).
+    """
+    snapshot = snapshot or get_synapse_snapshot(credential, subscription_id, resource_group, workspace_name)
+    if ds_map is None:
+        return activity_rows_from_snapshot(snapshot)
 
-def _get_synapse_dev_token(credential):
-    token = credential.get_token("https://dev.azuresynapse.net/.default")
-    return token.token
+    rows: List[Dict[str, str]] = []
+    for pipeline_name, activities in snapshot.pipeline_activities():
+        _collect_activity_rows(activities, rows, snapshot.factory_name, pipeline_name, ds_map)
+    return rows
 
 
 def list_synapse_linked_services(
     credential,
     synapse_workspace_name: str,
+    snapshot: Optional[FactorySnapshot] = None,
 ) -> list[dict]:
 
-    token = _get_synapse_dev_token(credential)
-    url = f"https://{synapse_workspace_name}.dev.azuresynapse.net/linkedservices?api-version=2020-12-01"
-
-    headers = {
-        "Authorization": f"Bearer {token}"
-    }
-
-    resp = requests.get(url, headers=headers)
-    resp.raise_for_status()
-
-    items = resp.json().get("value", [])
+    snapshot = snapshot or get_synapse_snapshot(credential, "", "", synapse_workspace_name)
 
     return [{
-        "LinkedServiceName": i["name"],
-        "Type": i["properties"].get("type")
-    } for i in items]
+        "LinkedServiceName": name,
+        "Type": ls_type
+    } for name, ls_type in snapshot.linked_service_types().items()]
 
 
 def list_synapse_datasets(
     credential,
     synapse_workspace_name: str,
+    snapshot: Optional[FactorySnapshot] = None,
 ) -> list[dict]:
 
-    token = _get_synapse_dev_token(credential)
-    url = f"https://{synapse_workspace_name}.dev.azuresynapse.net/datasets?api-version=2020-12-01"
+    snapshot = snapshot or get_synapse_snapshot(credential, "", "", synapse_workspace_name)
 
-    headers = {
-        "Authorization": f"Bearer {token}"
-    }
+    return [{
+        "DatasetName": name,
+        "Type": (d.get("properties") or {}).get("type"),
+        "LinkedService": _extract_linked_service_reference(d),
+    } for name, d in snapshot.datasets.items()]
 
-    resp = requests.get(url, headers=headers)
-    resp.raise_for_status()
 
-    items = resp.json().get("value", [])
+# ---------------------------------------------------------
+# Assess many Synapse workspaces concurrently
+# ---------------------------------------------------------
+@dataclass
+class SynapseWorkspaceAssessment:
+    """Everything fetched and scored for one Synapse workspace."""
+
+    subscription_id: str
+    resource_group: str
+    workspace_name: str
+    snapshot: Optional[FactorySnapshot] = None
+    notebooks: List[str] = field(default_factory=list)
+    sql_pools: List[Dict[str, Any]] = field(default_factory=list)
+    activity_rows: List[Dict[str, str]] = field(default_factory=list)
+    scores: List[Dict[str, Any]] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def status(self) -> str:
+        if self.snapshot is None:
+            return "Failed"
+        return "Partial" if self.errors else "Assessed"
+
+    def readiness_row(self) -> Dict[str, Any]:
+        """One row of the merged readiness table."""
+        bands: Dict[str, int] = {}
+        for r in self.scores:
+            bands[r["Difficulty"]] = bands.get(r["Difficulty"], 0) + 1
+        snap = self.snapshot
+        return {
+            "Subscription": self.subscription_id,
+            "ResourceGroup": self.resource_group,
+            "Workspace": self.workspace_name,
+            "Status": self.status,
+            "Pipelines": len(snap.pipelines) if snap else 0,
+            "Activities": len(self.activity_rows),
+            "Datasets": len(snap.datasets) if snap else 0,
+            "Linked Services": len(snap.linked_services) if snap else 0,
+            "Notebooks": len(self.notebooks),
+            "SQL Pools": len(self.sql_pools),
+            "Easy": bands.get("🟢 Easy", 0),
+            "Medium": bands.get("🟡 Medium", 0),
+            "Hard": bands.get("🔴 Hard", 0),
+            "Average Score": round(sum(r["Total Score"] for r in self.scores) / len(self.scores), 2) if self.scores else 0,
+            "Error": "; ".join(self.errors),
+            "Seconds": self.seconds,
+        }
+
+
+def assess_synapse_workspace(
+    credential: "InteractiveBrowserCredential",
+    subscription_id: str,
+    resource_group: str,
+    workspace_name: str,
+    refresh: bool = False,
+) -> SynapseWorkspaceAssessment:
+    """Fetch a workspace's snapshot, notebooks and SQL pools concurrently and score its pipelines.
 
-    return [{
-        "DatasetName": i["name"],
-        "Type": i["properties"].get("type")
-    } for i in items]
+    A failed notebook or SQL pool listing is recorded in errors; only a
+    failed snapshot leaves the workspace unscored.
+    """
+    started = time.time()
+    result = SynapseWorkspaceAssessment(subscription_id, resource_group, workspace_name)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        snapshot_f = pool.submit(get_synapse_snapshot, credential, subscription_id, resource_group, workspace_name, refresh)
+        notebooks_f = pool.submit(lambda: get_synapse_dev_client(credential, workspace_name).notebooks())
+        pools_f = pool.submit(list_synapse_sql_pools, credential, subscription_id, resource_group, workspace_name)
+        try:
+            result.snapshot = snapshot_f.result()
+        except Exception as exc:
+            result.errors.append(f"pipelines: {exc}")
+        try:
+            result.notebooks = [n["name"] for n in notebooks_f.result() if n.get("name")]
+        except Exception as exc:
+            result.errors.append(f"notebooks: {exc}")
+        try:
+            result.sql_pools = pools_f.result()
+        except Exception as exc:
+            result.errors.append(f"sql pools: {exc}")
+    if result.snapshot is not None:
+        result.activity_rows = activity_rows_from_snapshot(result.snapshot)
+        result.scores = score_pipelines(result.activity_rows, result.snapshot.linked_service_types())
+    result.seconds = round(time.time() - started, 2)
+    return result
+
+
+def assess_synapse_workspaces(
+    credential: "InteractiveBrowserCredential",
+    workspaces: Sequence[Tuple[str, str, str]],
+    max_workers: int = SYNAPSE_ASSESS_MAX_WORKERS,
+    refresh: bool = False,
+    progress: Optional[Callable[[SynapseWorkspaceAssessment, int, int], None]] = None,
+) -> List[SynapseWorkspaceAssessment]:
+    """Assess (subscription id, resource group, workspace name) targets concurrently, in input order.
+
+    progress is called as each workspace finishes with (assessment, done, total).
+    """
+    work = list(workspaces)
+    if not work:
+        return []
+    results: List[Optional[SynapseWorkspaceAssessment]] = [None] * len(work)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(work)))) as pool:
+        futures = {
+            pool.submit(assess_synapse_workspace, credential, sub, rg, ws, refresh): i
+            for i, (sub, rg, ws) in enumerate(work)
+        }
+        for done, fut in enumerate(as_completed(futures), start=1):
+            i = futures[fut]
+            results[i] = fut.result()
+            if progress is not None:
+                progress(results[i], done, len(work))
+    return [r for r in results if r is not None]
+
+
+def synapse_readiness_table(assessments: Sequence[SynapseWorkspaceAssessment]) -> List[Dict[str, Any]]:
+    """Merged readiness table: one row per assessed workspace."""
+    return [a.readiness_row() for a in assessments]
+
+
+def synapse_pipeline_scores(assessments: Sequence[SynapseWorkspaceAssessment]) -> List[Dict[str, Any]]:
+    """Pipeline scores of every assessed workspace, tagged with subscription and resource group."""
+    return [
+        {"Subscription": a.subscription_id, "ResourceGroup": a.resource_group, **row}
+        for a in assessments
+        for row in a.scores
+    ]
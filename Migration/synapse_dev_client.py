@@ -0,0 +1,111 @@
+"""
+Synapse Dev API client for ADF to Fabric Migration Tool
+
+Synapse pipelines, datasets, linked services and notebooks are not ARM
+resources; they are served by https://<workspace>.dev.azuresynapse.net.
+SynapseDevClient sends through the session, per-credential token cache and
+retry policy in Migration.http_session that the Fabric client also uses,
+and follows nextLink while the next page is already being fetched in the
+background.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import quote
+
+from Migration.constants import SYNAPSE_DEV_API_VERSION, SYNAPSE_DEV_MAX_WORKERS, SYNAPSE_DEV_SCOPE
+from Migration.http_session import send, shared_session, token_cache
+
+if TYPE_CHECKING:
+    from azure.identity import InteractiveBrowserCredential
+
+
+class SynapseDevClient:
+    """Pooled, retrying, paginating client for one Synapse workspace's Dev API."""
+
+    def __init__(
+        self,
+        credential: "InteractiveBrowserCredential",
+        workspace_name: str,
+        max_workers: int = SYNAPSE_DEV_MAX_WORKERS,
+        timeout: int = 60,
+    ) -> None:
+        self.workspace_name = workspace_name
+        self.base_url = f"https://{workspace_name}.dev.azuresynapse.net"
+        self.timeout = timeout
+        self.session = shared_session()
+        self._tokens = token_cache(credential)
+        self._max_workers = max(1, max_workers)
+
+    def _url(self, path_or_url: str) -> str:
+        if path_or_url.startswith("http"):
+            return path_or_url
+        url = f"{self.base_url}/{path_or_url.lstrip('/')}"
+        if "api-version=" not in url:
+            url += ("&" if "?" in url else "?") + f"api-version={SYNAPSE_DEV_API_VERSION}"
+        return url
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self._tokens.get(SYNAPSE_DEV_SCOPE)}"}
+
+    def get(self, path_or_url: str) -> Any:
+        """GET one Dev API document under the shared retry policy."""
+        resp = send(self.session, "GET", self._url(path_or_url), self._headers, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    def iter_pages(self, path: str) -> Iterator[List[Dict[str, Any]]]:
+        """Pages of a collection; page n+1 is requested as soon as page n names it."""
+        with ThreadPoolExecutor(max_workers=1) as prefetch:
+            pending: Optional[Future] = prefetch.submit(self.get, path)
+            while pending is not None:
+                data = pending.result()
+                if isinstance(data, list):
+                    yield data
+                    return
+                next_link = data.get("nextLink")
+                pending = prefetch.submit(self.get, next_link) if next_link else None
+                yield data.get("value") or []
+
+    def list_all(self, path: str) -> List[Dict[str, Any]]:
+        """Every item of a collection across all pages."""
+        return [item for page in self.iter_pages(path) for item in page]
+
+    def list_collections(self, *paths: str, optional: Iterable[str] = ()) -> Dict[str, List[Dict[str, Any]]]:
+        """Several collections listed concurrently, keyed by path.
+
+        A path in optional that fails to list comes back empty instead of
+        raising.
+        """
+        optional = set(optional)
+        with ThreadPoolExecutor(max_workers=min(self._max_workers, max(1, len(paths)))) as pool:
+            futures = {path: pool.submit(self.list_all, path) for path in paths}
+            out: Dict[str, List[Dict[str, Any]]] = {}
+            for path, fut in futures.items():
+                try:
+                    out[path] = fut.result()
+                except Exception:
+                    if path not in optional:
+                        raise
+                    out[path] = []
+            return out
+
+    def pipelines(self) -> List[Dict[str, Any]]:
+        return self.list_all("pipelines")
+
+    def datasets(self) -> List[Dict[str, Any]]:
+        return self.list_all("datasets")
+
+    def linked_services(self) -> List[Dict[str, Any]]:
+        return self.list_all("linkedservices")
+
+    def notebooks(self) -> List[Dict[str, Any]]:
+        return self.list_all("notebooks")
+
+    def notebook(self, name: str) -> Dict[str, Any]:
+        return self.get(f"notebooks/{quote(name, safe='')}")
+
+
+def get_synapse_dev_client(credential: "InteractiveBrowserCredential", workspace_name: str) -> SynapseDevClient:
+    """Dev API client for a workspace; clients share the session and the credential's token cache."""
+    return SynapseDevClient(credential, workspace_name)
@@ -4,7 +4,10 @@ Utility functions for ADF to Fabric Migration Tool
 
 import json
 import re
-from typing import Any, Dict, List, Optional, Set, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+
+from Migration.constants import DATASET_QUERY_KEYS, SOURCE_QUERY_KEYS, SQL_SCRIPT_KEYS
 
 _re = re
 
@@ -39,14 +42,21 @@ def _unwrap_expr(val: Any) -> Optional[str]:
     return None
 
 
+@lru_cache(maxsize=8192)
+def _norm_str(s: str) -> str:
+    """Memoized lowercase, letters-only form of a string key."""
+    return _re.sub(r"[^a-z]", "", s.lower())
+
+
 def _norm_key(key: Any) -> str:
     """Normalize key by converting to lowercase and removing non-letters."""
+    if isinstance(key, str):
+        return _norm_str(key)
     try:
         s = str(key)
     except Exception:
         return ""
-    s = s.lower()
-    return _re.sub(r"[^a-z]", "", s)
+    return _norm_str(s)
 
 
 def _split_camel(value: str) -> str:
@@ -114,6 +124,15 @@ def _friendly_resource_type(full_type: Optional[str]) -> str:
     return provider_name or resource_token or normalized
 
 
+def resource_group_from_id(resource_id: str) -> str:
+    """Resource group segment of an ARM resource id ("" when there is none)."""
+    parts = (resource_id or "").split("/")
+    for i, part in enumerate(parts[:-1]):
+        if part.lower() == "resourcegroups":
+            return parts[i + 1]
+    return ""
+
+
 def _extract_dataset_references(activity: Dict[str, Any]) -> Set[str]:
     """Extract dataset references from activity (inputs key)."""
     refs: Set[str] = set()
@@ -181,43 +200,69 @@ def _extract_linked_service_reference(dataset: Dict[str, Any]) -> str:
     return ""
 
 
+class SqlField(NamedTuple):
+    """A SQL-ish field found in a definition: JSON path, normalized key and text."""
+
+    path: Tuple[Union[str, int], ...]
+    key: str
+    text: str
+
+    @property
+    def json_path(self) -> str:
+        out = "$"
+        for part in self.path:
+            out += f"[{part}]" if isinstance(part, int) else f".{part}"
+        return out
+
+
+def _find_sql_fields(obj: Any, keys: Iterable[str] = SOURCE_QUERY_KEYS + SQL_SCRIPT_KEYS) -> List[SqlField]:
+    """Collect every non-empty field whose normalized key is in keys, in one walk.
+
+    Order matches a depth-first search that checks a dict's own keys before
+    descending into its values, so the first hit is what a recursive
+    first-match search would return.
+    """
+    wanted = set(keys)
+    found: List[SqlField] = []
+    stack: List[Tuple[Tuple[Union[str, int], ...], Any]] = [((), obj)]
+    while stack:
+        path, node = stack.pop()
+        children: List[Tuple[Tuple[Union[str, int], ...], Any]] = []
+        if isinstance(node, dict):
+            for k, v in node.items():
+                if isinstance(v, (str, dict)) and _norm_key(k) in wanted:
+                    text = _unwrap_expr(v)
+                    if text:
+                        found.append(SqlField(path + (k,), _norm_key(k), text))
+                        continue
+                if isinstance(v, (dict, list)):
+                    children.append((path + (k,), v))
+        elif isinstance(node, list):
+            children = [(path + (i,), v) for i, v in enumerate(node) if isinstance(v, (dict, list))]
+        stack.extend(reversed(children))
+    return found
+
+
+def _pick_query(scoped: List[Tuple[SqlField, int]], preference: Tuple[str, ...]) -> str:
+    """Pick a query from (field, scope prefix length) pairs.
+
+    Fields directly under the scope win in key preference order; otherwise
+    the first nested hit is used.
+    """
+    direct = {f.key: f.text for f, n in reversed(scoped) if len(f.path) == n + 1}
+    for k in preference:
+        if k in direct:
+            return direct[k]
+    return scoped[0][0].text if scoped else ""
+
+
 def _extract_sql_query_from_dataset(ds_dict: Dict[str, Any]) -> str:
     """Extract SQL query from dataset definition."""
     if not isinstance(ds_dict, dict):
         return ""
-    props = (ds_dict.get("properties") or {})
-    tprops = (props.get("typeProperties") or {})
-    for k in ("query", "sqlReaderQuery", "commandText"):
-        got = _unwrap_expr(tprops.get(k))
-        if got:
-            return got
-    # Case-insensitive / snake-case variants
-    lower = {k.lower(): v for k, v in tprops.items()}
-    for k in ("query", "sqlreaderquery", "commandtext"):
-        got = _unwrap_expr(lower.get(k))
-        if got:
-            return got
-
-    # Deep search fallback
-    def deep_find(o: Any) -> Optional[str]:
-        if isinstance(o, dict):
-            for key, val in o.items():
-                if _norm_key(key) in ("query", "sqlreaderquery", "commandtext"):
-                    return _unwrap_expr(val)
-            for val in o.values():
-                result = deep_find(val)
-                if result:
-                    return result
-        elif isinstance(o, list):
-            for it in o:
-                result = deep_find(it)
-                if result:
-                    return result
-        return None
-    found = deep_find(tprops)
-    if found:
-        return found
-    return ""
+    tprops = (ds_dict.get("properties") or {}).get("typeProperties") or {}
+    fields = _find_sql_fields(tprops, DATASET_QUERY_KEYS)
+    return _pick_query([(f, 0) for f in fields], DATASET_QUERY_KEYS)
 
 
 def _path_info(path: Any) -> Dict[str, Any]:
@@ -397,35 +442,13 @@ def _parse_table_identifier(raw: str) -> Tuple[str, str]:
 
 
 def _collect_activity_types(activities: Optional[List[Any]], types: Set[str]) -> None:
-    """Recursively collect activity types from nested activities."""
-    if not activities:
-        return
-    for act in activities:
-        a = _to_dict(act)
-        t = a.get("type")
+    """Collect activity types from activities, nested activities included."""
+    from Migration.activity_visitor import iter_activities
+
+    for node in iter_activities(activities):
+        t = node.activity.get("type")
         if t:
             types.add(t)
-        inner_lists: List[List[Any]] = []
-        for key in (
-            "activities",
-            "ifTrueActivities",
-            "ifFalseActivities",
-            "defaultActivities",
-            "innerActivities",
-            "caseActivities",
-        ):
-            v = a.get(key)
-            if isinstance(v, list):
-                inner_lists.append(v)
-        cases = a.get("cases")
-        if isinstance(cases, list):
-            for c in cases:
-                if isinstance(c, dict):
-                    c_acts = c.get("activities")
-                    if isinstance(c_acts, list):
-                        inner_lists.append(c_acts)
-        for lst in inner_lists:
-            _collect_activity_types(lst, types)
 
 
 def _get_io(a: Dict[str, Any], key: str) -> List[Dict[str, Any]]:
@@ -442,102 +465,44 @@ def _get_io(a: Dict[str, Any], key: str) -> List[Dict[str, Any]]:
     return []
 
 
+def _source_scope_len(path: Tuple[Union[str, int], ...]) -> int:
+    """Length of the copy-source prefix of a path (0 if the path is outside the source).
+
+    Accepts properties/typeProperties wrappers in either casing, so REST,
+    git and flattened SDK shapes all resolve to the same source.
+    """
+    i = 0
+    while i < len(path) and isinstance(path[i], str) and _norm_key(path[i]) in ("properties", "typeproperties"):
+        i += 1
+    if i < len(path) and isinstance(path[i], str) and _norm_key(path[i]) == "source":
+        return i + 1
+    return 0
+
+
 def _extract_sql_query_from_activity(activity: Dict[str, Any], ds_map: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
-    """Extract SQL query from an activity definition."""
+    """Extract SQL query from an activity definition.
+
+    Preference: the copy source's own query fields, then any query nested
+    in the source, then the query of an input dataset, then any query field
+    anywhere in the activity. The activity is walked once.
+    """
     if not isinstance(activity, dict):
         return ""
-    # Some SDK shapes put properties under activity["typeProperties"], others under activity["properties"]["typeProperties"]
-    # Try direct camelCase
-    tp = activity.get("typeProperties")
-    # Try nested under properties
-    if not isinstance(tp, dict):
-        props = activity.get("properties")
-        if isinstance(props, dict):
-            tp = props.get("typeProperties")
-    # Try normalized keys (snake/case-insensitive)
-    if not isinstance(tp, dict):
-        norm_map = { _norm_key(k): v for k, v in activity.items() }
-        tp = norm_map.get("typeproperties")
-    if not isinstance(tp, dict):
-        props = activity.get("properties")
-        if isinstance(props, dict):
-            norm_props = { _norm_key(k): v for k, v in props.items() }
-            tp = norm_props.get("typeproperties")
-    if not isinstance(tp, dict):
-        tp = {}
-    src = tp.get("source") or {}
-    if isinstance(src, dict):
-        # Prefer explicit sqlReaderQuery.value for SQL sources
-        if "sqlReaderQuery" in src:
-            val = _unwrap_expr(src.get("sqlReaderQuery"))
-            if val:
-                return val
-        # Other common fields across sources
-        for k in ("query", "commandText"):
-            got = _unwrap_expr(src.get(k))
-            if got:
-                return got
-
-        # Case-insensitive keys
-        # Try normalized-key lookup as well
-        by_norm: Dict[str, Any] = {}
-        for k, v in src.items():
-            by_norm[_norm_key(k)] = v
-        for k in ("sqlreaderquery", "query", "commandtext"):
-            got = _unwrap_expr(by_norm.get(k))
-            if got:
-                return got
-
-        # Deep search within source
-        def deep_find(o: Any) -> Optional[str]:
-            if isinstance(o, dict):
-                for key, val in o.items():
-                    if _norm_key(key) in ("query", "sqlreaderquery", "commandtext"):
-                        return _unwrap_expr(val)
-                for val in o.values():
-                    result = deep_find(val)
-                    if result:
-                        return result
-            elif isinstance(o, list):
-                for it in o:
-                    result = deep_find(it)
-                    if result:
-                        return result
-            return None
-        found = deep_find(src)
-        if found:
-            return found
+    fields = _find_sql_fields(activity, SOURCE_QUERY_KEYS)
+
+    in_source = [(f, n) for f in fields for n in (_source_scope_len(f.path),) if n]
+    if in_source:
+        return _pick_query(in_source, SOURCE_QUERY_KEYS)
 
     # Fall back to dataset-level query if inputs reference a dataset with a query
     if isinstance(ds_map, dict):
-        inputs = activity.get("inputs")
-        if isinstance(inputs, list):
-            for ref in inputs:
-                if isinstance(ref, dict):
-                    ref_name = ref.get("referenceName") or ref.get("name")
-                    if ref_name and ref_name in ds_map:
-                        query = _extract_sql_query_from_dataset(ds_map[ref_name])
-                        if query:
-                            return query
-
-    # Ultimate fallback: deep search entire activity for sqlReaderQuery/query/commandText
-    def deep_find(o: Any) -> Optional[str]:
-        if isinstance(o, dict):
-            for key, val in o.items():
-                if _norm_key(key) in ("query", "sqlreaderquery", "commandtext"):
-                    return _unwrap_expr(val)
-            for val in o.values():
-                result = deep_find(val)
-                if result:
-                    return result
-        elif isinstance(o, list):
-            for it in o:
-                result = deep_find(it)
-                if result:
-                    return result
-        return None
-    found_any = deep_find(activity)
-    if found_any:
-        return found_any
-
-    return ""
+        for ref in _get_io(activity, "inputs"):
+            if isinstance(ref, dict):
+                ref_name = ref.get("referenceName") or ref.get("reference_name") or ref.get("name")
+                if ref_name and ref_name in ds_map:
+                    query = _extract_sql_query_from_dataset(ds_map[ref_name])
+                    if query:
+                        return query
+
+    # Ultimate fallback: first query field anywhere in the activity
+    return fields[0].text if fields else ""
@@ -0,0 +1,238 @@
+import threading
+from concurrent.futures import Future
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from Migration.constants import FABRIC_API_BASE_URL, FABRIC_API_SCOPE
+from Migration.http_session import retry_after, send, shared_session, token_cache
+
+if TYPE_CHECKING:
+    from Synapse_Data.fabric_operations import ProgressCallback
+
+
+class FabricApiError(RuntimeError):
+    """A failed Fabric REST call; status_code and response mirror requests.HTTPError."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, response: Any = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = response
+
+
+def _json_or_text(resp: requests.Response) -> Any:
+    if not resp.text:
+        return {}
+    try:
+        return resp.json()
+    except ValueError:
+        return resp.text
+
+
+def _request_error(resp: requests.Response, url: str) -> FabricApiError:
+    body = (resp.text or "").strip()
+    return FabricApiError(
+        "Fabric API request failed. "
+        f"status={resp.status_code} url={url} "
+        f"response={body[:2000]}",
+        status_code=resp.status_code,
+        response=resp,
+    )
+
+
+def _done(value: Any) -> Future:
+    fut: Future = Future()
+    fut.set_result(value)
+    return fut
+
+
+class FabricClient:
+    """Fabric REST client: pooled session, cached token, throttling retries and LRO handling."""
+
+    def __init__(
+        self,
+        credential: Any = None,
+        token_provider: Optional[Callable[[], str]] = None,
+        base_url: str = FABRIC_API_BASE_URL,
+        timeout: int = 180,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        if token_provider is None:
+            if credential is None:
+                raise ValueError("FabricClient needs a credential or a token_provider")
+            token_provider = partial(token_cache(credential).get, FABRIC_API_SCOPE)
+        self._token_provider = token_provider
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = session or shared_session()
+        self._listings: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._listings_lock = threading.Lock()
+
+    @classmethod
+    def from_token(cls, token: str) -> "FabricClient":
+        """Client for a bearer token obtained elsewhere."""
+        return cls(token_provider=lambda: token)
+
+    def token(self) -> str:
+        return self._token_provider()
+
+    def _url(self, path_or_url: str) -> str:
+        if path_or_url.startswith("http"):
+            return path_or_url
+        return f"{self.base_url}/{path_or_url.lstrip('/')}"
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token()}", "Content-Type": "application/json"}
+
+    def _send(self, method: str, url: str, payload: Any = None, timeout: Optional[int] = None) -> requests.Response:
+        """One call under the shared retry policy (see Migration.http_session)."""
+        return send(self.session, method, url, self._headers, payload, timeout or self.timeout)
+
+    @staticmethod
+    def _raise(resp: requests.Response, url: str) -> None:
+        raise _request_error(resp, url)
+
+    def track_operation(
+        self,
+        location: str,
+        timeout_seconds: float = 1800,
+        retry_after: float = 0.0,
+        on_progress: Optional["ProgressCallback"] = None,
+        finish: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> Future:
+        """Poll an operation on the shared OperationTracker without holding a thread."""
+        from Synapse_Data.fabric_operations import get_operation_tracker
+
+        return get_operation_tracker().track(
+            location, self._headers, timeout_seconds, retry_after, on_progress=on_progress, finish=finish
+        )
+
+    def poll_operation(self, location: str, timeout_seconds: float = 1800) -> Dict[str, Any]:
+        """Wait for a long-running operation; returns its final status document."""
+        return self.track_operation(location, timeout_seconds).result()
+
+    def _operation_result(
+        self, method: str, url: str, initial: Any, timeout: Optional[int]
+    ) -> Callable[[Dict[str, Any]], Any]:
+        """What a finished operation resolves to: its result document, the re-fetched resource, or the 202 body."""
+
+        def _finish(op: Dict[str, Any]) -> Any:
+            result_url = op.get("_resultLocation")
+            if result_url:
+                rr = self._send("GET", result_url, timeout=timeout)
+                if rr.status_code in (200, 201):
+                    return _json_or_text(rr) or {}
+            if method.upper() == "GET":
+                # The operation finished; the resource itself now answers the GET
+                r2 = self._send("GET", url, timeout=timeout)
+                if r2.status_code in (200, 201):
+                    return _json_or_text(r2) or {}
+                self._raise(r2, url)
+            return initial
+
+        return _finish
+
+    def submit(
+        self,
+        method: str,
+        path_or_url: str,
+        payload: Any = None,
+        lro_timeout_seconds: float = 1800,
+        timeout: Optional[int] = None,
+        on_progress: Optional["ProgressCallback"] = None,
+    ) -> Future:
+        """Send a call now; the future resolves once a 202 operation behind it has finished.
+
+        Operations of many submitted calls are polled concurrently.
+        """
+        url = self._url(path_or_url)
+        r = self._send(method, url, payload, timeout)
+        if method.upper() != "GET":
+            self._forget_listing(path_or_url)
+        if r.status_code in (200, 201):
+            return _done(_json_or_text(r) or {})
+        if r.status_code != 202:
+            self._raise(r, url)
+        location = r.headers.get("Location") or r.headers.get("location")
+        if not location:
+            raise FabricApiError(f"Fabric returned 202 without Location header. Response: {r.text}")
+        fut = self.track_operation(
+            location,
+            timeout_seconds=lro_timeout_seconds,
+            retry_after=retry_after(r, 0.0),
+            on_progress=on_progress,
+            finish=self._operation_result(method, url, _json_or_text(r) or {}, timeout),
+        )
+        if method.upper() != "GET":
+            # Listings taken while the operation ran may miss the new item
+            fut.add_done_callback(lambda _: self._forget_listing(path_or_url))
+        return fut
+
+    def request(
+        self,
+        method: str,
+        path_or_url: str,
+        payload: Any = None,
+        lro_timeout_seconds: float = 1800,
+        timeout: Optional[int] = None,
+    ) -> Any:
+        """Send a call and follow a 202 operation to its result."""
+        return self.submit(method, path_or_url, payload, lro_timeout_seconds, timeout).result()
+
+    def get(self, path_or_url: str, **kwargs: Any) -> Any:
+        return self.request("GET", path_or_url, **kwargs)
+
+    def post(self, path_or_url: str, payload: Any = None, **kwargs: Any) -> Any:
+        return self.request("POST", path_or_url, payload, **kwargs)
+
+    def list_all(self, path_or_url: str, max_pages: int = 100) -> List[Dict[str, Any]]:
+        """Every item of a collection, following continuationUri."""
+        url: Optional[str] = self._url(path_or_url)
+        items: List[Dict[str, Any]] = []
+        for _ in range(max_pages):
+            if not url:
+                break
+            data = self.get(url)
+            if isinstance(data, list):
+                items.extend(x for x in data if isinstance(x, dict))
+                break
+            if not isinstance(data, dict) or not isinstance(data.get("value"), list):
+                break
+            items.extend(x for x in data["value"] if isinstance(x, dict))
+            url = data.get("continuationUri")
+        with self._listings_lock:
+            self._listings[self._url(path_or_url)] = {
+                it["displayName"]: it for it in items if isinstance(it.get("displayName"), str)
+            }
+        return items
+
+    def find_by_display_name(self, path_or_url: str, display_name: str) -> Optional[Dict[str, Any]]:
+        """Item of a collection by display name, re-listing only when the cached listing misses."""
+        key = self._url(path_or_url)
+        with self._listings_lock:
+            hit = (self._listings.get(key) or {}).get(display_name)
+        if hit is not None:
+            return hit
+        self.list_all(path_or_url)
+        with self._listings_lock:
+            return (self._listings.get(key) or {}).get(display_name)
+
+    def _forget_listing(self, path_or_url: str) -> None:
+        key = self._url(path_or_url)
+        with self._listings_lock:
+            self._listings.pop(key, None)
+
+
+_CLIENTS: Dict[int, Tuple[Any, FabricClient]] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_fabric_client(credential: Any) -> FabricClient:
+    """Shared client (and token cache) per credential object."""
+    with _CLIENTS_LOCK:
+        entry = _CLIENTS.get(id(credential))
+        if entry is None or entry[0] is not credential:
+            entry = (credential, FabricClient(credential))
+            _CLIENTS[id(credential)] = entry
+        return entry[1]
@@ -1,15 +1,26 @@
 from __future__ import annotations
 
 import base64
+import heapq
 import json
 import os
+import queue
 import time
 import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from typing import Any, Callable, Optional
 
-import requests
 from azure.identity import ClientSecretCredential
 
+from Migration.constants import (
+    COPYJOB_DEFAULT_SHARDS,
+    COPYJOB_JOB_TYPE,
+    COPYJOB_RUN_MAX_CONCURRENT,
+    COPYJOB_SHARD_MAX_WORKERS,
+)
+from Synapse_Data.fabric_client import FabricApiError, FabricClient, get_fabric_client
+from Synapse_Data.fabric_operations import ProgressCallback
+
 
 def _get_env(name: str, default: Optional[str] = None) -> str:
     v = os.getenv(name, default)
@@ -29,101 +40,43 @@ def build_service_principal_credential(
     return ClientSecretCredential(tenant_id=tid, client_id=cid, client_secret=csec)
 
 
-def get_fabric_token(credential: Optional[ClientSecretCredential] = None) -> str:
-    cred = credential or build_service_principal_credential()
-    return cred.get_token("https://api.fabric.microsoft.com/.default").token
+_DEFAULT_CREDENTIAL: Optional[ClientSecretCredential] = None
 
 
-def _auth_headers(token: str) -> dict[str, str]:
-    return {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+def _client(credential: Optional[ClientSecretCredential] = None) -> FabricClient:
+    """Shared FabricClient for a credential (default: the service principal from the environment)."""
+    global _DEFAULT_CREDENTIAL
+    if credential is None:
+        if _DEFAULT_CREDENTIAL is None:
+            _DEFAULT_CREDENTIAL = build_service_principal_credential()
+        credential = _DEFAULT_CREDENTIAL
+    return get_fabric_client(credential)
 
 
-def _get_json_or_text(resp: requests.Response) -> Any:
-    if not resp.text:
-        return {}
-    try:
-        return resp.json()
-    except ValueError:
-        return resp.text
+def get_fabric_token(credential: Optional[ClientSecretCredential] = None) -> str:
+    return _client(credential).token()
 
 
 def _get(token: str, url: str, timeout: int = 60) -> Any:
-    r = requests.get(url, headers=_auth_headers(token), timeout=timeout)
-    if r.status_code in (200, 201):
-        data = _get_json_or_text(r)
-        return data or {}
-    body = (r.text or "").strip()
-    raise RuntimeError(
-        "Fabric API request failed. "
-        f"status={r.status_code} url={url} "
-        f"response={body[:2000]}"
-    )
+    return FabricClient.from_token(token).get(url, timeout=timeout)
 
 
 def _get_with_lro(token: str, url: str, timeout_seconds: int = 1800) -> dict[str, Any]:
-    r = requests.get(url, headers=_auth_headers(token), timeout=180)
-    if r.status_code in (200, 201):
-        if not r.text:
-            return {}
-        data = r.json()
-        return data or {}
-    if r.status_code == 202:
-        location = r.headers.get("Location") or r.headers.get("location")
-        if not location:
-            raise RuntimeError(f"Fabric returned 202 without Location header. Response: {r.text}")
-        _poll_fabric_operation(token, location, timeout_seconds=timeout_seconds)
-        # After completion, retry the GET once to retrieve the result.
-        r2 = requests.get(url, headers=_auth_headers(token), timeout=180)
-        if r2.status_code in (200, 201):
-            if not r2.text:
-                return {}
-            data = r2.json()
-            return data or {}
-        body = (r2.text or "").strip()
-        raise RuntimeError(
-            "Fabric API request failed. "
-            f"status={r2.status_code} url={url} "
-            f"response={body[:2000]}"
-        )
-
-    body = (r.text or "").strip()
-    raise RuntimeError(
-        "Fabric API request failed. "
-        f"status={r.status_code} url={url} "
-        f"response={body[:2000]}"
-    )
+    return FabricClient.from_token(token).get(url, lro_timeout_seconds=timeout_seconds)
 
 
 def list_connections(
     credential: Optional[ClientSecretCredential] = None,
     max_pages: int = 10,
 ) -> list[dict[str, Any]]:
-    token = get_fabric_token(credential)
-    url = "https://api.fabric.microsoft.com/v1/connections"
-    items: list[dict[str, Any]] = []
-
-    for _ in range(max_pages):
-        data = _get(token, url)
-        if isinstance(data, dict) and isinstance(data.get("value"), list):
-            items.extend([x for x in data["value"] if isinstance(x, dict)])
-            next_url = data.get("continuationUri")
-            if not next_url:
-                break
-            url = next_url
-            continue
-        break
-
-    return items
+    return _client(credential).list_all("connections", max_pages=max_pages)
 
 
 def find_connection_by_display_name(
     display_name: str,
     credential: Optional[ClientSecretCredential] = None,
 ) -> Optional[dict[str, Any]]:
-    for c in list_connections(credential=credential):
-        if c.get("displayName") == display_name:
-            return c
-    return None
+    return _client(credential).find_by_display_name("connections", display_name)
 
 
 def get_copy_job_definition(
@@ -200,14 +153,7 @@ def list_copy_jobs(
     workspace_id: str,
     credential: Optional[ClientSecretCredential] = None,
 ) -> list[dict[str, Any]]:
-    token = get_fabric_token(credential)
-    url = f"https://api.fabric.microsoft.com/v1/workspaces/{workspace_id}/copyJobs"
-    data = _get(token, url)
-    if isinstance(data, dict) and isinstance(data.get("value"), list):
-        return data["value"]
-    if isinstance(data, list):
-        return data
-    return []
+    return _client(credential).list_all(f"workspaces/{workspace_id}/copyJobs")
 
 
 def find_copy_job_by_display_name(
@@ -215,10 +161,68 @@ def find_copy_job_by_display_name(
     display_name: str,
     credential: Optional[ClientSecretCredential] = None,
 ) -> Optional[dict[str, Any]]:
-    for it in list_copy_jobs(workspace_id, credential=credential):
-        if isinstance(it, dict) and it.get("displayName") == display_name:
-            return it
-    return None
+    return _client(credential).find_by_display_name(f"workspaces/{workspace_id}/copyJobs", display_name)
+
+
+def _activity_key(activity: dict[str, Any], index: int) -> str:
+    return str(activity.get("id") or index)
+
+
+def _activity_tables(activity: dict[str, Any]) -> dict[str, Any]:
+    props = activity.get("properties") if isinstance(activity.get("properties"), dict) else {}
+
+    def _table(side: str) -> str:
+        ds = ((props.get(side) or {}).get("datasetSettings") or {}) if isinstance(props.get(side), dict) else {}
+        return ".".join(str(x) for x in (ds.get("schema"), ds.get("table")) if x)
+
+    return {"id": activity.get("id"), "source": _table("source"), "destination": _table("destination")}
+
+
+def _is_validation_error(exc: Exception) -> bool:
+    """A rejection of the payload itself (4xx other than 429), as opposed to a transient failure."""
+    status = getattr(exc, "status_code", None)
+    return isinstance(exc, FabricApiError) and status is not None and 400 <= status < 500 and status != 429
+
+
+def _bisect_failing_activities(
+    activities: list[dict[str, Any]],
+    apply: Callable[[list[dict[str, Any]]], Optional[Exception]],
+    error: Exception,
+    deadline: Optional[float] = None,
+) -> dict[int, Exception]:
+    """Indices of activities Fabric rejects on their own, found by splitting failing groups in half.
+
+    The full list is known to fail with error. Costs about 2k*log2(n)
+    updates for k failing activities out of n, instead of one per activity.
+    A single activity only counts as failing on a validation error; after
+    any other error it is probed once more, and a second transient failure
+    is raised. Past deadline the current error is raised.
+    """
+    failing: dict[int, Exception] = {}
+
+    def _probe(indices: list[int], err: Exception) -> Optional[Exception]:
+        if deadline is not None and time.time() > deadline:
+            raise err
+        return apply([activities[i] for i in indices])
+
+    def _search(indices: list[int], err: Exception) -> None:
+        if len(indices) == 1:
+            if not _is_validation_error(err):
+                err = _probe(indices, err)
+                if err is None:
+                    return
+                if not _is_validation_error(err):
+                    raise err
+            failing[indices[0]] = err
+            return
+        mid = len(indices) // 2
+        for half in (indices[:mid], indices[mid:]):
+            half_err = _probe(half, err)
+            if half_err is not None:
+                _search(half, half_err)
+
+    _search(list(range(len(activities))), error)
+    return failing
 
 
 def _update_copyjob_definition_with_retry(
@@ -230,7 +234,8 @@ def _update_copyjob_definition_with_retry(
     per_attempt_lro_timeout_seconds: int = 120,
     max_total_seconds: int = 420,
     progress_callback: Optional[Callable[[str], None]] = None,
-) -> None:
+) -> list[dict[str, Any]]:
+    """Apply a copy job definition in stages; returns the tables left out because they failed on their own."""
     base_url = f"https://api.fabric.microsoft.com/v1/workspaces/{workspace_id}/copyJobs"
     update_url_copyjobs = f"{base_url}/{copyjob_id}/updateDefinition"
     update_url_items = f"https://api.fabric.microsoft.com/v1/workspaces/{workspace_id}/items/{copyjob_id}/updateDefinition"
@@ -367,6 +372,32 @@ def _update_copyjob_definition_with_retry(
         except Exception:
             pass
 
+    endpoints = [("copyJobs", update_url_copyjobs), ("items", update_url_items)]
+
+    def _apply(obj: dict[str, Any], indent: str = "   ") -> Optional[Exception]:
+        """Post one definition, trying the endpoint that last worked first.
+
+        On failure returns the last error, unless an earlier endpoint failed
+        transiently, so a fallback endpoint's 4xx never hides a timeout.
+        """
+        payload = _make_payload(obj)
+        err: Optional[Exception] = None
+        for i, (label, url) in enumerate(list(endpoints)):
+            try:
+                _post_with_lro(token, url, payload, timeout_seconds=per_attempt_lro_timeout_seconds)
+            except Exception as exc:
+                if err is None or _is_validation_error(err):
+                    err = exc
+                emit(f"{indent}{label} updateDefinition failed (activities={len(obj.get('activities') or [])}): {exc}")
+                continue
+            if i:
+                endpoints.insert(0, endpoints.pop(i))
+            return None
+        return err
+
+    # Activities left out after failing on their own, keyed by activity id
+    skipped: dict[str, dict[str, Any]] = {}
+
     deadline = time.time() + max_total_seconds
 
     delay = 3
@@ -379,6 +410,13 @@ def _update_copyjob_definition_with_retry(
 
             # Apply all stages sequentially; stop and retry later if any stage fails
             for idx, obj in enumerate(candidates, start=1):
+                if skipped and isinstance(obj.get("activities"), list):
+                    obj = {
+                        **obj,
+                        "activities": [
+                            a for i, a in enumerate(obj["activities"]) if _activity_key(a, i) not in skipped
+                        ],
+                    }
                 if idx == 2:
                     props_dbg = obj.get("properties", {}) if isinstance(obj.get("properties"), dict) else {}
                     src_dbg = props_dbg.get("source", {}) if isinstance(props_dbg.get("source"), dict) else {}
@@ -417,75 +455,41 @@ def _update_copyjob_definition_with_retry(
                     emit(f"   payload preview: {preview}")
                 except Exception:
                     pass
-                payload = _make_payload(obj)
-                last_err_inner: Optional[Exception] = None
-                # Try copyJobs endpoint first
-                try:
-                    emit(f" - trying payload stage {idx}/{len(candidates)} (activities={len(obj.get('activities', []))}) via copyJobs endpoint")
-                    _post_with_lro(
-                        token,
-                        update_url_copyjobs,
-                        payload,
-                        timeout_seconds=per_attempt_lro_timeout_seconds,
-                    )
-                    emit(f"   stage {idx} succeeded via copyJobs endpoint")
-                    continue  # proceed to next stage
-                except Exception as e1:
-                    last_err_inner = e1
-                    emit(f"   copyJobs updateDefinition failed at stage {idx}: {e1}")
-                # Fallback to items endpoint
-                try:
-                    emit(f"   trying items endpoint at stage {idx}")
-                    _post_with_lro(
-                        token,
-                        update_url_items,
-                        payload,
-                        timeout_seconds=per_attempt_lro_timeout_seconds,
-                    )
-                    emit(f"   stage {idx} succeeded via items endpoint")
+                n_acts = len(obj.get("activities") or [])
+                emit(f" - trying payload stage {idx}/{len(candidates)} (activities={n_acts})")
+                err = _apply(obj)
+                if err is None:
+                    emit(f"   stage {idx} succeeded")
                     continue
-                except Exception as e2:
-                    last_err_inner = e2
-                    emit(f"   items updateDefinition failed at stage {idx}: {e2}")
-                # If stage is the first with activities, try incremental per-activity to isolate offending table
+                # If the stage carries activities, isolate the offending tables and apply the rest
                 acts = (obj or {}).get("activities")
                 if isinstance(acts, list) and len(acts) > 0:
-                    emit(f"   attempting per-activity incremental apply at stage {idx}...")
-                    for n in range(1, len(acts) + 1):
+                    emit(f"   bisecting {len(acts)} activities at stage {idx} to isolate failing tables...")
+
+                    def _apply_subset(subset: list[dict[str, Any]]) -> Optional[Exception]:
                         partial_obj = _copy(obj)
-                        partial_obj["activities"] = acts[:n]
-                        partial_payload = _make_payload(partial_obj)
-                        try:
-                            emit(f"     - trying first {n}/{len(acts)} activities via copyJobs endpoint")
-                            _post_with_lro(
-                                token,
-                                update_url_copyjobs,
-                                partial_payload,
-                                timeout_seconds=per_attempt_lro_timeout_seconds,
-                            )
-                            emit(f"       succeeded for {n}/{len(acts)} via copyJobs")
-                            continue
-                        except Exception as e3:
-                            emit(f"       copyJobs failed at activity index {n}: {e3}")
-                            try:
-                                emit(f"       trying items endpoint for first {n} activities")
-                                _post_with_lro(
-                                    token,
-                                    update_url_items,
-                                    partial_payload,
-                                    timeout_seconds=per_attempt_lro_timeout_seconds,
-                                )
-                                emit(f"       succeeded for {n}/{len(acts)} via items")
-                                continue
-                            except Exception as e4:
-                                emit(f"       items failed at activity index {n}: {e4}")
-                                # Found the offending activity; abort stage so outer retry can act
-                                raise e4
-                # If both endpoints failed for this stage, raise to outer retry loop
-                raise last_err_inner if last_err_inner else RuntimeError("Unknown updateDefinition failure")
+                        partial_obj["activities"] = subset
+                        return _apply(partial_obj, indent="     ")
+
+                    failing = _bisect_failing_activities(acts, _apply_subset, err, deadline)
+                    if len(failing) == len(acts):
+                        # Nothing table-specific: let the outer retry handle it
+                        raise err
+                    for i, act_err in failing.items():
+                        key = _activity_key(acts[i], i)
+                        if key not in skipped:
+                            skipped[key] = {**_activity_tables(acts[i]), "error": str(act_err)[:500]}
+                            emit(f"   skipping {skipped[key]['source']} -> {skipped[key]['destination']}: {act_err}")
+                    good_obj = _copy(obj)
+                    good_obj["activities"] = [a for i, a in enumerate(acts) if i not in failing]
+                    err = _apply(good_obj)
+                    if err is None:
+                        emit(f"   stage {idx} succeeded without {len(failing)} failing table(s)")
+                        continue
+                raise err
 
             # All stages succeeded
-            return
+            return list(skipped.values())
         except Exception as exc:
             last_err = exc
             emit(f"UpdateDefinition failed: {exc}")
@@ -500,78 +504,56 @@ def _update_copyjob_definition_with_retry(
     )
 
 def _poll_fabric_operation(token: str, location_url: str, timeout_seconds: int = 1800) -> dict[str, Any]:
-    deadline = time.time() + timeout_seconds
-    while True:
-        if time.time() > deadline:
-            raise TimeoutError(f"Timed out waiting for Fabric operation: {location_url}")
-        r = requests.get(location_url, headers=_auth_headers(token), timeout=60)
-        r.raise_for_status()
-        data = r.json() if r.text else {}
-        status = (data or {}).get("status") or (data or {}).get("state")
-        if isinstance(status, str) and status.lower() in ("succeeded", "failed", "cancelled"):
-            if status.lower() != "succeeded":
-                raise RuntimeError(f"Fabric operation did not succeed: {data}")
-            return data
-        ra = r.headers.get("Retry-After")
-        delay = int(ra) if ra and ra.isdigit() else 5
-        time.sleep(delay)
+    return FabricClient.from_token(token).poll_operation(location_url, timeout_seconds=timeout_seconds)
 
 
-def _post_with_lro(token: str, url: str, payload: dict[str, Any], timeout_seconds: int = 1800) -> dict[str, Any]:
-    r = requests.post(url, headers=_auth_headers(token), json=payload, timeout=180)
-    if r.status_code in (200, 201):
-        if not r.text:
-            return {}
-        data = r.json()
-        return data or {}
-    if r.status_code == 202:
-        location = r.headers.get("Location") or r.headers.get("location")
-        if not location:
-            raise RuntimeError(f"Fabric returned 202 without Location header. Response: {r.text}")
-        _poll_fabric_operation(token, location, timeout_seconds=timeout_seconds)
-        if not r.text:
-            return {}
-        data = r.json()
-        return data or {}
-
-    # Provide more context than requests' default HTTPError (helps with 401/403 troubleshooting)
-    body = (r.text or "").strip()
-    raise RuntimeError(
-        "Fabric API request failed. "
-        f"status={r.status_code} url={url} "
-        f"response={body[:2000]}"
+def _submit_with_lro(
+    token: str,
+    url: str,
+    payload: dict[str, Any],
+    timeout_seconds: int = 1800,
+    on_progress: Optional[ProgressCallback] = None,
+) -> Future:
+    return FabricClient.from_token(token).submit(
+        "POST", url, payload, lro_timeout_seconds=timeout_seconds, on_progress=on_progress
     )
 
 
-def create_warehouse(
+def _post_with_lro(token: str, url: str, payload: dict[str, Any], timeout_seconds: int = 1800) -> dict[str, Any]:
+    return _submit_with_lro(token, url, payload, timeout_seconds).result()
+
+
+def start_warehouse_creation(
     workspace_id: str,
     display_name: str,
     description: str = "",
     collation_type: Optional[str] = None,
     credential: Optional[ClientSecretCredential] = None,
-) -> dict[str, Any]:
-    token = get_fabric_token(credential)
-    url = f"https://api.fabric.microsoft.com/v1/workspaces/{workspace_id}/warehouses"
+    on_progress: Optional[ProgressCallback] = None,
+) -> Future:
     payload: dict[str, Any] = {"displayName": display_name}
     if description:
         payload["description"] = description
     if collation_type:
         payload["creationPayload"] = {"collationType": collation_type}
-    return _post_with_lro(token, url, payload)
+    return _client(credential).submit("POST", f"workspaces/{workspace_id}/warehouses", payload, on_progress=on_progress)
+
+
+def create_warehouse(
+    workspace_id: str,
+    display_name: str,
+    description: str = "",
+    collation_type: Optional[str] = None,
+    credential: Optional[ClientSecretCredential] = None,
+) -> dict[str, Any]:
+    return start_warehouse_creation(workspace_id, display_name, description, collation_type, credential).result()
 
 
 def list_warehouses(
     workspace_id: str,
     credential: Optional[ClientSecretCredential] = None,
 ) -> list[dict[str, Any]]:
-    token = get_fabric_token(credential)
-    url = f"https://api.fabric.microsoft.com/v1/workspaces/{workspace_id}/warehouses"
-    data = _get(token, url)
-    if isinstance(data, dict) and isinstance(data.get("value"), list):
-        return data["value"]
-    if isinstance(data, list):
-        return data
-    return []
+    return _client(credential).list_all(f"workspaces/{workspace_id}/warehouses")
 
 
 def find_warehouse_by_display_name(
@@ -579,11 +561,7 @@ def find_warehouse_by_display_name(
     display_name: str,
     credential: Optional[ClientSecretCredential] = None,
 ) -> Optional[dict[str, Any]]:
-    items = list_warehouses(workspace_id, credential=credential)
-    for it in items:
-        if isinstance(it, dict) and it.get("displayName") == display_name:
-            return it
-    return None
+    return _client(credential).find_by_display_name(f"workspaces/{workspace_id}/warehouses", display_name)
 
 
 def create_or_get_warehouse(
@@ -651,8 +629,6 @@ def create_synapse_connection_service_principal(
     credential: Optional[ClientSecretCredential] = None,
     skip_test_connection: bool = False,
 ) -> dict[str, Any]:
-    token = get_fabric_token(credential)
-    url = "https://api.fabric.microsoft.com/v1/connections"
     payload: dict[str, Any] = {
         "connectivityType": "ShareableCloud",
         "displayName": display_name,
@@ -678,7 +654,7 @@ def create_synapse_connection_service_principal(
             },
         },
     }
-    return _post_with_lro(token, url, payload)
+    return _client(credential).post("connections", payload)
 
 
 def create_or_get_synapse_connection_service_principal(
@@ -723,16 +699,7 @@ def _b64_json(obj: Any) -> str:
     return base64.b64encode(json.dumps(obj, ensure_ascii=False).encode("utf-8")).decode("ascii")
 
 
-def list_synapse_tables_service_principal(
-    server: str,
-    database: str,
-    tenant_id: str,
-    client_id: str,
-    client_secret: str,
-    schema: Optional[str] = None,
-) -> list[str]:
-    import pyodbc
-
+def _synapse_sql_connection_string(server: str, database: str, client_id: str, client_secret: str) -> str:
     parts = [
         "DRIVER={ODBC Driver 18 for SQL Server};",
         f"SERVER={server};",
@@ -743,7 +710,20 @@ def list_synapse_tables_service_principal(
         f"UID={client_id};",
         f"PWD={client_secret};",
     ]
-    conn_str = "".join(parts)
+    return "".join(parts)
+
+
+def list_synapse_tables_service_principal(
+    server: str,
+    database: str,
+    tenant_id: str,
+    client_id: str,
+    client_secret: str,
+    schema: Optional[str] = None,
+) -> list[str]:
+    import pyodbc
+
+    conn_str = _synapse_sql_connection_string(server, database, client_id, client_secret)
 
     where = "WHERE TABLE_TYPE = 'BASE TABLE'"
     params: list[Any] = []
@@ -767,6 +747,190 @@ def list_synapse_tables_service_principal(
     return rows
 
 
+def estimate_synapse_table_rows_service_principal(
+    server: str,
+    database: str,
+    tenant_id: str,
+    client_id: str,
+    client_secret: str,
+    tables: Optional[list[str]] = None,
+) -> dict[str, int]:
+    """Row count per schema.table from sys.partitions (heap or clustered index only)."""
+    import pyodbc
+
+    conn_str = _synapse_sql_connection_string(server, database, client_id, client_secret)
+    sql = (
+        "SELECT s.name, t.name, SUM(p.rows) "
+        "FROM sys.tables t "
+        "JOIN sys.schemas s ON s.schema_id = t.schema_id "
+        "JOIN sys.partitions p ON p.object_id = t.object_id AND p.index_id IN (0, 1) "
+        "GROUP BY s.name, t.name"
+    )
+
+    rows: dict[str, int] = {}
+    with pyodbc.connect(conn_str, timeout=30) as conn:
+        cur = conn.cursor()
+        cur.execute(sql)
+        for sch, tbl, n in cur.fetchall():
+            rows[f"{sch}.{tbl}"] = int(n or 0)
+    if tables is not None:
+        wanted = {t.lower(): t for t in tables}
+        rows = {wanted[k.lower()]: v for k, v in rows.items() if k.lower() in wanted}
+    return rows
+
+
+def shard_tables_by_size(tables: list[str], sizes: dict[str, int], shard_count: int) -> list[list[str]]:
+    """Split tables into at most shard_count groups of similar total size (largest first onto the lightest group)."""
+    shard_count = max(1, min(shard_count, len(tables)))
+    heap: list[tuple[int, int]] = [(0, i) for i in range(shard_count)]
+    shards: list[list[str]] = [[] for _ in range(shard_count)]
+    # Unknown sizes count as one row so they still spread across shards
+    for tbl in sorted(tables, key=lambda t: sizes.get(t, 1), reverse=True):
+        total, i = heapq.heappop(heap)
+        shards[i].append(tbl)
+        heapq.heappush(heap, (total + max(sizes.get(tbl, 1), 1), i))
+    return [sorted(sh) for sh in shards if sh]
+
+
+def run_copy_jobs(
+    workspace_id: str,
+    copyjob_ids: list[str],
+    max_concurrent: int = COPYJOB_RUN_MAX_CONCURRENT,
+    timeout_seconds: int = 12 * 3600,
+    credential: Optional[ClientSecretCredential] = None,
+    progress_callback: Optional[Callable[[str], None]] = None,
+) -> list[dict[str, Any]]:
+    """Run copy jobs on demand, at most max_concurrent at a time; one status row per job."""
+    client = _client(credential)
+    pending = list(copyjob_ids)
+    running: dict[Future, tuple[str, float]] = {}
+    rows: list[dict[str, Any]] = []
+    while pending or running:
+        while pending and len(running) < max(1, max_concurrent):
+            cj_id = pending.pop(0)
+            started = time.time()
+            try:
+                fut = client.submit(
+                    "POST",
+                    f"workspaces/{workspace_id}/items/{cj_id}/jobs/instances?jobType={COPYJOB_JOB_TYPE}",
+                    lro_timeout_seconds=timeout_seconds,
+                )
+            except Exception as exc:
+                rows.append({"copyJobId": cj_id, "status": "Failed", "error": str(exc), "seconds": 0.0})
+                continue
+            if progress_callback:
+                progress_callback(f"Started copy job {cj_id}")
+            running[fut] = (cj_id, started)
+        if not running:
+            break
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for fut in done:
+            cj_id, started = running.pop(fut)
+            err = fut.exception()
+            row = {
+                "copyJobId": cj_id,
+                "status": "Failed" if err else "Completed",
+                "error": str(err) if err else "",
+                "seconds": round(time.time() - started, 1),
+            }
+            rows.append(row)
+            if progress_callback:
+                progress_callback(f"Copy job {cj_id}: {row['status']} after {row['seconds']}s")
+    return rows
+
+
+def create_sharded_copy_jobs_synapse_to_warehouse(
+    workspace_id: str,
+    display_name: str,
+    source_connection_id: str,
+    source_tables: list[str],
+    destination_warehouse_id: str,
+    destination_endpoint: Optional[str] = None,
+    *,
+    table_sizes: Optional[dict[str, int]] = None,
+    shard_count: int = COPYJOB_DEFAULT_SHARDS,
+    max_workers: int = COPYJOB_SHARD_MAX_WORKERS,
+    run: bool = False,
+    run_max_concurrent: int = COPYJOB_RUN_MAX_CONCURRENT,
+    source_database: Optional[str] = None,
+    credential: Optional[ClientSecretCredential] = None,
+    progress_callback: Optional[Callable[[str], None]] = None,
+) -> dict[str, Any]:
+    """Split tables into size-balanced copy jobs named <display_name>_NN, created and defined concurrently.
+
+    table_sizes (e.g. from estimate_synapse_table_rows_service_principal)
+    drives the split; without it tables are spread by count. With run=True
+    the jobs are then started, at most run_max_concurrent at a time.
+    progress_callback is only called on the calling thread.
+    """
+    sizes = table_sizes or {}
+    shards = shard_tables_by_size(source_tables, sizes, shard_count)
+    # Workers queue their messages; the caller reports them between waits
+    messages: "queue.Queue[str]" = queue.Queue()
+
+    def _emit(name: str) -> Optional[Callable[[str], None]]:
+        if not progress_callback:
+            return None
+        return lambda message: messages.put(f"[{name}] {message}")
+
+    def _drain() -> None:
+        while True:
+            try:
+                message = messages.get_nowait()
+            except queue.Empty:
+                return
+            progress_callback(message)
+
+    def _create(i: int, tables: list[str]) -> dict[str, Any]:
+        name = f"{display_name}_{i + 1:02d}" if len(shards) > 1 else display_name
+        row: dict[str, Any] = {
+            "displayName": name,
+            "tables": tables,
+            "estimatedRows": sum(sizes.get(t, 0) for t in tables),
+        }
+        try:
+            row["copyJob"] = create_copy_job_synapse_tables_to_warehouse(
+                workspace_id=workspace_id,
+                display_name=name,
+                source_connection_id=source_connection_id,
+                source_tables=tables,
+                destination_warehouse_id=destination_warehouse_id,
+                destination_endpoint=destination_endpoint,
+                source_database=source_database,
+                credential=credential,
+                progress_callback=_emit(name),
+            )
+        except Exception as exc:
+            row["error"] = str(exc)
+        return row
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(shards)))) as pool:
+        futures = [pool.submit(_create, i, tables) for i, tables in enumerate(shards)]
+        running = set(futures)
+        while running:
+            done, running = wait(running, timeout=0.5, return_when=FIRST_COMPLETED)
+            if not progress_callback:
+                continue
+            _drain()
+            for fut in done:
+                row = fut.result()
+                outcome = f"failed: {row['error']}" if row.get("error") else "defined"
+                progress_callback(f"[{row['displayName']}] {outcome}")
+        results = [fut.result() for fut in futures]
+
+    out: dict[str, Any] = {"shards": results}
+    if run:
+        ids = [r["copyJob"]["id"] for r in results if (r.get("copyJob") or {}).get("id")]
+        out["runs"] = run_copy_jobs(
+            workspace_id,
+            ids,
+            max_concurrent=run_max_concurrent,
+            credential=credential,
+            progress_callback=progress_callback,
+        )
+    return out
+
+
 def create_copy_job_synapse_tables_to_warehouse(
     workspace_id: str,
     display_name: str,
@@ -780,8 +944,9 @@ def create_copy_job_synapse_tables_to_warehouse(
     credential: Optional[ClientSecretCredential] = None,
     progress_callback: Optional[Callable[[str], None]] = None,
 ) -> dict[str, Any]:
-    token = get_fabric_token(credential)
-    base_url = f"https://api.fabric.microsoft.com/v1/workspaces/{workspace_id}/copyJobs"
+    client = _client(credential)
+    token = client.token()
+    base_url = f"workspaces/{workspace_id}/copyJobs"
 
     try:
         print(
@@ -869,7 +1034,7 @@ def create_copy_job_synapse_tables_to_warehouse(
     created: dict[str, Any]
     copyjob_id: Optional[str] = None
     try:
-        created = _post_with_lro(token, base_url, {"displayName": display_name})
+        created = client.post(base_url, {"displayName": display_name})
         created = created or {}
         if not isinstance(created, dict):
             raise RuntimeError(f"CopyJob create returned unexpected type: {type(created)}")
@@ -901,7 +1066,7 @@ def create_copy_job_synapse_tables_to_warehouse(
     template_content = _try_get_existing_copyjob_content(token, workspace_id, copyjob_id) if use_existing_template else None
     content = _build_copyjob_content_from_template(template_content, activities, fallback_properties)
 
-    _update_copyjob_definition_with_retry(
+    skipped_tables = _update_copyjob_definition_with_retry(
         token,
         workspace_id,
         copyjob_id,
@@ -911,7 +1076,7 @@ def create_copy_job_synapse_tables_to_warehouse(
 
     if "_reused" not in created:
         created["_reused"] = False
-    return {**created, "definitionUpdated": True}
+    return {**created, "definitionUpdated": True, "skippedTables": skipped_tables}
 
 
 def create_copy_job_synapse_to_warehouse(
@@ -924,8 +1089,9 @@ def create_copy_job_synapse_to_warehouse(
     credential: Optional[ClientSecretCredential] = None,
     progress_callback: Optional[Callable[[str], None]] = None,
 ) -> dict[str, Any]:
-    token = get_fabric_token(credential)
-    base_url = f"https://api.fabric.microsoft.com/v1/workspaces/{workspace_id}/copyJobs"
+    client = _client(credential)
+    token = client.token()
+    base_url = f"workspaces/{workspace_id}/copyJobs"
 
     content = {
         "properties": {
@@ -968,14 +1134,14 @@ def create_copy_job_synapse_to_warehouse(
         ],
     }
 
-    created = _post_with_lro(token, base_url, {"displayName": display_name})
+    created = client.post(base_url, {"displayName": display_name})
     if not isinstance(created, dict):
         raise RuntimeError(f"CopyJob create returned unexpected type: {type(created)}")
     copyjob_id = created.get("id")
     if not copyjob_id:
         raise RuntimeError(f"CopyJob create response missing id: {created}")
 
-    _update_copyjob_definition_with_retry(
+    skipped_tables = _update_copyjob_definition_with_retry(
         token,
         workspace_id,
         copyjob_id,
@@ -983,7 +1149,7 @@ def create_copy_job_synapse_to_warehouse(
         progress_callback=progress_callback,
     )
 
-    return {**created, "definitionUpdated": True}
+    return {**created, "definitionUpdated": True, "skippedTables": skipped_tables}
 
 
 def create_warehouse_and_copy_job_from_env() -> dict[str, Any]:
@@ -1004,10 +1170,8 @@ def create_warehouse_and_copy_job_from_env() -> dict[str, Any]:
 
     cred = build_service_principal_credential(tenant_id, client_id, client_secret)
 
-    wh = create_warehouse(workspace_id, warehouse_name, description=warehouse_description, credential=cred)
-    warehouse_id = wh.get("id") or wh.get("warehouseId")
-    if not warehouse_id:
-        raise RuntimeError(f"Warehouse create response missing id: {wh}")
+    # The warehouse provisions in the background while the connection is created
+    wh_future = start_warehouse_creation(workspace_id, warehouse_name, description=warehouse_description, credential=cred)
 
     conn = create_synapse_connection_service_principal(
         display_name=f"{syn_server};{syn_database}",
@@ -1022,6 +1186,11 @@ def create_warehouse_and_copy_job_from_env() -> dict[str, Any]:
     if not conn_id:
         raise RuntimeError(f"Connection create response missing id: {conn}")
 
+    wh = wh_future.result()
+    warehouse_id = wh.get("id") or wh.get("warehouseId")
+    if not warehouse_id:
+        raise RuntimeError(f"Warehouse create response missing id: {wh}")
+
     cj = create_copy_job_synapse_to_warehouse(
         workspace_id=workspace_id,
         display_name=copyjob_name,
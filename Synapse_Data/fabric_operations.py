@@ -0,0 +1,169 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+from Migration.constants import (
+    OPERATION_DEFAULT_DELAY_SECONDS,
+    OPERATION_HTTP_WORKERS,
+    OPERATION_SUCCESS_STATES,
+    OPERATION_TERMINAL_STATES,
+    THROTTLE_MAX_DELAY_SECONDS,
+)
+from Migration.http_session import is_retryable, retry_after, shared_session
+from Synapse_Data.fabric_client import FabricApiError, _json_or_text, _request_error
+
+
+@dataclass
+class OperationProgress:
+    """One poll of a long-running operation, as passed to progress callbacks."""
+
+    location: str
+    status: str
+    percent_complete: Optional[float]
+    polls: int
+    elapsed_seconds: float
+    document: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def done(self) -> bool:
+        return self.status.lower() in OPERATION_TERMINAL_STATES
+
+
+ProgressCallback = Callable[[OperationProgress], None]
+
+
+class OperationTracker:
+    """Polls many Fabric operation Location URLs concurrently on one asyncio loop.
+
+    Each operation sleeps for its own Retry-After between polls; only the
+    status GETs themselves occupy a worker thread. track() returns a
+    concurrent.futures.Future, wait_for() the same as an awaitable.
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None, http_workers: int = OPERATION_HTTP_WORKERS) -> None:
+        self.session = session or shared_session()
+        self._http = ThreadPoolExecutor(max_workers=http_workers, thread_name_prefix="fabric-operation")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._active = 0
+
+    @property
+    def active(self) -> int:
+        """Operations currently being tracked."""
+        return self._active
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="fabric-operation-loop", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _get(self, url: str, headers: Dict[str, str]) -> requests.Response:
+        return self.session.get(url, headers=headers, timeout=60)
+
+    async def _poll(
+        self,
+        location: str,
+        headers: Callable[[], Dict[str, str]],
+        timeout_seconds: float,
+        delay: float,
+        on_progress: Optional[ProgressCallback],
+        finish: Optional[Callable[[Dict[str, Any]], Any]],
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        started = time.time()
+        deadline = started + timeout_seconds
+        polls = 0
+        backoff = OPERATION_DEFAULT_DELAY_SECONDS
+        while True:
+            if delay > 0:
+                await asyncio.sleep(min(delay, max(0.0, deadline - time.time())))
+            if time.time() > deadline:
+                raise TimeoutError(f"Timed out waiting for Fabric operation: {location}")
+            # headers() may refresh the token, so it runs on the executor too
+            r = await loop.run_in_executor(self._http, lambda: self._get(location, headers()))
+            polls += 1
+            if is_retryable("GET", r.status_code):
+                delay = min(retry_after(r, backoff), THROTTLE_MAX_DELAY_SECONDS)
+                backoff = min(backoff * 2, THROTTLE_MAX_DELAY_SECONDS)
+                continue
+            if r.status_code not in (200, 201, 202):
+                raise _request_error(r, location)
+            data = _json_or_text(r)
+            data = data if isinstance(data, dict) else {}
+            status = data.get("status") or data.get("state")
+            progress = OperationProgress(
+                location=location,
+                status=status if isinstance(status, str) else "Running",
+                percent_complete=data.get("percentComplete"),
+                polls=polls,
+                elapsed_seconds=round(time.time() - started, 2),
+                document=data,
+            )
+            if on_progress is not None:
+                try:
+                    on_progress(progress)
+                except Exception as exc:
+                    print(f"Operation progress callback failed: {exc}")
+            if progress.done:
+                if progress.status.lower() not in OPERATION_SUCCESS_STATES:
+                    raise FabricApiError(f"Fabric operation did not succeed: {data}")
+                result_url = r.headers.get("Location") or r.headers.get("location")
+                if result_url:
+                    data = {**data, "_resultLocation": result_url}
+                if finish is None:
+                    return data
+                return await loop.run_in_executor(self._http, finish, data)
+            delay = min(retry_after(r, OPERATION_DEFAULT_DELAY_SECONDS), THROTTLE_MAX_DELAY_SECONDS)
+
+    async def _run(self, *args: Any) -> Any:
+        self._active += 1
+        try:
+            return await self._poll(*args)
+        finally:
+            self._active -= 1
+
+    def track(
+        self,
+        location: str,
+        headers: Callable[[], Dict[str, str]],
+        timeout_seconds: float = 1800,
+        retry_after: float = 0.0,
+        on_progress: Optional[ProgressCallback] = None,
+        finish: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> Future:
+        """Start polling an operation; the future resolves to its final status document.
+
+        headers is called before every poll so a refreshed token is picked up.
+        retry_after delays the first poll (the Retry-After of the 202).
+        finish, if given, turns the status document into the future's result
+        and runs on a worker thread.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self._run(location, headers, timeout_seconds, retry_after, on_progress, finish),
+            self._ensure_loop(),
+        )
+
+    async def wait_for(self, location: str, headers: Callable[[], Dict[str, str]], **kwargs: Any) -> Any:
+        """Awaitable form of track() for callers running their own event loop."""
+        return await asyncio.wrap_future(self.track(location, headers, **kwargs))
+
+
+_TRACKER: Optional[OperationTracker] = None
+_TRACKER_LOCK = threading.Lock()
+
+
+def get_operation_tracker() -> OperationTracker:
+    """Process-wide tracker shared by every FabricClient."""
+    global _TRACKER
+    with _TRACKER_LOCK:
+        if _TRACKER is None:
+            _TRACKER = OperationTracker()
+        return _TRACKER
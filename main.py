@@ -1241,7 +1241,7 @@
 
 import os
 import subprocess
-from collections import defaultdict
+from datetime import datetime
 from typing import Optional, Dict, List, Tuple, Any, Set
 
 import streamlit as st
@@ -1252,6 +1252,8 @@ from Synapse_Data.fabric_copyjob_warehouse import (
     create_copy_job_synapse_tables_to_warehouse,
     create_or_get_synapse_connection_service_principal,
     create_or_get_warehouse,
+    create_sharded_copy_jobs_synapse_to_warehouse,
+    estimate_synapse_table_rows_service_principal,
     list_synapse_tables_service_principal,
  )
 
@@ -1269,9 +1271,15 @@ from Migration.adf_components import (
     list_linked_services_for_factory,
     list_datasets_for_factory,
 )
+from Migration.factory_snapshot import get_factory_snapshot
 
 from Migration.synapse_components import (
     list_synapse_workspaces,
+    list_synapse_workspaces_in_subscriptions,
+    assess_synapse_workspaces,
+    synapse_readiness_table,
+    synapse_pipeline_scores,
+    get_synapse_snapshot,
     fetch_activity_rows_for_synapse,
     list_synapse_linked_services,
     list_synapse_datasets,
@@ -1300,17 +1308,16 @@ from Migration.data_storage import (
     sample_adls_paths,
 )
 
-from Migration.migration_score import (
-    score_component_parity,
-    score_non_migratable,
-    score_connectivity,
-    score_orchestration,
-)
+from Migration.migration_score import score_pipelines
 
-from Migration.utilities import _normalize_type
-from Migration.constants import CONTROL_ACTIVITY_TYPES
+from Migration.constants import MIGRATION_PUBLISH_MAX_WORKERS
 from Migration.ui_config import apply_custom_theme, render_header_with_logo
-from utils.synapse_notebook_migrator import migrate_synapse_notebook_to_fabric, list_synapse_notebooks
+from utils.synapse_notebook_migrator import list_synapse_notebooks_dev_api, migrate_synapse_notebooks_to_fabric
+from Migration.caching import use_streamlit_cache
+from Migration.pipeline_migration import migrate_pipelines
+
+# Listing functions cache through st.cache_data while running inside the app
+use_streamlit_cache()
 
 
 def _extract_synapse_datasets_and_linked_services(
@@ -1511,16 +1518,38 @@ def main() -> None:
             st.markdown("---")
             st.subheader(f"🔍 Data Factory: {selected_df}")
 
+            refresh_snapshot = st.button("🔄 Refresh factory definitions", key=f"refresh_snapshot_{selected_df}")
+
+            # Download the factory definitions once; every section below projects over this snapshot
+            try:
+                snapshot = get_factory_snapshot(
+                    credential, subscription_id, rg_name, selected_df, refresh=refresh_snapshot
+                )
+            except Exception as e:
+                st.error(f"Failed to fetch factory definitions: {e}")
+                snapshot = None
+            if snapshot and snapshot.stats:
+                st.caption(
+                    f"Pipelines: {snapshot.stats.get('pipelines_fetched', 0)} downloaded, "
+                    f"{snapshot.stats.get('pipelines_reused', 0)} unchanged (cached). "
+                    f"Datasets: {snapshot.stats.get('datasets_fetched', 0)} downloaded, "
+                    f"{snapshot.stats.get('datasets_reused', 0)} unchanged (cached)."
+                )
+
             # Fetch activities
             try:
-                act_rows = fetch_activity_rows_for_factory(credential, subscription_id, rg_name, selected_df)
+                act_rows = fetch_activity_rows_for_factory(
+                    credential, subscription_id, rg_name, selected_df, snapshot=snapshot
+                ) if snapshot else []
             except Exception as e:
                 st.error(f"Failed to fetch components: {e}")
                 act_rows = []
 
             # Linked Services
             try:
-                ls_rows = list_linked_services_for_factory(credential, subscription_id, rg_name, selected_df)
+                ls_rows = list_linked_services_for_factory(
+                    credential, subscription_id, rg_name, selected_df, snapshot=snapshot
+                ) if snapshot else []
                 ls_types = [row.get("LinkedServiceType", "") for row in ls_rows]
             except Exception:
                 ls_rows = []
@@ -1547,60 +1576,7 @@ def main() -> None:
             # 2) Migration Scoring
             with st.container(border=True):
                 st.subheader("📈 Migration Scoring (Fabric Readiness Assessment)")
-                grouped: Dict[Tuple[str, str], List[Dict[str, str]]] = defaultdict(list)
-                for r in act_rows:
-                    grouped[(r.get("Factory", ""), r.get("PipelineName", ""))].append(r)
-
-                score_rows: List[Dict[str, Any]] = []
-                for (fac, pipe), items in grouped.items():
-                    total_acts = len(items)
-                    non_migratable = sum(1 for it in items if (it.get("Migratable") or "").lower() == "no")
-
-                    # Connectivity should be scored per-pipeline based on referenced linked services,
-                    # not all linked services in the factory.
-                    used_ls_names: Set[str] = set()
-                    for it in items:
-                        sls = (it.get("SourceLinkedService") or "").strip()
-                        tls = (it.get("SinkLinkedService") or "").strip()
-                        if sls:
-                            used_ls_names.add(sls)
-                        if tls:
-                            used_ls_names.add(tls)
-                    used_ls_types = [ls_type_by_name.get(n, "") for n in sorted(used_ls_names)]
-
-                    control_acts = 0
-                    for it in items:
-                        nt = _normalize_type(it.get("ActivityType"))
-                        if nt in CONTROL_ACTIVITY_TYPES:
-                            control_acts += 1
-
-                    parity_score = score_component_parity(total_acts, non_migratable)
-                    non_mig_score = score_non_migratable(non_migratable)
-                    connectivity_score = score_connectivity(used_ls_types)
-                    orchestration_score = score_orchestration(total_acts, control_acts)
-                    total = parity_score + non_mig_score + connectivity_score + orchestration_score
-
-                    if 3 in (parity_score, non_mig_score, connectivity_score, orchestration_score):
-                        band = "🔴 Hard"
-                    elif total <= 4:
-                        band = "🟢 Easy"
-                    elif total <= 8:
-                        band = "🟡 Medium"
-                    else:
-                        band = "🔴 Hard"
-
-                    score_rows.append({
-                        "Factory": fac,
-                        "Pipeline": pipe,
-                        "Component Parity": parity_score,
-                        "Non-Migratable": non_mig_score,
-                        "Connectivity": connectivity_score,
-                        "Orchestration": orchestration_score,
-                        "Total Score": total,
-                        "Difficulty": band,
-                        "Activities": total_acts,
-                        "Non-Migratable Count": non_migratable,
-                    })
+                score_rows = score_pipelines(act_rows, ls_type_by_name)
 
                 if score_rows:
                     st.dataframe(score_rows, width="stretch", hide_index=True)
@@ -1619,7 +1595,9 @@ def main() -> None:
             with st.container(border=True):
                 st.subheader("📦 Datasets")
                 try:
-                    ds_rows = list_datasets_for_factory(credential, subscription_id, rg_name, selected_df)
+                    ds_rows = list_datasets_for_factory(
+                        credential, subscription_id, rg_name, selected_df, snapshot=snapshot
+                    ) if snapshot else []
                 except Exception as e:
                     ds_rows = []
                     st.error(f"Failed to list datasets: {e}")
@@ -1658,6 +1636,14 @@ def main() -> None:
                         key=f"workspace_id_adf_{selected_df}",
                     )
 
+                    publish_workers = st.number_input(
+                        "Parallel publishes",
+                        min_value=1,
+                        max_value=32,
+                        value=MIGRATION_PUBLISH_MAX_WORKERS,
+                        key=f"publish_workers_adf_{selected_df}",
+                    )
+
                     run_migration = st.button(
                         "🔄 Migrate Selected ADF Pipelines to Fabric",
                         type="primary",
@@ -1670,41 +1656,34 @@ def main() -> None:
                         elif not workspace_id:
                             st.warning("Please enter a Fabric Workspace ID.")
                         else:
-                            script_path = os.path.join(UTILS_DIR, "adf_to_fabric_migration.ps1")
                             resolutions_file = os.path.join(UTILS_DIR, "resolutions.json")
-                            region = "prod"
-
-                            cmd = [
-                                "pwsh", "-File", script_path,
-                                "-FabricWorkspaceId", workspace_id,
-                                "-ResolutionsFile", resolutions_file,
-                                "-Region", region,
-                                "-SubscriptionId", subscription_id,
-                                "-ResourceGroupName", rg_name,
-                                "-DataFactoryName", selected_df,
-                                "-PipelineNames", ",".join(pipelines_to_migrate),
-                            ]
-
-                            try:
-                                with st.spinner("Running migration in PowerShell..."):
-                                    result = subprocess.run(cmd, capture_output=True, text=True)
-                            except FileNotFoundError:
-                                st.error("Failed to start pwsh. Ensure PowerShell 7 is installed and in PATH.")
-                            except Exception as exc:
-                                st.error(f"Failed to launch migration script: {exc}")
+                            manifest_path = os.path.join(
+                                UTILS_DIR, "Logs", f"MigrationManifest_{datetime.now():%Y%m%d_%H%M%S}.json"
+                            )
+                            if snapshot is None:
+                                st.error("Factory definitions are not loaded; refresh the assessment and try again.")
                             else:
-                                if result.returncode == 0:
-                                    st.success("✅ Migration script completed. Check Microsoft Fabric + Logs.")
+                                try:
+                                    with st.spinner(f"Migrating {len(pipelines_to_migrate)} pipeline(s) to Fabric..."):
+                                        migration_rows = migrate_pipelines(
+                                            credential,
+                                            snapshot,
+                                            workspace_id,
+                                            pipelines_to_migrate,
+                                            resolutions_file,
+                                            max_workers=int(publish_workers),
+                                            manifest_path=manifest_path,
+                                        )
+                                except Exception as exc:
+                                    st.error(f"Migration failed: {exc}")
                                 else:
-                                    st.error(f"❌ Migration script exited with code {result.returncode}.")
-
-                                if result.stdout:
-                                    st.caption("PowerShell output:")
-                                    st.code(result.stdout, language="powershell")
-
-                                if result.stderr:
-                                    st.caption("PowerShell errors:")
-                                    st.code(result.stderr, language="powershell")
+                                    failed = [r for r in migration_rows if r["Status"] not in ("Created", "Updated")]
+                                    if failed:
+                                        st.error(f"❌ {len(failed)} of {len(migration_rows)} pipeline(s) were not migrated.")
+                                    else:
+                                        st.success(f"✅ Migrated {len(migration_rows)} pipeline(s). Check Microsoft Fabric.")
+                                    st.dataframe(migration_rows, width="stretch", hide_index=True)
+                                    st.caption(f"Manifest: {manifest_path}")
 
 # ========== SQL SERVERS SECTION ==========
         if "selected_sql_server" not in st.session_state:
@@ -1972,6 +1951,60 @@ def main() -> None:
             st.session_state.selected_synapse_ws = None
             selected_synapse_ws = None
 
+        # Readiness of many workspaces across resource groups and subscriptions at once
+        with st.expander("📊 Assess multiple Synapse workspaces", expanded=False):
+            multi_sub_idx = st.multiselect(
+                "Subscriptions",
+                options=list(range(len(subs))),
+                default=[sub_idx],
+                format_func=lambda i: sub_labels[i],
+                key="syn_multi_subs",
+            )
+            if st.button("Find workspaces", key="syn_multi_discover"):
+                try:
+                    with st.spinner("Listing Synapse workspaces..."):
+                        st.session_state.syn_multi_targets = list_synapse_workspaces_in_subscriptions(
+                            credential, [subs[i][1] for i in multi_sub_idx]
+                        )
+                except Exception as e:
+                    st.error(f"Failed to list Synapse workspaces: {e}")
+
+            syn_multi_targets: List[Tuple[str, str, str]] = st.session_state.get("syn_multi_targets") or []
+            if syn_multi_targets:
+                sub_name_by_id = {sid: name for name, sid in subs}
+                syn_multi_selected = st.multiselect(
+                    "Workspaces to assess",
+                    options=list(range(len(syn_multi_targets))),
+                    default=list(range(len(syn_multi_targets))),
+                    format_func=lambda i: "{} / {} / {}".format(
+                        sub_name_by_id.get(syn_multi_targets[i][0], syn_multi_targets[i][0]),
+                        syn_multi_targets[i][1],
+                        syn_multi_targets[i][2],
+                    ),
+                    key="syn_multi_selected",
+                )
+                if st.button("Assess selected workspaces", key="syn_multi_assess", disabled=not syn_multi_selected):
+                    bar = st.progress(0.0, text="Assessing Synapse workspaces...")
+
+                    def _on_workspace(a: Any, done: int, total: int) -> None:
+                        bar.progress(done / total, text=f"{done}/{total} assessed ({a.workspace_name}: {a.status})")
+
+                    assessments = assess_synapse_workspaces(
+                        credential,
+                        [syn_multi_targets[i] for i in syn_multi_selected],
+                        progress=_on_workspace,
+                    )
+                    readiness = synapse_readiness_table(assessments)
+                    for row in readiness:
+                        row["Subscription"] = sub_name_by_id.get(row["Subscription"], row["Subscription"])
+                    st.dataframe(readiness, hide_index=True, width="stretch")
+                    pipeline_scores = synapse_pipeline_scores(assessments)
+                    if pipeline_scores:
+                        st.caption("Pipeline scores across all assessed workspaces")
+                        st.dataframe(pipeline_scores, hide_index=True, width="stretch")
+            else:
+                st.caption("Pick subscriptions and click Find workspaces to list every Synapse workspace in them.")
+
         if selected_synapse_ws:
             st.markdown("---")
             st.subheader(f"🔍 Synapse Workspace: {selected_synapse_ws}")
@@ -2082,6 +2115,20 @@ def main() -> None:
                     key="fabric_skip_test",
                 )
 
+                shard_cols = st.columns(2)
+                with shard_cols[0]:
+                    copyjob_shards = int(
+                        st.number_input(
+                            "Copy jobs (split tables by size)",
+                            min_value=1,
+                            max_value=32,
+                            value=1,
+                            key="fabric_copyjob_shards",
+                        )
+                    )
+                with shard_cols[1]:
+                    run_copyjobs = st.checkbox("Run copy jobs after creation", value=False, key="fabric_copyjob_run")
+
                 run_create = st.button(
                     "Create Warehouse + Connection + Copy Job",
                     type="primary",
@@ -2155,37 +2202,99 @@ def main() -> None:
                             except Exception:
                                 pass
                             cj_status = st.empty()
-                            cj = create_copy_job_synapse_tables_to_warehouse(
-                                workspace_id=fabric_workspace_id,
-                                display_name=copyjob_name,
-                                source_connection_id=conn_id,
-                                source_tables=selected_tables,
-                                destination_warehouse_id=warehouse_id,
-                                destination_endpoint=warehouse_endpoint,
-                                source_database=syn_database,
-                                credential=credential,
-                                progress_callback=lambda m: cj_status.write(m),
-                            )
-                            if not isinstance(cj, dict):
-                                raise RuntimeError(f"CopyJob API returned unexpected response type: {type(cj)}")
-                            if cj.get("_reused") is True:
-                                st.write("Copy Job already exists; reusing it.")
-
-                            st.success("Created Warehouse, Connection, and Copy Job.")
-                            st.json({"warehouse": wh, "connection": conn, "copyJob": cj})
+                            if copyjob_shards > 1 or run_copyjobs:
+                                try:
+                                    table_rows = estimate_synapse_table_rows_service_principal(
+                                        syn_server,
+                                        syn_database,
+                                        os.getenv("AZURE_TENANT_ID") or "",
+                                        os.getenv("AZURE_CLIENT_ID") or "",
+                                        os.getenv("AZURE_CLIENT_SECRET") or "",
+                                        tables=selected_tables,
+                                    )
+                                except Exception as e:
+                                    st.write(f"Could not read table sizes ({e}); splitting by table count.")
+                                    table_rows = {}
+                                sharded = create_sharded_copy_jobs_synapse_to_warehouse(
+                                    workspace_id=fabric_workspace_id,
+                                    display_name=copyjob_name,
+                                    source_connection_id=conn_id,
+                                    source_tables=selected_tables,
+                                    destination_warehouse_id=warehouse_id,
+                                    destination_endpoint=warehouse_endpoint,
+                                    table_sizes=table_rows,
+                                    shard_count=copyjob_shards,
+                                    run=run_copyjobs,
+                                    source_database=syn_database,
+                                    credential=credential,
+                                    progress_callback=lambda m: cj_status.write(m),
+                                )
+                                st.success(f"Created Warehouse, Connection, and {len(sharded['shards'])} Copy Jobs.")
+                                st.dataframe(
+                                    [
+                                        {
+                                            "Copy Job": r["displayName"],
+                                            "Tables": len(r["tables"]),
+                                            "Estimated Rows": r["estimatedRows"],
+                                            "Copy Job Id": (r.get("copyJob") or {}).get("id", ""),
+                                            "Skipped Tables": len((r.get("copyJob") or {}).get("skippedTables") or []),
+                                            "Error": r.get("error", ""),
+                                        }
+                                        for r in sharded["shards"]
+                                    ],
+                                    hide_index=True,
+                                    width="stretch",
+                                )
+                                if sharded.get("runs"):
+                                    st.dataframe(sharded["runs"], hide_index=True, width="stretch")
+                                st.json({"warehouse": wh, "connection": conn, "copyJobs": sharded})
+                            else:
+                                cj = create_copy_job_synapse_tables_to_warehouse(
+                                    workspace_id=fabric_workspace_id,
+                                    display_name=copyjob_name,
+                                    source_connection_id=conn_id,
+                                    source_tables=selected_tables,
+                                    destination_warehouse_id=warehouse_id,
+                                    destination_endpoint=warehouse_endpoint,
+                                    source_database=syn_database,
+                                    credential=credential,
+                                    progress_callback=lambda m: cj_status.write(m),
+                                )
+                                if not isinstance(cj, dict):
+                                    raise RuntimeError(f"CopyJob API returned unexpected response type: {type(cj)}")
+                                if cj.get("_reused") is True:
+                                    st.write("Copy Job already exists; reusing it.")
+
+                                st.success("Created Warehouse, Connection, and Copy Job.")
+                                if cj.get("skippedTables"):
+                                    st.warning(
+                                        f"{len(cj['skippedTables'])} table(s) were rejected by Fabric and left out of the Copy Job."
+                                    )
+                                    st.dataframe(cj["skippedTables"], hide_index=True, width="stretch")
+                                st.json({"warehouse": wh, "connection": conn, "copyJob": cj})
                         except Exception as e:
                             st.error(f"Failed to create Warehouse/Connection/Copy Job: {e}")
 
+            refresh_syn_snapshot = st.button(
+                "🔄 Refresh workspace definitions", key=f"refresh_syn_snapshot_{selected_synapse_ws}"
+            )
+
+            # Pipelines, datasets and linked services are fetched once per workspace
             try:
-                syn_rows = fetch_activity_rows_for_synapse(
+                syn_snapshot = get_synapse_snapshot(
                     credential,
                     subscription_id,
                     rg_name,
-                    selected_synapse_ws
+                    selected_synapse_ws,
+                    refresh=refresh_syn_snapshot
                 )
             except Exception as e:
                 st.error(f"Failed to fetch Synapse pipelines: {e}")
-                syn_rows = []
+                syn_snapshot = None
+
+            syn_rows = fetch_activity_rows_for_synapse(
+                credential, subscription_id, rg_name, selected_synapse_ws, snapshot=syn_snapshot
+            ) if syn_snapshot else []
 
             # 1) Pipelines and Activities
             with st.container(border=True):
@@ -2203,76 +2312,15 @@ def main() -> None:
                     "If all activities are supported and orchestration is simple, category scores and total score can be 0 (Easy)."
                 )
 
-                grouped_syn: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-                for r in syn_rows:
-                    grouped_syn[r.get("PipelineName", "")].append(r)
-
-                syn_score_rows: List[Dict[str, Any]] = []
-                for pipe, items in grouped_syn.items():
-                    total_acts = len(items)
-
-                    # Same scoring logic as ADF: rely on per-activity Migratable column
-                    non_migratable = sum(
-                        1 for it in items
-                        if (it.get("Migratable") or "").lower() == "no"
+                syn_score_rows = score_pipelines(
+                    syn_rows, syn_snapshot.linked_service_types() if syn_snapshot else {}
+                )
+                for row in syn_score_rows:
+                    row["Reason"] = (
+                        "One or more activities are not currently supported for migration"
+                        if row["Non-Migratable Count"] > 0 else ""
                     )
 
-                    # Connectivity scoring for Synapse: if linked services are not resolved in rows,
-                    # this will correctly fall back to 0.
-                    used_ls_names: Set[str] = set()
-                    for it in items:
-                        sls = (it.get("SourceLinkedService") or "").strip()
-                        tls = (it.get("SinkLinkedService") or "").strip()
-                        if sls:
-                            used_ls_names.add(sls)
-                        if tls:
-                            used_ls_names.add(tls)
-                    used_ls_types: List[str] = []
-                    try:
-                        # If Synapse rows include LS types, use them; otherwise score_connectivity([]) -> 0
-                        used_ls_types = [it.get("SourceLinkedServiceType", "") for it in items if it.get("SourceLinkedServiceType")] + \
-                                        [it.get("SinkLinkedServiceType", "") for it in items if it.get("SinkLinkedServiceType")]
-                    except Exception:
-                        used_ls_types = []
-
-                    control_acts = 0
-                    for it in items:
-                        nt = _normalize_type(it.get("ActivityType"))
-                        if nt in CONTROL_ACTIVITY_TYPES:
-                            control_acts += 1
-
-                    parity_score = score_component_parity(total_acts, non_migratable)
-                    non_mig_score = score_non_migratable(non_migratable)
-                    connectivity_score = score_connectivity(used_ls_types)
-                    orchestration_score = score_orchestration(total_acts, control_acts)
-                    total = parity_score + non_mig_score + connectivity_score + orchestration_score
-
-                    if 3 in (parity_score, non_mig_score, connectivity_score, orchestration_score):
-                        band = "🔴 Hard"
-                    elif total <= 4:
-                        band = "🟢 Easy"
-                    elif total <= 8:
-                        band = "🟡 Medium"
-                    else:
-                        band = "🔴 Hard"
-
-                    reason = ""
-                    if non_migratable > 0:
-                        reason = "One or more activities are not currently supported for migration"
-
-                    syn_score_rows.append({
-                        "Pipeline": pipe,
-                        "Component Parity": parity_score,
-                        "Non-Migratable": non_mig_score,
-                        "Connectivity": connectivity_score,
-                        "Orchestration": orchestration_score,
-                        "Total Score": total,
-                        "Difficulty": band,
-                        "Activities": total_acts,
-                        "Non-Migratable Count": non_migratable,
-                        "Reason": reason,
-                    })
-
                 if syn_score_rows:
                     st.dataframe(syn_score_rows, hide_index=True, width="stretch")
                 else:
@@ -2284,7 +2332,8 @@ def main() -> None:
                 try:
                     syn_ls_rows = list_synapse_linked_services(
                         credential,
-                        selected_synapse_ws
+                        selected_synapse_ws,
+                        snapshot=syn_snapshot
                     )
                     if syn_ls_rows:
                         st.dataframe(syn_ls_rows, hide_index=True, width="stretch")
@@ -2305,7 +2354,8 @@ def main() -> None:
                 try:
                     syn_ds_rows = list_synapse_datasets(
                         credential,
-                        selected_synapse_ws
+                        selected_synapse_ws,
+                        snapshot=syn_snapshot
                     )
                     if syn_ds_rows:
                         st.dataframe(syn_ds_rows, hide_index=True, width="stretch")
@@ -2326,32 +2376,34 @@ def main() -> None:
                 st.caption("Export a Synapse notebook (.ipynb) from your workspace and import it into a Fabric workspace.")
 
                 # Try to load notebooks to drive a dropdown for accuracy
+                nb_resources: List[Dict[str, Any]] = []
                 nb_options: List[str] = []
                 nb_error: Optional[str] = None
                 try:
-                    discovered = list_synapse_notebooks(selected_synapse_ws)
-                    nb_options = sorted([n.get("name") for n in discovered if isinstance(n, dict) and n.get("name")])
+                    nb_resources = list_synapse_notebooks_dev_api(selected_synapse_ws, credential)
+                    nb_options = sorted([n.get("name") for n in nb_resources if isinstance(n, dict) and n.get("name")])
                 except Exception as e:
                     nb_error = str(e)
 
                 nb_col1, nb_col2 = st.columns(2)
                 with nb_col1:
                     if nb_options:
-                        nb_name = st.selectbox(
-                            "Select Synapse notebook",
+                        nb_names = st.multiselect(
+                            "Select Synapse notebooks",
                             options=nb_options,
-                            index=0,
+                            default=nb_options[:1],
                             key=f"nb_select_{selected_synapse_ws}",
                         )
                     else:
                         if nb_error:
                             st.warning(f"Could not auto-load notebooks: {nb_error}")
-                        nb_name = st.text_input(
-                            "Synapse notebook name",
+                        nb_typed = st.text_input(
+                            "Synapse notebook names",
                             value="",
-                            placeholder="Enter notebook name as shown in Synapse Studio",
+                            placeholder="Comma-separated names as shown in Synapse Studio",
                             key=f"nb_name_{selected_synapse_ws}",
                         )
+                        nb_names = [n.strip() for n in nb_typed.split(",") if n.strip()]
                 with nb_col2:
                     nb_workspace_id = st.text_input(
                         "Fabric Workspace ID (for notebooks)",
@@ -2359,33 +2411,38 @@ def main() -> None:
                         placeholder="Enter Fabric Workspace ID (UUID)",
                         key=f"nb_ws_{selected_synapse_ws}",
                     )
+                nb_keep_copies = st.checkbox(
+                    "Keep a copy of each exported .ipynb (audit)",
+                    value=False,
+                    key=f"nb_keep_{selected_synapse_ws}",
+                )
                 nb_run = st.button(
-                    "📥 Migrate Notebook to Fabric",
+                    "📥 Migrate Notebooks to Fabric",
                     type="secondary",
                     key=f"nb_migrate_{selected_synapse_ws}",
                 )
                 if nb_run:
-                    if not nb_name:
-                        st.warning("Please enter a Synapse notebook name.")
+                    if not nb_names:
+                        st.warning("Please select or enter at least one Synapse notebook.")
                     elif not nb_workspace_id:
                         st.warning("Please enter a Fabric Workspace ID for the notebook import.")
                     else:
                         try:
-                            with st.spinner("Exporting notebook from Synapse and importing into Fabric..."):
-                                result = migrate_synapse_notebook_to_fabric(
+                            with st.spinner(f"Migrating {len(nb_names)} notebook(s) from Synapse to Fabric..."):
+                                nb_rows = migrate_synapse_notebooks_to_fabric(
                                     synapse_workspace_name=selected_synapse_ws,
-                                    notebook_name=nb_name,
+                                    notebook_names=nb_names,
                                     fabric_workspace_id=nb_workspace_id,
-                                    output_dir=os.path.join(UTILS_DIR, "exported_notebooks"),
+                                    credential=credential,
+                                    output_dir=os.path.join(UTILS_DIR, "exported_notebooks") if nb_keep_copies else None,
+                                    notebooks=nb_resources or None,
                                 )
-                            st.success("✅ Notebook migrated to Fabric.")
-                            # Only show details if useful; suppress noisy error fields
-                            if isinstance(result, dict):
-                                cleaned = {k: v for k, v in result.items() if k.upper() != "ERROR"}
-                                if cleaned:
-                                    st.json(cleaned)
-                        except FileNotFoundError as fnf:
-                            st.error(f"Notebook not found: {fnf}")
+                            migrated = sum(1 for r in nb_rows if r["Status"] == "Migrated")
+                            if migrated == len(nb_rows):
+                                st.success(f"✅ {migrated} notebook(s) migrated to Fabric.")
+                            else:
+                                st.warning(f"{migrated} of {len(nb_rows)} notebook(s) migrated to Fabric.")
+                            st.dataframe(nb_rows, hide_index=True, width="stretch")
                         except Exception as exc:
                             st.error(f"Notebook migration failed: {exc}")
 
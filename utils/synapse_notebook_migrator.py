@@ -6,6 +6,12 @@ import shutil
 import requests
 import base64
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from Migration.synapse_dev_client import get_synapse_dev_client
+from Synapse_Data.fabric_client import FabricApiError, FabricClient, get_fabric_client
+from Synapse_Data.fabric_operations import get_operation_tracker
 
 AZ_PATH: str | None = None
 
@@ -47,39 +53,30 @@ def get_cli_token(resource: str) -> str:
     return json.loads(out)["accessToken"]
 
 
-def _ensure_valid_ipynb(notebook_path: Path) -> None:
-    """Ensure the notebook file is a valid .ipynb with nbformat, cells, metadata.
+def notebook_to_ipynb(data) -> dict:
+    """nbformat notebook for raw notebook JSON, without copying cells or outputs.
 
-    If the file is missing nbformat (common when using Synapse Dev API raw JSON),
-    attempt to lift nbformat/cells from a 'properties' object; otherwise wrap the
-    content as a markdown cell and create a minimal notebook shell.
+    Synapse Dev API resources carry nbformat/cells under 'properties' and are
+    lifted from there; anything else unrecognised is wrapped as a markdown
+    cell inside a minimal notebook shell.
     """
-    try:
-        with open(notebook_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except Exception as e:
-        raise RuntimeError(f"Invalid notebook JSON: {e}") from e
-
-    # If already valid, nothing to do
+    # Already valid
     if isinstance(data, dict) and "nbformat" in data and "cells" in data:
-        return
+        return data
 
-    # Try to lift from Synapse-like 'properties' structure
+    # Lift from Synapse-like 'properties' structure
     if isinstance(data, dict) and "properties" in data and isinstance(data["properties"], dict):
         props = data["properties"]
-        nb = {
+        return {
             "nbformat": props.get("nbformat", 4),
             "nbformat_minor": props.get("nbformat_minor", props.get("nbformatMinor", 2)),
             "metadata": props.get("metadata", {}),
             "cells": props.get("cells", []),
         }
-        with open(notebook_path, "w", encoding="utf-8") as f:
-            json.dump(nb, f, ensure_ascii=False, indent=2)
-        return
 
     # Fallback: wrap raw content into a minimal notebook as markdown
     md_text = json.dumps(data, ensure_ascii=False, indent=2)
-    nb = {
+    return {
         "nbformat": 4,
         "nbformat_minor": 2,
         "metadata": {},
@@ -95,8 +92,21 @@ def _ensure_valid_ipynb(notebook_path: Path) -> None:
             }
         ],
     }
-    with open(notebook_path, "w", encoding="utf-8") as f:
-        json.dump(nb, f, ensure_ascii=False, indent=2)
+
+
+def _ensure_valid_ipynb(notebook_path: Path) -> None:
+    """Ensure the notebook file is a valid .ipynb with nbformat, cells, metadata (see notebook_to_ipynb)."""
+    try:
+        with open(notebook_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception as e:
+        raise RuntimeError(f"Invalid notebook JSON: {e}") from e
+
+    nb = notebook_to_ipynb(data)
+    if nb is not data:
+        with open(notebook_path, "w", encoding="utf-8") as f:
+            json.dump(nb, f, ensure_ascii=False, indent=2)
+
 
 def list_synapse_notebooks(workspace_name: str) -> list[dict]:
     # Try Azure CLI first. If not available, fall back to Synapse Dev API.
@@ -229,20 +239,13 @@ def upload_notebook_to_fabric(workspace_id: str, notebook_path: str, display_nam
         op_url = resp.headers.get("Location") or resp.headers.get("location")
         if not op_url:
             return
-        for _ in range(30):  # up to ~15 minutes with backoff
-            r = requests.get(op_url, headers=auth_headers, timeout=60)
-            try:
-                data = r.json()
-            except ValueError:
-                data = {}
-            status = (data or {}).get("status") or (data or {}).get("state")
-            if status and status.lower() in ("succeeded", "failed", "cancelled"):
-                if status.lower() != "succeeded":
-                    raise RuntimeError(f"Fabric operation did not succeed: {data}")
-                return
-            ra = r.headers.get("Retry-After")
-            delay = int(ra) if ra and ra.isdigit() else 5
-            time.sleep(delay)
+        ra = resp.headers.get("Retry-After")
+        get_operation_tracker().track(
+            op_url,
+            lambda: auth_headers,
+            timeout_seconds=900,
+            retry_after=float(ra) if ra and ra.isdigit() else 0.0,
+        ).result()
 
     # Path A: Generic Items Create with JSON definition (user-proven)
     with open(notebook_path, "rb") as f:
@@ -349,3 +352,110 @@ def migrate_synapse_notebook_to_fabric(synapse_workspace_name: str, notebook_nam
         raise FileNotFoundError(f"Exported notebook file not found at: {ipynb_path}. Known notebooks: {names}")
     _ensure_valid_ipynb(Path(ipynb_path))
     return upload_notebook_to_fabric(fabric_workspace_id, str(ipynb_path), display_name=notebook_name)
+
+
+NOTEBOOK_MIGRATION_MAX_WORKERS = 8
+
+
+def list_synapse_notebooks_dev_api(workspace_name: str, credential) -> list[dict]:
+    """Every notebook resource of a workspace via the Synapse Dev API (all pages)."""
+    return get_synapse_dev_client(credential, workspace_name).notebooks()
+
+
+def _create_fabric_notebook(client: FabricClient, workspace_id: str, name: str, b64: str) -> dict:
+    definition = {
+        "format": "ipynb",
+        "parts": [{"path": "notebook-content.ipynb", "payload": b64, "payloadType": "InlineBase64"}],
+    }
+    items_path = f"workspaces/{workspace_id}/items"
+    try:
+        created = client.post(items_path, {"displayName": name, "type": "Notebook", "definition": definition})
+    except FabricApiError as exc:
+        if exc.status_code == 400 and "src property" in str(exc).lower():
+            # Stricter schemas want a .platform part
+            definition["parts"].append({
+                "path": ".platform",
+                "payload": base64.b64encode(b"{}").decode("ascii"),
+                "payloadType": "InlineBase64",
+            })
+            created = client.post(items_path, {"displayName": name, "type": "Notebook", "definition": definition})
+        elif exc.status_code == 404:
+            created = client.post(f"workspaces/{workspace_id}/notebooks", {"displayName": name, "definition": definition})
+        else:
+            raise
+    if isinstance(created, dict) and created.get("id"):
+        return created
+    return client.find_by_display_name(f"{items_path}?type=Notebook", name) or (created if isinstance(created, dict) else {})
+
+
+def migrate_synapse_notebooks_to_fabric(
+    synapse_workspace_name: str,
+    notebook_names: list[str] | None,
+    fabric_workspace_id: str,
+    credential,
+    output_dir: str | None = None,
+    notebooks: list[dict] | None = None,
+    max_workers: int = NOTEBOOK_MIGRATION_MAX_WORKERS,
+    progress: Callable[[dict], None] | None = None,
+) -> list[dict]:
+    """Export many Synapse notebooks and create them in Fabric concurrently; one result row per notebook.
+
+    Notebooks are listed once (or taken from notebooks), tokens come from
+    credential and are cached, and no az CLI is involved. Each Dev API
+    response is normalised and base64-encoded in memory; output_dir, if
+    given, only receives an audit copy of every exported .ipynb. Names that
+    already exist in the Fabric workspace are left untouched.
+    """
+    dev = get_synapse_dev_client(credential, synapse_workspace_name)
+    client = get_fabric_client(credential)
+    if notebooks is None:
+        notebooks = dev.notebooks()
+    by_name = {n["name"]: n for n in notebooks if isinstance(n, dict) and n.get("name")}
+    by_lower = {k.lower(): k for k in by_name}
+    wanted = list(by_name) if notebook_names is None else list(notebook_names)
+    existing = {
+        it["displayName"]: it
+        for it in client.list_all(f"workspaces/{fabric_workspace_id}/items?type=Notebook")
+        if it.get("displayName")
+    }
+    out_dir = Path(output_dir) if output_dir else None
+    if out_dir is not None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+    def _row(name: str, status: str, item_id: str = "", message: str = "", started: float = 0.0) -> dict:
+        return {
+            "Notebook": name,
+            "Status": status,
+            "Fabric Item Id": item_id,
+            "Message": message,
+            "Seconds": round(time.time() - started, 2) if started else 0.0,
+        }
+
+    def _migrate(requested: str) -> dict:
+        started = time.time()
+        name = requested if requested in by_name else by_lower.get(requested.lower())
+        if not name:
+            return _row(requested, "Not Found", message="No such notebook in the Synapse workspace")
+        if name in existing:
+            return _row(name, "Exists", existing[name].get("id", ""), "A Fabric notebook with this name already exists", started)
+        try:
+            resource = by_name[name]
+            if not (resource.get("properties") or {}).get("cells"):
+                resource = dev.notebook(name)
+            nb = notebook_to_ipynb(resource)
+            if out_dir is not None:
+                with open(out_dir / f"{name}.ipynb", "w", encoding="utf-8") as f:
+                    json.dump(nb, f, ensure_ascii=False, indent=2)
+            b64 = base64.b64encode(json.dumps(nb).encode("utf-8")).decode("utf-8")
+            created = _create_fabric_notebook(client, fabric_workspace_id, name, b64)
+            return _row(name, "Migrated", created.get("id", ""), started=started)
+        except Exception as exc:
+            return _row(name, "Failed", message=str(exc), started=started)
+
+    rows: list[dict] = []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        for row in pool.map(_migrate, wanted):
+            rows.append(row)
+            if progress is not None:
+                progress(row)
+    return rows